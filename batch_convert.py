@@ -0,0 +1,198 @@
+# batch_convert.py
+"""
+Ekransız toplu dönüştürücü: dilim klasörleri → OBJ, paralel süreçlerde.
+
+    python batch_convert.py MRHead_Slices Brain_Slices -o out --threshold 90
+    python batch_convert.py --manifest jobs.json -j 4
+
+Manifest (JSON):
+    {
+      "defaults": {"threshold": 90, "resolution": [256, 256]},
+      "jobs": [
+        {"folder": "MRHead_Slices", "output": "out/head.obj"},
+        {"folder": "MRHead_Slices", "output": "out/head_pts.obj",
+         "render_mode": "point", "threshold": 60}
+      ]
+    }
+Göreli yollar manifest dosyasının klasörüne göredir; "jobs" yerine
+doğrudan liste de verilebilir.  Parametreler: model_generation.DEFAULTS.
+
+Standart çıktıya satır başına bir JSON olay yazılır:
+    {"event": "start",    "job": 0, "folder": ..., "output": ...}
+    {"event": "progress", "job": 0, "progress": 40}
+    {"event": "done",     "job": 0, "output": ..., "vertices": ...,
+                          "faces": ..., "seconds": ..., "cached": false}
+    {"event": "error",    "job": 0, "error": "..."}
+    {"event": "summary",  "ok": 2, "failed": 0, "seconds": ...}
+Çıkış kodu: hepsi başarılıysa 0, aksi halde 1 (Ctrl-C → 130).
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from model_generation import DEFAULTS, convert_folder
+from generation_cache import default_cache
+
+
+def _emit(event, **fields):
+    print(json.dumps(dict(event=event, **fields), ensure_ascii=False),
+          flush=True)
+
+
+def load_manifest(path):
+    """Manifest → iş listesi (defaults uygulanmış, yollar mutlak)."""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {"jobs": data}
+    base = os.path.dirname(os.path.abspath(path))
+    defaults = data.get("defaults", {})
+    jobs = []
+    for j in data.get("jobs", []):
+        job = dict(defaults, **j)
+        if "folder" in job:  # eksikse _normalize iş başına hata verir
+            job["folder"] = os.path.join(base, job["folder"])
+        if job.get("output"):
+            job["output"] = os.path.join(base, job["output"])
+        jobs.append(job)
+    return jobs
+
+
+def _normalize(job, out_dir=None):
+    """Eksik çıktı yolunu doldur, bilinmeyen anahtarları reddet."""
+    job = dict(job)
+    folder = job.pop("folder")
+    name = os.path.basename(os.path.normpath(folder))
+    output = job.pop("output", None) or os.path.join(out_dir or folder,
+                                                     f"{name}.obj")
+    unknown = set(job) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"bilinmeyen parametre(ler): {', '.join(sorted(unknown))}")
+    if job.get("resolution") is not None:
+        job["resolution"] = tuple(job["resolution"])
+    return folder, output, job
+
+
+def _run_job(idx, folder, output, params, events, use_cache=False):
+    """Alt süreçte çalışır; ilerleme olaylarını kuyruğa koyar."""
+    last = [-1]
+
+    def progress(p):
+        if p != last[0]:
+            last[0] = p
+            events.put(("progress", idx, {"progress": int(p)}))
+
+    try:
+        cache = default_cache() if use_cache else None
+        info = convert_folder(folder, output, progress_callback=progress,
+                              cache=cache, **params)
+    except Exception as exc:  # iş başına hata; diğer işler sürer
+        return idx, None, f"{type(exc).__name__}: {exc}"
+    return idx, info, None
+
+
+def run_batch(jobs, workers=None, out_dir=None, use_cache=False):
+    """
+    İşleri paralel süreçlerde çalıştırır, olayları JSON satırı olarak
+    yazar.  Dönüş: başarısız iş sayısı.
+    """
+    t0 = time.perf_counter()
+    workers = workers or max(1, (os.cpu_count() or 2) // 2)
+    ok = failed = 0
+    with mp.Manager() as manager:
+        events = manager.Queue()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            futures = {}  # future → iş sırası
+            for idx, job in enumerate(jobs):
+                try:
+                    folder, output, params = _normalize(job, out_dir)
+                except (KeyError, ValueError) as exc:
+                    _emit("error", job=idx, error=str(exc))
+                    failed += 1
+                    continue
+                _emit("start", job=idx, folder=folder, output=output)
+                fut = pool.submit(_run_job, idx, folder, output,
+                                  params, events, use_cache)
+                futures[fut] = idx
+                pending.add(fut)
+            try:
+                while pending:
+                    try:
+                        kind, idx, fields = events.get(timeout=0.2)
+                        _emit(kind, job=idx, **fields)
+                        continue
+                    except queue.Empty:
+                        pass
+                    for fut in [f for f in pending if f.done()]:
+                        pending.discard(fut)
+                        try:
+                            idx, info, err = fut.result()
+                        except BrokenProcessPool:
+                            # alt süreç öldü (ör. OOM) → havuz bozulur; kalan
+                            # her iş de bu hatayla biter ve ayrı raporlanır
+                            _emit("error", job=futures[fut],
+                                  error="alt süreç beklenmedik şekilde sonlandı")
+                            failed += 1
+                            continue
+                        except Exception as exc:
+                            _emit("error", job=futures[fut],
+                                  error=f"{type(exc).__name__}: {exc}")
+                            failed += 1
+                            continue
+                        if info is not None:
+                            _emit("done", job=idx, **info)
+                            ok += 1
+                        else:
+                            _emit("error", job=idx,
+                                  error=err or "iptal edildi")
+                            failed += 1
+            except KeyboardInterrupt:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+    _emit("summary", ok=ok, failed=failed,
+          seconds=round(time.perf_counter() - t0, 3))
+    return failed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="PNG dilim klasörlerini ekransız olarak OBJ'ye dönüştürür.")
+    ap.add_argument("folders", nargs="*", help="dilim klasörleri")
+    ap.add_argument("-m", "--manifest", help="JSON iş listesi")
+    ap.add_argument("-o", "--out-dir", help="çıktı klasörü (varsayılan: dilim klasörü)")
+    ap.add_argument("-j", "--jobs", type=int, default=None,
+                    help="paralel süreç sayısı (varsayılan: çekirdek/2)")
+    ap.add_argument("--threshold", type=int)
+    ap.add_argument("--scale-factor", type=float)
+    ap.add_argument("--z-increment", type=float)
+    ap.add_argument("--resolution", type=int, nargs=2, metavar=("W", "H"))
+    ap.add_argument("--render-mode", choices=("mesh", "point"))
+    ap.add_argument("--cache", action="store_true",
+                    help="sonuçları üretim önbelleğinden al / oraya yaz")
+    args = ap.parse_args(argv)
+
+    overrides = {k: v for k, v in (
+        ("threshold", args.threshold), ("scale_factor", args.scale_factor),
+        ("z_increment", args.z_increment), ("resolution", args.resolution),
+        ("render_mode", args.render_mode)) if v is not None}
+    jobs = load_manifest(args.manifest) if args.manifest else []
+    jobs = [dict(j, **overrides) for j in jobs]
+    jobs += [dict(overrides, folder=f) for f in args.folders]
+    if not jobs:
+        ap.error("klasör ya da --manifest verilmeli")
+    try:
+        failed = run_batch(jobs, args.jobs, args.out_dir, args.cache)
+    except KeyboardInterrupt:
+        return 130
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,464 @@
+# bvh.py  –  mesh başına sınır-hacmi hiyerarşisi (Numba, yerel uzay)
+import numpy as np
+from numba import njit
+
+from mesh import GL_POINTS
+
+# Yaprak başına en fazla eleman (üçgen / nokta)
+LEAF_SIZE = 4
+
+
+# ----------------------------------------------------------------------
+# Numba çekirdekleri  (nogil → arka plan iş parçacığında GUI donmaz)
+#
+# Düğüm düzeni: lo/hi (K,3) kutu; start/count → yaprakta order[start:
+# start+count] elemanları; iç düğümde count = 0, çocuklar left, left+1.
+# Çocuklar ebeveynden sonra ayrıldığından ters sıra = aşağıdan yukarı.
+# ----------------------------------------------------------------------
+@njit(cache=True, nogil=True)
+def _build(plo, phi, leaf_size):
+    P = plo.shape[0]
+    order = np.arange(P).astype(np.int64)
+    cen = (plo + phi) * 0.5
+    K = max(2 * P - 1, 1)
+    lo = np.empty((K, 3), np.float32)
+    hi = np.empty((K, 3), np.float32)
+    start = np.zeros(K, np.int64)
+    count = np.zeros(K, np.int64)
+    left = np.full(K, -1, np.int64)
+    st_node = np.empty(K + 1, np.int64)
+    st_s = np.empty(K + 1, np.int64)
+    st_e = np.empty(K + 1, np.int64)
+    st_d = np.empty(K + 1, np.int64)
+    sp = 1
+    st_node[0] = 0
+    st_s[0] = 0
+    st_e[0] = P
+    st_d[0] = 1
+    n_nodes = 1
+    depth = 1
+    cmin = np.empty(3, np.float32)
+    cmax = np.empty(3, np.float32)
+    while sp > 0:
+        sp -= 1
+        node = st_node[sp]
+        s = st_s[sp]
+        e = st_e[sp]
+        d = st_d[sp]
+        if d > depth:
+            depth = d
+        for a in range(3):
+            lo[node, a] = np.inf
+            hi[node, a] = -np.inf
+            cmin[a] = np.inf
+            cmax[a] = -np.inf
+        for k in range(s, e):
+            p = order[k]
+            for a in range(3):
+                lo[node, a] = min(lo[node, a], plo[p, a])
+                hi[node, a] = max(hi[node, a], phi[p, a])
+                cmin[a] = min(cmin[a], cen[p, a])
+                cmax[a] = max(cmax[a], cen[p, a])
+        start[node] = s
+        if e - s <= leaf_size:
+            count[node] = e - s
+            continue
+
+        # en uzun merkez ekseninin ortasından böl; dengesizse sayıca ortadan
+        ax = 0
+        for a in range(1, 3):
+            if cmax[a] - cmin[a] > cmax[ax] - cmin[ax]:
+                ax = a
+        mid = (s + e) // 2
+        if cmax[ax] > cmin[ax]:
+            split = (cmin[ax] + cmax[ax]) * 0.5
+            i = s
+            j = e - 1
+            while i <= j:
+                if cen[order[i], ax] < split:
+                    i += 1
+                else:
+                    t = order[i]
+                    order[i] = order[j]
+                    order[j] = t
+                    j -= 1
+            if s < i < e:
+                mid = i
+        left[node] = n_nodes
+        for c in range(2):
+            st_node[sp] = n_nodes + c
+            st_s[sp] = s if c == 0 else mid
+            st_e[sp] = mid if c == 0 else e
+            st_d[sp] = d + 1
+            sp += 1
+        n_nodes += 2
+    return (lo[:n_nodes].copy(), hi[:n_nodes].copy(), start[:n_nodes].copy(),
+            count[:n_nodes].copy(), left[:n_nodes].copy(), order, depth)
+
+
+@njit(cache=True, nogil=True)
+def _refit(lo, hi, start, count, left, order, plo, phi):
+    for n in range(lo.shape[0] - 1, -1, -1):
+        if count[n] > 0:
+            for a in range(3):
+                lo[n, a] = np.inf
+                hi[n, a] = -np.inf
+            for k in range(start[n], start[n] + count[n]):
+                p = order[k]
+                for a in range(3):
+                    lo[n, a] = min(lo[n, a], plo[p, a])
+                    hi[n, a] = max(hi[n, a], phi[p, a])
+        else:
+            c = left[n]
+            for a in range(3):
+                lo[n, a] = min(lo[c, a], lo[c + 1, a])
+                hi[n, a] = max(hi[c, a], hi[c + 1, a])
+
+
+@njit(cache=True, nogil=True)
+def _slab(lo, hi, n, o, inv, pad, tmax):
+    """Işın düğüm kutusuna (pad kadar şişirilmiş) [0, tmax) içinde giriyor mu."""
+    t0 = 0.0
+    t1 = tmax
+    for a in range(3):
+        ta = (lo[n, a] - pad - o[a]) * inv[a]
+        tb = (hi[n, a] + pad - o[a]) * inv[a]
+        if ta > tb:
+            ta, tb = tb, ta
+        t0 = max(t0, ta)
+        t1 = min(t1, tb)
+        if t0 > t1:
+            return False
+    return True
+
+
+@njit(cache=True, nogil=True)
+def _ray(lo, hi, start, count, left, order, depth, V, F, dead, o, d, tmax, radius):
+    """
+    En yakın isabet: (t, eleman) ya da (tmax, -1).
+    F boşsa noktalar: ışına uzaklığı ≤ radius olan en yakın nokta.
+    dead boş değilse dead[eleman] = True olanlar atlanır (silgi maskesi).
+    """
+    inv = np.empty(3)
+    for a in range(3):
+        inv[a] = 1.0 / d[a] if d[a] != 0.0 else 1e30
+    dd = d[0] * d[0] + d[1] * d[1] + d[2] * d[2]
+    pts = F.shape[0] == 0
+    best_t = tmax
+    best = -1
+    stack = np.empty(depth + 2, np.int64)
+    stack[0] = 0
+    sp = 1
+    while sp > 0:
+        sp -= 1
+        n = stack[sp]
+        if not _slab(lo, hi, n, o, inv, radius, best_t):
+            continue
+        if count[n] == 0:
+            stack[sp] = left[n]
+            stack[sp + 1] = left[n] + 1
+            sp += 2
+            continue
+        for k in range(start[n], start[n] + count[n]):
+            p = order[k]
+            if dead.shape[0] and dead[p]:
+                continue
+            if pts:
+                w0 = V[p, 0] - o[0]
+                w1 = V[p, 1] - o[1]
+                w2 = V[p, 2] - o[2]
+                t = (w0 * d[0] + w1 * d[1] + w2 * d[2]) / dd
+                if t <= 0.0 or t >= best_t:
+                    continue
+                r0 = w0 - t * d[0]
+                r1 = w1 - t * d[1]
+                r2 = w2 - t * d[2]
+                if r0 * r0 + r1 * r1 + r2 * r2 <= radius * radius:
+                    best_t = t
+                    best = p
+                continue
+            # Möller–Trumbore
+            i0 = F[p, 0]
+            i1 = F[p, 1]
+            i2 = F[p, 2]
+            a0 = float(V[i0, 0])
+            a1 = float(V[i0, 1])
+            a2 = float(V[i0, 2])
+            e10 = V[i1, 0] - a0
+            e11 = V[i1, 1] - a1
+            e12 = V[i1, 2] - a2
+            e20 = V[i2, 0] - a0
+            e21 = V[i2, 1] - a1
+            e22 = V[i2, 2] - a2
+            p0 = d[1] * e22 - d[2] * e21
+            p1 = d[2] * e20 - d[0] * e22
+            p2 = d[0] * e21 - d[1] * e20
+            det = e10 * p0 + e11 * p1 + e12 * p2
+            if abs(det) < 1e-12:
+                continue
+            idet = 1.0 / det
+            s0 = o[0] - a0
+            s1 = o[1] - a1
+            s2 = o[2] - a2
+            u = (s0 * p0 + s1 * p1 + s2 * p2) * idet
+            if u < 0.0 or u > 1.0:
+                continue
+            q0 = s1 * e12 - s2 * e11
+            q1 = s2 * e10 - s0 * e12
+            q2 = s0 * e11 - s1 * e10
+            v = (d[0] * q0 + d[1] * q1 + d[2] * q2) * idet
+            if v < 0.0 or u + v > 1.0:
+                continue
+            t = (e20 * q0 + e21 * q1 + e22 * q2) * idet
+            if 1e-9 < t < best_t:
+                best_t = t
+                best = p
+    return best_t, best
+
+
+@njit(cache=True, nogil=True)
+def _dot3(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]  # np.dot BLAS ister
+
+
+@njit(cache=True, nogil=True)
+def _closest_on_tri(p, a, b, c):
+    """Üçgen üzerindeki en yakın nokta (Ericson, Real-Time Collision Detection)."""
+    ab = b - a
+    ac = c - a
+    ap = p - a
+    d1 = _dot3(ab, ap)
+    d2 = _dot3(ac, ap)
+    if d1 <= 0.0 and d2 <= 0.0:
+        return a
+    bp = p - b
+    d3 = _dot3(ab, bp)
+    d4 = _dot3(ac, bp)
+    if d3 >= 0.0 and d4 <= d3:
+        return b
+    vc = d1 * d4 - d3 * d2
+    if vc <= 0.0 and d1 >= 0.0 and d3 <= 0.0:
+        return a + ab * (d1 / (d1 - d3))
+    cp = p - c
+    d5 = _dot3(ab, cp)
+    d6 = _dot3(ac, cp)
+    if d6 >= 0.0 and d5 <= d6:
+        return c
+    vb = d5 * d2 - d1 * d6
+    if vb <= 0.0 and d2 >= 0.0 and d6 <= 0.0:
+        return a + ac * (d2 / (d2 - d6))
+    va = d3 * d6 - d5 * d4
+    if va <= 0.0 and d4 - d3 >= 0.0 and d5 - d6 >= 0.0:
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        return b + (c - b) * w
+    den = 1.0 / (va + vb + vc)
+    return a + ab * (vb * den) + ac * (vc * den)
+
+
+@njit(cache=True, nogil=True)
+def _nearest(lo, hi, start, count, left, order, depth, V, F, dead, q, max_d2):
+    """q’ya en yakın eleman: (uzaklık², eleman, nokta); yoksa eleman = -1."""
+    pts = F.shape[0] == 0
+    best_d2 = max_d2
+    best = -1
+    best_p = np.zeros(3)
+    stack = np.empty(depth + 2, np.int64)
+    stack[0] = 0
+    sp = 1
+    while sp > 0:
+        sp -= 1
+        n = stack[sp]
+        bd = 0.0
+        for a in range(3):
+            g = max(lo[n, a] - q[a], 0.0, q[a] - hi[n, a])
+            bd += g * g
+        if bd >= best_d2:
+            continue
+        if count[n] == 0:
+            # yakın çocuk son itilir → önce o açılır
+            c0 = left[n]
+            c1 = c0 + 1
+            m0 = 0.0
+            m1 = 0.0
+            for a in range(3):
+                m0 += (0.5 * (lo[c0, a] + hi[c0, a]) - q[a]) ** 2
+                m1 += (0.5 * (lo[c1, a] + hi[c1, a]) - q[a]) ** 2
+            if m0 < m1:
+                c0, c1 = c1, c0
+            stack[sp] = c0
+            stack[sp + 1] = c1
+            sp += 2
+            continue
+        for k in range(start[n], start[n] + count[n]):
+            p = order[k]
+            if dead.shape[0] and dead[p]:
+                continue
+            if pts:
+                x = V[p].astype(np.float64)
+            else:
+                x = _closest_on_tri(q, V[F[p, 0]].astype(np.float64),
+                                    V[F[p, 1]].astype(np.float64),
+                                    V[F[p, 2]].astype(np.float64))
+            d2 = ((x - q) ** 2).sum()
+            if d2 < best_d2:
+                best_d2 = d2
+                best = p
+                best_p = x
+    return best_d2, best, best_p
+
+
+@njit(cache=True, nogil=True)
+def _box(lo, hi, start, count, left, order, depth, plo, phi, qlo, qhi):
+    out = np.empty(order.shape[0], np.int64)
+    m = 0
+    stack = np.empty(depth + 2, np.int64)
+    stack[0] = 0
+    sp = 1
+    while sp > 0:
+        sp -= 1
+        n = stack[sp]
+        inside = True
+        for a in range(3):
+            if lo[n, a] > qhi[a] or hi[n, a] < qlo[a]:
+                inside = False
+        if not inside:
+            continue
+        if count[n] == 0:
+            stack[sp] = left[n]
+            stack[sp + 1] = left[n] + 1
+            sp += 2
+            continue
+        for k in range(start[n], start[n] + count[n]):
+            p = order[k]
+            hit = True
+            for a in range(3):
+                if plo[p, a] > qhi[a] or phi[p, a] < qlo[a]:
+                    hit = False
+            if hit:
+                out[m] = p
+                m += 1
+    return np.sort(out[:m])
+
+
+# ----------------------------------------------------------------------
+class MeshBVH:
+    """
+    Mesh elemanlarının (üçgen ya da nokta) yerel uzaydaki BVH’si.
+    Yerel uzayda tutulduğu için transform değişince yeniden kurulmaz:
+    sorgular ışını / noktayı model matrisinin tersiyle yerele taşır
+    (afin dönüşüm ışın parametresi t’yi korur).  Köşeler aynı topolojiyle
+    değişirse refit() yeter; indeksler değişirse yeniden kurulur.
+    Saf NumPy/Numba: GL bağlamı gerekmez, arka planda kurulabilir.
+    """
+
+    def __init__(self, vertices, indices, draw_mode, leaf_size=LEAF_SIZE):
+        self.vertices = np.ascontiguousarray(vertices, np.float32)
+        self.indices = indices
+        if draw_mode == GL_POINTS or indices is None or len(indices) == 0:
+            self.faces = np.empty((0, 3), np.int64)
+        else:
+            self.faces = np.asarray(indices, np.int64).reshape(-1, 3)
+        plo, phi = self._prim_boxes()
+        (self.lo, self.hi, self.start, self.count, self.left,
+         self.order, self.depth) = _build(plo, phi, leaf_size)
+        self._plo, self._phi = plo, phi
+
+    def _prim_boxes(self):
+        V = self.vertices
+        if len(self.faces) == 0:
+            return V, V
+        T = V[self.faces]  # (M,3,3)
+        return T.min(axis=1), T.max(axis=1)
+
+    @property
+    def n_prims(self) -> int:
+        return len(self._plo)
+
+    def _nodes(self):
+        return (self.lo, self.hi, self.start, self.count, self.left,
+                self.order, self.depth)
+
+    @staticmethod
+    def _dead(dead):
+        return np.zeros(0, np.bool_) if dead is None else dead
+
+    # ------------------------------------------------------------------
+    def refit(self, vertices):
+        """Topoloji aynı, köşeler değişti: düğüm kutularını aşağıdan yukarı günceller."""
+        self.vertices = np.ascontiguousarray(vertices, np.float32)
+        self._plo, self._phi = self._prim_boxes()
+        _refit(self.lo, self.hi, self.start, self.count, self.left,
+               self.order, self._plo, self._phi)
+
+    def ray(self, orig, dir_, tmax=np.inf, radius=0.0, dead=None):
+        """
+        Yerel ışın orig + t·dir_ → (t, eleman) veya None.
+        Nokta bulutunda radius: ışına kabul edilen en büyük uzaklık.
+        """
+        if self.n_prims == 0:
+            return None
+        t, p = _ray(*self._nodes(), self.vertices, self.faces, self._dead(dead),
+                    np.asarray(orig, np.float64), np.asarray(dir_, np.float64),
+                    float(tmax), float(radius))
+        return None if p < 0 else (float(t), int(p))
+
+    def nearest(self, point, max_dist=np.inf, dead=None):
+        """En yakın yüzey noktası → (uzaklık, eleman, nokta (3,)) veya None."""
+        if self.n_prims == 0:
+            return None
+        d2, p, x = _nearest(*self._nodes(), self.vertices, self.faces,
+                            self._dead(dead), np.asarray(point, np.float64),
+                            float(max_dist) ** 2)
+        return None if p < 0 else (float(np.sqrt(d2)), int(p), x)
+
+    def query_box(self, mn, mx) -> np.ndarray:
+        """Kutusu [mn, mx] ile kesişen elemanlar (sıralı int64)."""
+        if self.n_prims == 0:
+            return np.empty(0, np.int64)
+        return _box(*self._nodes(), self._plo, self._phi,
+                    np.asarray(mn, np.float32), np.asarray(mx, np.float32))
+
+
+# ----------------------------------------------------------------------
+# Mesh üzerinde önbellek:  m._bvh = (version, MeshBVH)
+# ----------------------------------------------------------------------
+def current_bvh(m):
+    """
+    m’nin güncel BVH’si; yoksa None.  Sürüm değişmiş ama yalnızca köşeler
+    değişmişse (aynı indeks dizisi) yerinde refit edilip döner.
+    """
+    cached = getattr(m, "_bvh", None)
+    if cached is None:
+        return None
+    ver, bvh = cached
+    if ver == m.version:
+        return bvh
+    if (bvh.indices is m.indices and m.vertices is not None
+            and len(m.vertices) == len(bvh.vertices)):
+        bvh.refit(m.vertices)
+        m._bvh = (m.version, bvh)
+        return bvh
+    return None
+
+
+def bvh_job(m):
+    """
+    GUI iş parçacığında çağrılır: dizilerin anlık görüntüsünü alır ve
+    arka planda çalışacak fn(progress, stop) → (version, MeshBVH) döndürür.
+    Sonuç install_bvh ile yerleştirilir.
+    """
+    ver, V, I, mode = m.version, m.vertices, m.indices, m.draw_mode
+
+    def _run(progress, stop):
+        return ver, MeshBVH(V, I, mode)
+    return _run
+
+
+def install_bvh(m, result):
+    """Arka plan sonucunu, mesh bu arada değişmediyse bağlar."""
+    ver, bvh = result
+    if ver == m.version:
+        bvh.indices = m.indices  # refit kontrolü için aynı nesne
+        m._bvh = (ver, bvh)
+        return True
+    return False
@@ -0,0 +1,107 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QDoubleSpinBox, QAbstractItemView, QHeaderView,
+    QMessageBox
+)
+from PyQt5.QtCore import Qt
+import time
+
+from generation_cache import default_cache
+
+
+class CacheDialog(QDialog):
+    """Üretim önbelleğindeki girdileri listeler; sil / temizle / boyut sınırı."""
+    COLUMNS = ("Ad", "Kip", "Eşik", "Çözünürlük", "Boyut (MB)",
+               "Son Kullanım", "Klasör")
+
+    def __init__(self, parent=None, cache=None):
+        super().__init__(parent)
+        self.cache = cache or default_cache()
+        self.setWindowTitle("Üretim Önbelleği")
+        self.resize(760, 360)
+
+        vbox = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(
+            len(self.COLUMNS) - 1, QHeaderView.Stretch)
+        vbox.addWidget(self.table)
+
+        self.total_label = QLabel()
+        vbox.addWidget(self.total_label)
+
+        # --- boyut sınırı
+        limit_row = QHBoxLayout()
+        self.limit_spin = QDoubleSpinBox()
+        self.limit_spin.setRange(0.1, 1024.0)
+        self.limit_spin.setDecimals(1)
+        self.limit_spin.setSuffix(" GB")
+        self.limit_spin.setValue(self.cache.max_bytes / 2**30)
+        apply_btn = QPushButton("Uygula")
+        apply_btn.clicked.connect(self._apply_limit)
+        limit_row.addWidget(QLabel("Boyut sınırı:"))
+        limit_row.addWidget(self.limit_spin)
+        limit_row.addWidget(apply_btn)
+        limit_row.addStretch()
+        vbox.addLayout(limit_row)
+
+        # --- düğmeler
+        btn_row = QHBoxLayout()
+        remove_btn = QPushButton("Seçileni Sil")
+        remove_btn.clicked.connect(self._remove_selected)
+        clear_btn = QPushButton("Tümünü Temizle")
+        clear_btn.clicked.connect(self._clear)
+        close_btn = QPushButton("Kapat")
+        close_btn.clicked.connect(self.accept)
+        btn_row.addWidget(remove_btn)
+        btn_row.addWidget(clear_btn)
+        btn_row.addStretch()
+        btn_row.addWidget(close_btn)
+        vbox.addLayout(btn_row)
+
+        self._refresh()
+
+    # ------------------------------------------------------------
+    def _refresh(self):
+        entries = self.cache.entries()
+        self.table.setRowCount(len(entries))
+        for row, e in enumerate(entries):
+            p = e.get("params", {})
+            res = p.get("resolution")
+            cells = (
+                e.get("name", e["key"][:8]),
+                "Nokta" if p.get("render_mode") == "point" else "Mesh",
+                str(p.get("threshold", "")),
+                f"{res[0]}×{res[1]}" if res else "özgün",
+                f"{e['bytes'] / 2**20:.1f}",
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(e["last_used"])),
+                e.get("folder", ""),
+            )
+            for col, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.UserRole, e["key"])
+                self.table.setItem(row, col, item)
+        total = sum(e["bytes"] for e in entries)
+        self.total_label.setText(
+            f"{len(entries)} girdi · {total / 2**20:.1f} MB / "
+            f"{self.cache.max_bytes / 2**30:.1f} GB")
+
+    def _apply_limit(self):
+        self.cache.set_max_bytes(self.limit_spin.value() * 2**30)
+        self._refresh()
+
+    def _remove_selected(self):
+        rows = {i.row() for i in self.table.selectedItems()}
+        for row in rows:
+            self.cache.remove(self.table.item(row, 0).data(Qt.UserRole))
+        self._refresh()
+
+    def _clear(self):
+        if QMessageBox.question(self, "Önbelleği Temizle",
+                                "Tüm önbellek girdileri silinsin mi?") \
+                == QMessageBox.Yes:
+            self.cache.clear()
+            self._refresh()
@@ -0,0 +1,311 @@
+# chunked_mesh.py  –  büyük mesh’ler için uzaysal parçalı gösterim (saf NumPy)
+import numpy as np
+
+from mesh import Mesh
+
+# Parça başına en fazla verteks (uint16 indeks sınırı) ve yerleşim hedefi
+CHUNK_VERTS = 65535
+CHUNK_TARGET = 60000
+# Bu kadar verteksten büyük mesh’ler build_mesh ile parçalı kurulur
+CHUNK_MIN_VERTS = 4 * CHUNK_VERTS
+
+_ARRAYS = ("vertices", "indices", "colors", "normals")
+
+
+# ----------------------------------------------------------------------
+# Yerleşim yardımcıları
+# ----------------------------------------------------------------------
+def _spread_bits(x):
+    """10 bitlik tamsayıların bitlerini 3’er aralıkla yayar (Morton)."""
+    x = (x | (x << np.uint64(16))) & np.uint64(0x030000FF)
+    x = (x | (x << np.uint64(8))) & np.uint64(0x0300F00F)
+    x = (x | (x << np.uint64(4))) & np.uint64(0x030C30C3)
+    x = (x | (x << np.uint64(2))) & np.uint64(0x09249249)
+    return x
+
+
+def morton_codes(p: np.ndarray) -> np.ndarray:
+    """(N,3) nokta → (N,) 30 bit Morton kodu (eksen başına 10 bit)."""
+    lo, hi = p.min(0), p.max(0)
+    q = ((p - lo) / np.maximum(hi - lo, 1e-12) * 1023).astype(np.uint64)
+    return (_spread_bits(q[:, 0]) |
+            (_spread_bits(q[:, 1]) << np.uint64(1)) |
+            (_spread_bits(q[:, 2]) << np.uint64(2)))
+
+
+def spatial_layout(V, I, C, N):
+    """
+    Üçgenleri Morton sırasına dizer ve ~CHUNK_TARGET verteklik bloklara
+    böler; her bloğun verteksleri kendi ardışık aralığında olur (sınırdaki
+    verteksler çoğaltılır).  Nokta bulutunda yalnızca vertex sırası.
+    Dönüş: (V, I, C, N) yeniden sıralanmış diziler.
+    """
+    if I.size == 0:
+        order = np.argsort(morton_codes(V), kind="stable")
+        return (V[order], I,
+                C[order] if C is not None else None,
+                N[order] if N is not None else None)
+
+    F = I.reshape(-1, 3)
+    F = F[np.argsort(morton_codes(V[F].mean(1)), kind="stable")]
+    per = max(1, int(CHUNK_TARGET * len(F) / max(len(V), 1)))
+
+    gather, faces, ofs = [], [], 0
+
+    def _emit(block):
+        nonlocal ofs
+        uniq, inv = np.unique(block, return_inverse=True)
+        if len(uniq) > CHUNK_VERTS and len(block) > 1:  # nadir: böl
+            half = len(block) // 2
+            _emit(block[:half])
+            _emit(block[half:])
+            return
+        gather.append(uniq)
+        faces.append(inv.reshape(-1).astype(np.uint32) + np.uint32(ofs))
+        ofs += len(uniq)
+
+    for s in range(0, len(F), per):
+        _emit(F[s:s + per])
+    g = np.concatenate(gather)
+    return (V[g], np.concatenate(faces),
+            C[g] if C is not None else None,
+            N[g] if N is not None else None)
+
+
+def contiguous_layout(I: np.ndarray, n_verts: int):
+    """
+    Dizileri SIRASINI BOZMADAN parçalara ayırır: bir parçanın üçgenleri
+    yalnızca kendi ardışık verteks aralığını gösterir.  Aynı diziler hep
+    aynı parçaları verir (undo/redo sonrası değişmeyen parça yeniden
+    yüklenmez).  Dönüş: [(v0, v1, t0, t1)].
+    """
+    if I.size == 0:  # nokta bulutu: sabit bloklar
+        return [(v, min(v + CHUNK_VERTS, n_verts), 0, 0)
+                for v in range(0, max(n_verts, 1), CHUNK_VERTS)]
+
+    F = I.reshape(-1, 3)
+    pre = np.maximum.accumulate(F.max(1))
+    suf = np.minimum.accumulate(F.min(1)[::-1])[::-1]
+    cut_t = np.flatnonzero(pre[:-1] < suf[1:]) + 1     # aday üçgen sınırı
+    cut_v = pre[cut_t - 1].astype(np.int64) + 1        # karşılık gelen verteks
+
+    bounds, v_start = [(0, 0)], 0
+    while n_verts - v_start > CHUNK_VERTS:
+        # sığan en büyük aday; yoksa ilk aday (parça uint32 indeksle kalır)
+        k = int(np.searchsorted(cut_v, v_start + CHUNK_VERTS, side="right")) - 1
+        if k < 0 or cut_v[k] <= v_start:
+            k = int(np.searchsorted(cut_v, v_start, side="right"))
+            if k >= len(cut_v):
+                break
+        bounds.append((int(cut_t[k]), int(cut_v[k])))
+        v_start = int(cut_v[k])
+    bounds.append((len(F), n_verts))
+    return [(v0, v1, t0, t1)
+            for (t0, v0), (t1, v1) in zip(bounds[:-1], bounds[1:])]
+
+
+def _same_part(p, v, i, c, n):
+    def eq(a, b):
+        if a is None or b is None:
+            return a is None and b is None
+        return a.shape == b.shape and np.array_equal(a, b)
+    return (eq(p.vertices, v) and eq(p.indices, i) and
+            eq(p.colors, c) and eq(p.normals, n))
+
+
+# ----------------------------------------------------------------------
+# Parçalı mesh
+# ----------------------------------------------------------------------
+class ChunkedMesh(Mesh):
+    """
+    Sahnede TEK nesne (ObjectPanel / InspectorPanel, transform, renk, id),
+    GPU’da ~64K verteklik uzaysal parçalar: her parça kendi tamponlarına ve
+    sınır kutusuna sahip ayrı bir Mesh’tir (GpuResourceCache ayrı yükler).
+
+      • Silgi: mark_erased / compact yalnızca ilgili parçalara dokunur →
+        yalnızca o parçalar yeniden yüklenir.
+      • vertices / indices / colors / normals: parçaların birleşimi
+        (sürüm başına bir kez üretilir).  Bütün dizi atamaları (kesme,
+        undo) bump_version’da sırayı bozmadan yeniden parçalanır;
+        içeriği aynı kalan parçalar korunur.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._parts = []
+        self._pending = {}   # atanmış ama henüz parçalanmamış diziler
+        self._flat = None    # (version, V, I, C, N)
+        self._ready = False  # Mesh.__init__ bitene kadar parçalama yok
+        super().__init__(*args, **kwargs)
+        self._ready = True
+        self._flush(spatial=True)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop("_flat", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._flat = None
+
+    # ------------------------------------------------------------------
+    # Düz diziler (parçaların birleşimi)
+    # ------------------------------------------------------------------
+    def _array(self, name):
+        # atanmış dizi parçalanmadan önce de okunabilir (Mesh semantiği);
+        # parçalama bump_version / draw_parts’ta, diziler tutarlıyken
+        if name in self._pending:
+            return self._pending[name]
+        return self._flat_array(name)
+
+    def _flat_array(self, name):
+        f = self._flat
+        if f is None or f[0] != self.version:
+            f = self._flat = (self.version,) + self._concat()
+        return f[1 + _ARRAYS.index(name)]
+
+    def _concat(self):
+        ps = self._parts
+        if not ps:
+            return None, None, None, None
+        ofs = np.cumsum([0] + [len(p.vertices) for p in ps[:-1]])
+        V = np.concatenate([p.vertices for p in ps])
+        I = np.concatenate([p.indices + np.uint32(o) for p, o in zip(ps, ofs)])
+        C = (np.concatenate([p.colors for p in ps])
+             if ps[0].colors is not None else None)
+        N = (np.concatenate([p.normals for p in ps])
+             if ps[0].normals is not None else None)
+        return V, I, C, N
+
+    def _setter(name):
+        def _set(self, value):
+            self._pending[name] = value
+            if len(self._pending) == len(_ARRAYS):  # tam set → hemen böl
+                self._try_flush()
+        return _set
+
+    vertices = property(lambda self: self._array("vertices"), _setter("vertices"))
+    indices = property(lambda self: self._array("indices"), _setter("indices"))
+    colors = property(lambda self: self._array("colors"), _setter("colors"))
+    normals = property(lambda self: self._array("normals"), _setter("normals"))
+    del _setter
+
+    @property
+    def erase_mask(self):
+        masks = [p.erase_mask for p, _ in self.draw_parts()]
+        if all(mk is None for mk in masks):
+            return None
+        return np.concatenate([
+            mk if mk is not None else np.zeros(p._n_elems(), bool)
+            for mk, (p, _) in zip(masks, self.draw_parts())])
+
+    @erase_mask.setter
+    def erase_mask(self, mask):
+        if mask is None:  # bekleyen atamalar zaten maskesiz parçalanır
+            for p in self.__dict__.get("_parts", ()):
+                p.erase_mask = None
+            return
+        for p, base in self.draw_parts():
+            p.erase_mask = mask[base:base + p._n_elems()].copy()
+
+    # ------------------------------------------------------------------
+    # Parçalama
+    # ------------------------------------------------------------------
+    def _try_flush(self):
+        if not self._ready:
+            return
+        cur = {k: (self._pending[k] if k in self._pending
+                   else self._flat_array(k)) for k in _ARRAYS}
+        V = cur["vertices"]
+        if V is not None and any(
+                cur[k] is not None and len(cur[k]) != len(V)
+                for k in ("colors", "normals")):
+            return  # atama yarıda (ör. normaller henüz gelmedi)
+        self._flush(spatial=False, arrays=cur)
+
+    def _flush(self, spatial, arrays=None):
+        a = arrays or {k: self._pending.get(k) for k in _ARRAYS}
+        self._pending = {}
+        V, I, C, N = (a[k] for k in _ARRAYS)
+        if V is None:  # diske taşındı (UndoHistory) → parçaları bırak
+            self._parts, self._flat = [], (self.version, None, None, None, None)
+            return
+        I = np.asarray(I if I is not None else (), np.uint32).ravel()
+        if spatial and len(V):
+            V, I, C, N = spatial_layout(V, I, C, N)
+
+        old, parts = self._parts, []
+        for k, (v0, v1, t0, t1) in enumerate(contiguous_layout(I, len(V))):
+            v, i = V[v0:v1], I[3 * t0:3 * t1] - np.uint32(v0)
+            c = C[v0:v1] if C is not None else None
+            n = N[v0:v1] if N is not None else None
+            # aynı sıradaki eski parça önce denenir
+            hit = next((p for p in old[k:k + 1] + old
+                        if _same_part(p, v, i, c, n)), None)
+            parts.append(hit if hit is not None else
+                         Mesh(v, i, colors=c, color=self.color, normals=n,
+                              mesh_name=f"{self.name}[{k}]"))
+        self._parts = parts
+        self._flat = None
+        self._bounds_from_parts()
+
+    def _bounds_from_parts(self):
+        ps = [p for p in self._parts if len(p.vertices)]
+        if ps:
+            self._aabb_local = (np.min([p.vertices.min(0) for p in ps], 0),
+                                np.max([p.vertices.max(0) for p in ps], 0))
+
+    def bump_version(self):
+        super().bump_version()
+        if self._pending:
+            self._try_flush()
+        else:
+            self._bounds_from_parts()
+
+    def draw_parts(self):
+        if self._pending:
+            self._try_flush()
+        out, base = [], 0
+        for p in self._parts:
+            out.append((p, base))
+            base += p._n_elems()
+        return out
+
+    # ------------------------------------------------------------------
+    # Silgi: yalnızca etkilenen parçalar
+    # ------------------------------------------------------------------
+    def mark_erased(self, ids: np.ndarray) -> np.ndarray:
+        ids = np.unique(ids)
+        out = []
+        for p, base in self.draw_parts():
+            n = p._n_elems()
+            sel = ids[(ids >= base) & (ids < base + n)]
+            if sel.size:
+                out.append(p.mark_erased(sel - base) + base)
+        return np.concatenate(out) if out else ids[:0]
+
+    def compact(self) -> bool:
+        keep, touched = [], False
+        for p, _ in self.draw_parts():
+            v0 = p.version
+            if not p.compact():      # parça tamamen silindi
+                touched = True
+                continue
+            keep.append(p)
+            touched |= p.version != v0
+        if not keep:
+            return False
+        if touched:
+            self._parts = keep
+            self.index_count = sum(p.index_count for p in keep)
+            self.bump_version()
+        return True
+
+
+def build_mesh(vertices, indices, chunked=None, **kwargs) -> Mesh:
+    """
+    Mesh fabrikası: chunked=None → CHUNK_MIN_VERTS’ten büyükse ChunkedMesh.
+    """
+    if chunked is None:
+        chunked = len(vertices) > CHUNK_MIN_VERTS
+    return (ChunkedMesh if chunked else Mesh)(vertices, indices, **kwargs)
@@ -1,37 +1,35 @@
 from PyQt5.QtWidgets import QColorDialog, QOpenGLWidget
 from OpenGL.GL import *
-from mesh import Mesh
+from mesh import Mesh, CULL_CHUNK
+from chunked_mesh import build_mesh
 from shader_utils import build_program
 from OpenGL.GL import glGetDoublev, GL_PROJECTION_MATRIX, GL_MODELVIEW_MATRIX
-import numpy as np, copy, math, os, sys
-from PyQt5.QtCore import Qt, pyqtSignal
+import numpy as np, math, os, sys, ctypes
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtWidgets import QProgressDialog
 from OpenGL.GLU import gluPerspective, gluProject
-from geometry_utils import clip_point_cloud
-
-
-def _parse_mtl(mtl_path: str) -> dict[str, tuple[float, float, float]]:
-    """
-    .mtl dosyasındaki   newmtl <name> / Kd r g b   satırlarını     (0-1 veya 0-255)
-    okur ve  {name: (r,g,b)} sözlüğü döndürür.
-    """
-    if not os.path.isfile(mtl_path):
-        return {}
-
-    mats, current = {}, None
-    with open(mtl_path, "r", errors="ignore") as f:
-        for line in f:
-            if line.startswith("newmtl "):
-                current = line.split(maxsplit=1)[1].strip()
-            elif current and line.startswith("Kd "):
-                r, g, b = map(float, line.split()[1:4])
-                if max(r, g, b) > 1.0:  # 0-255 ise ölçekle
-                    r, g, b = r / 255.0, g / 255.0, b / 255.0
-                mats[current] = (r, g, b)
-    return mats
+from geometry_utils import (clip_point_cloud, csr_gather, index_runs,
+                            frustum_planes, boxes_in_frustum)
+from screen_grid import ScreenGrid
+from id_buffer import IdBuffer, IdBufferError
+from gpu_cache import GpuResourceCache, bind_attribs
+from overlay_renderer import OverlayRenderer
+from history import UndoHistory, HistoryEntry, EraseStep, ListStep
+from obj_loader import load_obj_meshes
+from mesh_worker import MeshTaskWorker
+from frame_timer import FrameTimer
+from bvh import current_bvh, bvh_job, install_bvh
+from OpenGL.error import GLError
+
+# Nokta indeks tamponu uint32 → silinen noktalar bu değerle işaretlenir
+_RESTART_INDEX = 0xFFFFFFFF
+
+
 class Cube3DWidget(QOpenGLWidget):
     scene_changed = pyqtSignal()  # objeler eklendi/silindi
     selection_changed = pyqtSignal(int)  # seçilen mesh id  (yoksa -1)
+    render_stats_changed = pyqtSignal(dict)  # ayıklama sayaçları (değişince)
+    status_message = pyqtSignal(str)  # kullanıcıya kısa bilgi (durum çubuğu)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -46,8 +44,10 @@ class Cube3DWidget(QOpenGLWidget):
         self.mode = None
         self.bg_color = (1, 1, 1, 1)
         self.use_vao = False
-        self.undo_stack = []
-        self.redo_stack = []
+        self.gpu = GpuResourceCache()  # Mesh → GL tamponları (tek sahip)
+        self._workers = set()          # çalışan arka plan işleri (GC’ye karşı)
+        self._bvh_jobs = set()         # BVH’si kurulmakta olan mesh id’leri
+        self.history = UndoHistory(self)
         self.meshes = []
         self.selected_mesh = None
         self.selected_index = -1
@@ -77,6 +77,31 @@ class Cube3DWidget(QOpenGLWidget):
         # camera konfigürasyonu projeye göre ayarlayın
         self.camera = None
         self.erase_dirty = False
+        self.has_prim_restart = False
+        self.id_buffer = None  # ekran-dışı üçgen-ID geçişi (GL ≥ 3.2)
+        self._id_pass_key = None  # son ID geçişinin sahne/kamera anahtarı
+        self._id_epoch = 0        # sürüm dışı GPU değişiklikleri (silgi darbesi)
+        self.overlays = None   # shader ızgara + VBO’lu kaplamalar
+        # kare başına kamera matrisleri (paintGL başında güncellenir)
+        self._frame_P = self._frame_V = np.identity(4)
+        self._point_size = None
+        self.render_stats = {}
+
+        # ── Etkileşimli çizim: sürüklerken seyrek vekil, durunca tam kalite ──
+        self.interactive_policy = "points"  # 'points' | 'triangles' | 'off'
+        self.interactive_target_ms = 33.0   # sürükleme karesi hedef süresi
+        self.interactive_idle_ms = 150      # girdi bu kadar durursa → tam kare
+        self._interacting = False
+        self._elem_cost = None   # ms / çizilen eleman (ölçülen, yumuşatılmış)
+        self._drawn_elems = 0
+        self._proxy_stride = 1
+        self.frame_timer = None
+        self._frame_clock = QTimer(self)   # yeniden çizimleri tazelemeye bağla
+        self._frame_clock.setSingleShot(True)
+        self._frame_clock.timeout.connect(self.update)
+        self._idle_clock = QTimer(self)
+        self._idle_clock.setSingleShot(True)
+        self._idle_clock.timeout.connect(self._end_interaction)
 
     def get_selected_index(self) -> int:
         return self.selected_index
@@ -87,6 +112,24 @@ class Cube3DWidget(QOpenGLWidget):
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         glDisable(GL_CULL_FACE)
 
+        # Sıkı köşe biçimi: 2_10_10_10 normaller GL ≥ 3.3 ister, yoksa int8×4
+        try:
+            ver = (int(glGetIntegerv(GL_MAJOR_VERSION)),
+                   int(glGetIntegerv(GL_MINOR_VERSION)))
+        except GLError:
+            ver = (2, 1)  # GL_MAJOR_VERSION sorgusu 3.0 öncesinde yok
+        self.gpu.packed_normals = ver >= (3, 3)
+        self.gl_version = ver
+
+        # Nokta silgisi için primitive restart (GL ≥ 3.1)
+        self.has_prim_restart = False
+        if ver >= (3, 1):
+            try:
+                glPrimitiveRestartIndex(_RESTART_INDEX)
+                self.has_prim_restart = True
+            except GLError:
+                pass
+
         # ── Lambert aydınlatmalı shader ───────────────────────────────
         vsrc = """
         #version 120
@@ -131,6 +174,29 @@ class Cube3DWidget(QOpenGLWidget):
             print("Shader derlenemedi, eski pipeline'a düşüldü:", e, file=sys.stderr)
             self.use_shader = False
 
+        # ── Üçgen-ID geçişi (görünür yüzey silgisi + hassas seçim) ──────
+        # GLSL 1.50 (uvec2 çıktısı, gl_PrimitiveID) → GL ≥ 3.2
+        try:
+            self.id_buffer = (IdBuffer(prim_restart=self.has_prim_restart)
+                              if self.gl_version >= (3, 2) else None)
+        except (RuntimeError, GLError) as e:
+            print("ID geçişi kurulamadı, izdüşüm yöntemine düşüldü:", e, file=sys.stderr)
+            self.id_buffer = None
+
+        # ── Kare süresi ölçümü (etkileşim bütçesi) ─────────────────────
+        try:
+            self.frame_timer = FrameTimer()
+        except Exception as e:
+            print("Zaman sorgusu kurulamadı, etkileşim vekili kapalı:", e, file=sys.stderr)
+            self.frame_timer = None
+
+        # ── Izgara / eksen / silgi dairesi / kesme çizgisi ─────────────
+        try:
+            self.overlays = OverlayRenderer()
+        except Exception as e:
+            print("Kaplama shader’ı kurulamadı, glBegin yoluna düşüldü:", e, file=sys.stderr)
+            self.overlays = None
+
         # ── Eski sabit-pipeline yedeği ────────────────────────────────
         if not self.use_shader:
             glEnable(GL_COLOR_MATERIAL)
@@ -174,8 +240,18 @@ class Cube3DWidget(QOpenGLWidget):
         glTranslatef(self.x_translation, self.y_translation, self.zoom)
         glMultMatrixf(self.rotation_matrix.flatten('F'))
 
+        # kamera matrisleri kare başına bir kez (CPU; glGetFloatv yok)
+        self._frame_P = self._proj_mat().astype(np.float64)
+        self._frame_V = self._view_mat().astype(np.float64)
+        PV = self._frame_P @ self._frame_V
+
         # --- IZGARA -----------------------------------------------------
-        if self.grid_visible:
+        if self.grid_visible and self.overlays is not None:
+            # tek tam ekran geçiş / düzlem; çizgiler gölgelendiricide
+            self.overlays.draw_grid(PV,
+                                    self.grid_mode, self._grid_spacing,
+                                    self._grid_half_count * self._grid_spacing)
+        elif self.grid_visible:
             glUseProgram(0)
             glDisable(GL_LIGHTING)
             if self.grid_mode == 'all':
@@ -196,16 +272,26 @@ class Cube3DWidget(QOpenGLWidget):
             glUseProgram(0);
             glDisable(GL_LIGHTING)
             glLineWidth(0.5);
-            self._draw_axis()
+            if self.overlays is not None:
+                self.overlays.draw_axis(PV, self.axis_length)
+            else:
+                self._draw_axis()
             glEnable(GL_LIGHTING)
             if self.use_shader: glUseProgram(self.prog)
 
         # --- MESH'LER ---------------------------------------------------
-        for mesh in self.meshes:
-            self._draw_mesh(mesh)
+        self.gpu.collect(self.meshes)
+        ft = self.frame_timer
+        if ft is not None:
+            self._learn_cost(ft.poll())
+            ft.begin()
+        self._draw_meshes()
+        if ft is not None:
+            self._learn_cost(ft.end(self._drawn_elems))
 
         # --- Seçili mesh vurgusu + kesme çizgisi ------------------------
-        if self.selected_mesh:
+        # (vekil karede tam tel kafes çizilmez; bırakınca gelir)
+        if self.selected_mesh and self._proxy_stride == 1:
             self._highlight(self.selected_mesh)
         self._draw_cut_line()
 
@@ -213,6 +299,11 @@ class Cube3DWidget(QOpenGLWidget):
         if self.mode == 'erase' and self.erase_cursor is not None:
             self._draw_erase_circle()
 
+        # --- Seçim tamponu: sahne/kamera durunca bir kez, eşzamansız ------
+        if (self.id_buffer is not None and self.mode is None
+                and not self._interacting and self.meshes):
+            self._ensure_id_pass(readback=True)
+
     def set_axis_visible(self, visible: bool):
         """Eksen çizimini aç/kapa."""
         self.axis_visible = visible
@@ -322,134 +413,268 @@ class Cube3DWidget(QOpenGLWidget):
             glVertex3f(0.0, cy+off, cz+half*s)
         glEnd()
 
-    def _create_vao(self, mesh):
-        """Bir Mesh için (henüz yoksa) VAO kurar ve öznitelikleri bağlar."""
-        if mesh.vao:
+    def _create_vao(self, g):
+        """Bir mesh’in tamponları için (henüz yoksa) VAO kurar."""
+        if g.vao:
             return
-        mesh.vao = glGenVertexArrays(1)
-        glBindVertexArray(mesh.vao)
-
-        # --- Pozisyon ---
-        glBindBuffer(GL_ARRAY_BUFFER, mesh.vbo_v)
-        glEnableVertexAttribArray(0)
-        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 0, None)
-
-        # --- Renk (varsa) ---
-        if mesh.vbo_c:
-            glBindBuffer(GL_ARRAY_BUFFER, mesh.vbo_c)
-            glEnableVertexAttribArray(1)
-            glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 0, None)
+        g.vao = glGenVertexArrays(1)
+        glBindVertexArray(g.vao)
 
-        # --- Normal ---
-        glBindBuffer(GL_ARRAY_BUFFER, mesh.vbo_n)
-        glEnableVertexAttribArray(2)
-        glVertexAttribPointer(2, 3, GL_FLOAT, GL_FALSE, 0, None)
+        # --- Pozisyon / renk (varsa) / normal: biçim g.attribs’ta ---
+        bind_attribs(g)
 
         # --- Eleman dizisi ---
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, mesh.vbo_i)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, g.vbo_i)
 
         glBindVertexArray(0)  # temizle
 
-    def _draw_mesh(self, m, id_color=None):
-        """Tek bir Mesh’i (üçgen veya nokta bulutu) ekrana çizer."""
-        if not hasattr(m, "vao"):
-            self._create_vao(m)
+    def _state_key(self, m):
+        """Çizim sırası: opak → saydam, sonra ilkel / renk kaynağı / nokta boyu."""
+        return (m.transparent, m.draw_mode, m.colors is None,
+                getattr(m, "point_size", 2.0))
 
-        use_vao = self.use_vao and getattr(m, "vao", 0) and id_color is None
+    def _begin_shaded(self):
+        """Lambert programını bağlar; ışık uniform’ları sabit → bir kez."""
+        glUseProgram(self.prog)
+        glUniform3f(self.u_ldir, 0.577, 0.577, 0.577)
+        glUniform3f(self.u_amb, 0.20, 0.20, 0.20)
+        glUniform3f(self.u_dif, 0.80, 0.80, 0.80)
+        glEnable(GL_PROGRAM_POINT_SIZE)  # (core-profile için gerek)
+
+    def _visible_ranges(self, d, planes, stats):
+        """
+        Görüş-hacmi ayıklaması (yerel uzayda, önbellekli blok kutularıyla).
+        d: çizilen Mesh / parça.  Dönüş: None → tümü çiz, [] → tamamen
+        dışarıda, aksi [(ilk, adet), …] eleman aralıkları.
+        """
+        n, mn, mx = d.cull_chunks()
+        if not n:
+            return None
+        stats["chunks"] += len(mn)
+        if not boxes_in_frustum(planes, mn.min(0, keepdims=True),
+                                mx.max(0, keepdims=True))[0]:
+            stats["chunks_culled"] += len(mn)
+            return []
+        if len(mn) == 1:
+            return None
+        vis = boxes_in_frustum(planes, mn, mx)
+        stats["chunks_culled"] += int((~vis).sum())
+        if vis.all():
+            return None
+        return [(c0 * CULL_CHUNK, min(c1 * CULL_CHUNK, n) - c0 * CULL_CHUNK)
+                for c0, c1 in index_runs(np.flatnonzero(vis), max_gap=1)]
+
+    def _draw_meshes(self):
+        """
+        Ana mesh geçişi.  Program + ışık kare başına bir kez kurulur; mesh’ler
+        (parçalıysa parça parça) görüş hacmine göre ayıklanır, duruma göre
+        sıralanıp yalnızca MVP / normal matrisi yüklenerek çizilir.
+        """
+        PV = self._frame_P @ self._frame_V
+        stats = dict(meshes=len(self.meshes), culled=0, chunks=0, chunks_culled=0,
+                     nodes=0, streaming=False)
+        visible, total = [], 0
+        for m in self.meshes:
+            planes = frustum_planes(PV @ m.model_matrix())
+            select = getattr(m, "select_view", None)
+            if select is not None:  # octree’li bulut: bu karenin düğümleri
+                stats["streaming"] |= select(self._frame_P,
+                                             self._frame_V @ m.model_matrix(),
+                                             self.height())
+                stats["nodes"] += len(m._view or ())
+            drawn = False
+            for d, _ in m.draw_parts():
+                ranges = self._visible_ranges(d, planes, stats)
+                if ranges is None or ranges:
+                    visible.append((m, d, ranges))
+                    total += (d._n_elems() if ranges is None
+                              else sum(c for _, c in ranges))
+                    drawn = True
+            stats["culled"] += not drawn
+
+        stride = self._proxy_stride = self._interaction_stride(total)
+        self._drawn_elems = total // stride
+        stats["stride"] = stride
+
+        if self.use_shader:
+            self._begin_shaded()
+            self._point_size = None
+            visible.sort(key=lambda it: self._state_key(it[0]))
+        for m, d, ranges in visible:
+            self._draw_mesh(m, in_pass=self.use_shader, ranges=ranges, part=d,
+                            stride=stride)
+        if self.use_shader:
+            self._point_size = None
+            glUseProgram(0)
+
+        if stats["streaming"]:  # kalan düğümler sonraki karelerde yüklenir
+            QTimer.singleShot(0, self.update)
+        if stats != self.render_stats:
+            self.render_stats = stats
+            self.render_stats_changed.emit(dict(stats))
+
+    def _draw_mesh(self, m, id_color=None, in_pass=False, ranges=None, part=None,
+                   stride=1):
+        """
+        Tek bir Mesh’i (üçgen veya nokta bulutu) ekrana çizer.
+        in_pass=True → _draw_meshes içinden: program ve ışık zaten hazır.
+        ranges       → yalnızca görünür (ilk, adet) eleman aralıkları.
+        part         → m.draw_parts() parçalarından biri (None → hepsi).
+        stride > 1   → etkileşim vekili: her stride’ıncı nokta / üçgen.
+        """
+        if part is None:
+            for d, _ in m.draw_parts():
+                self._draw_mesh(m, id_color, in_pass, ranges, d, stride)
+            return
+        d = part  # veri / tamponlar parçadan, transform + renk m’den
+        proxy_pts = self.interactive_policy == "points" or not d.index_count
+        if stride > 1:  # seyrek indeks listesi (bağlamadan önce yüklenir)
+            g = self.gpu.proxy(d, stride, proxy_pts)
+        else:
+            g = self.gpu.get(d)  # veri değiştiyse yalnızca farkı yükler
+        if self.use_vao and id_color is None:
+            self._create_vao(g)
+
+        use_vao = self.use_vao and g.vao and id_color is None
 
         # ────────────────── Öznitelikleri / tamponları bağla ──────────────────
         if use_vao:
-            glBindVertexArray(m.vao)
+            glBindVertexArray(g.vao)
         else:
-            # a_pos
-            glBindBuffer(GL_ARRAY_BUFFER, m.vbo_v)
-            glEnableVertexAttribArray(0)
-            glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 0, None)
+            # a_pos + a_nrm (float32 ayrık veya sıkı iç içe tampon)
+            bind_attribs(g, (0, 2))
 
             # a_col (yalnız seçim rengi yoksa veya vertex-renk varsa)
-            if id_color is None and m.vbo_c:
-                glBindBuffer(GL_ARRAY_BUFFER, m.vbo_c)
-                glEnableVertexAttribArray(1)
-                glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 0, None)
+            if id_color is None and g.has_color:
+                bind_attribs(g, (1,))
             else:
                 glDisableVertexAttribArray(1)
 
-            # a_nrm
-            glBindBuffer(GL_ARRAY_BUFFER, m.vbo_n)
-            glEnableVertexAttribArray(2)
-            glVertexAttribPointer(2, 3, GL_FLOAT, GL_FALSE, 0, None)
-
-            # indices
-            if m.vbo_i:  # 0 veya None değilse bağla
-                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, m.vbo_i)
-            else:
-                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)  # boş bağ
-
-        # ───────────────────── Model matrisi uygula ───────────────────────────
-        glPushMatrix()
-        glTranslatef(*m.translation)
-        sx, sy, sz = (m.scale if isinstance(m.scale, (list, tuple, np.ndarray))
-                      else (m.scale,) * 3)
-        glScalef(sx, sy, sz)
-
-        R = np.asarray(m.rotation, np.float32)
-        if R.shape == (3, 3):
-            M = np.identity(4, np.float32)
-            M[:3, :3] = R
-        else:
-            M = R.reshape(4, 4)
-        glMultMatrixf(M.flatten("F"))
+            # indices (0 → boş bağ)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, g.vbo_i)
 
         # ───────────────────── Shader / sabit-pipeline ayarları ───────────────
+        M = m.model_matrix()  # transform değişene kadar önbellekte
+        shaded = id_color is None and self.use_shader
         restore_attr1 = False
-        if id_color is None and self.use_shader:
-            glUseProgram(self.prog)
+        if shaded:
+            if not in_pass:
+                self._begin_shaded()
 
-            # MVP
-            mv = np.array(glGetFloatv(GL_MODELVIEW_MATRIX), np.float32).reshape(4, 4).T
-            pr = np.array(glGetFloatv(GL_PROJECTION_MATRIX), np.float32).reshape(4, 4).T
-            mvp = pr @ mv
-            glUniformMatrix4fv(self.u_mvp, 1, GL_FALSE, mvp.T)
+            # MVP: kare matrisleri CPU’da; nicem çözme (M · D) katlanır
+            mv = self._frame_V @ M
+            mvp = self._frame_P @ g.model(mv)
+            glUniformMatrix4fv(self.u_mvp, 1, GL_TRUE, mvp.astype(np.float32))
 
             # normal matrisi
-            glUniformMatrix3fv(self.u_nmat, 1, GL_FALSE, mv[:3, :3].T)
-
-            # ışık
-            glUniform3f(self.u_ldir, 0.577, 0.577, 0.577)
-            glUniform3f(self.u_amb, 0.20, 0.20, 0.20)
-            glUniform3f(self.u_dif, 0.80, 0.80, 0.80)
+            glUniformMatrix3fv(self.u_nmat, 1, GL_TRUE,
+                               mv[:3, :3].astype(np.float32))
 
             # sabit tek renkli mesh
-            if not m.vbo_c:
+            if not g.has_color:
                 glDisableVertexAttribArray(1)
                 glVertexAttrib3f(1, *m.color)
         else:
             glUseProgram(0)
+            # sabit-pipeline / renk-ID yolu: model (+ nicem çözme) yığına
+            glPushMatrix()
+            glMultMatrixf(g.model(M).astype(np.float32).flatten("F"))
             if id_color:  # seçim çizimi
                 glDisableVertexAttribArray(1)
                 glVertexAttrib3f(1, *id_color)
-                if m.vbo_c:  # sonra geri açılacak
+                if g.has_color:  # sonra geri açılacak
                     restore_attr1 = True
-            elif not m.vbo_c:  # sabit renk
+            elif not g.has_color:  # sabit renk
                 glDisableVertexAttribArray(1)
                 glColor4f(*m.color, 0.1 if m.transparent else 1.0)
 
         # ───────────────────────── Gerçek çizim ───────────────────────────────
-        if m.draw_mode == GL_TRIANGLES and m.index_count:
-            glDrawElements(GL_TRIANGLES, m.index_count, GL_UNSIGNED_INT, None)
+        if stride > 1:
+            if proxy_pts:
+                self._set_point_size(getattr(m, "point_size", 2.0), in_pass)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, g.vbo_proxy)
+            glDrawElements(GL_POINTS if proxy_pts else GL_TRIANGLES,
+                           g.proxy_count, GL_UNSIGNED_INT, None)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, g.vbo_i)  # VAO bağını geri al
+        elif d.draw_mode == GL_TRIANGLES and d.index_count:
+            if ranges is None:
+                glDrawElements(GL_TRIANGLES, d.index_count, g.index_type, None)
+            else:
+                tri_bytes = 3 * np.dtype(g.index_dtype).itemsize
+                for first, count in ranges:
+                    glDrawElements(GL_TRIANGLES, 3 * count, g.index_type,
+                                   ctypes.c_void_p(first * tri_bytes))
         else:  # nokta bulutu
-            size = getattr(m, "point_size", 2.0)
-            glEnable(GL_PROGRAM_POINT_SIZE)  # (core-profile için gerek)
-            glPointSize(size)
-            glDrawArrays(GL_POINTS, 0, len(m.vertices))
+            self._set_point_size(getattr(m, "point_size", 2.0), in_pass)
+            if g.vbo_pts:  # silgi darbesi sürüyor → maskeli liste
+                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, g.vbo_pts)
+                if self.has_prim_restart:
+                    glEnable(GL_PRIMITIVE_RESTART)
+                glDrawElements(GL_POINTS, g.pts_count, GL_UNSIGNED_INT, None)
+                if self.has_prim_restart:
+                    glDisable(GL_PRIMITIVE_RESTART)
+            elif ranges is None:
+                glDrawArrays(GL_POINTS, 0, len(d.vertices))
+            else:
+                for first, count in ranges:
+                    glDrawArrays(GL_POINTS, first, count)
 
         # ───────────────────────── Temizlik / restore ────────────────────────
         if use_vao and restore_attr1:
             glEnableVertexAttribArray(1)
         if use_vao:
             glBindVertexArray(0)
-        glUseProgram(0)
-        glPopMatrix()
+        if not shaded:
+            glPopMatrix()
+        elif not in_pass:
+            glUseProgram(0)
+
+    def _set_point_size(self, size, in_pass):
+        if not in_pass:
+            glEnable(GL_PROGRAM_POINT_SIZE)
+            glPointSize(size)
+        elif self._point_size != size:  # sıralı → değişince
+            glPointSize(size)
+            self._point_size = size
+
+    # ------------------------------------------------------------------
+    # Etkileşimli çizim (sürükleme / tekerlek)
+    # ------------------------------------------------------------------
+    def _learn_cost(self, samples):
+        """Ölçülen kare sürelerinden eleman başı maliyeti (ms) günceller."""
+        for ms, elems in samples:
+            if elems:
+                c = ms / elems
+                self._elem_cost = (c if self._elem_cost is None
+                                   else 0.8 * self._elem_cost + 0.2 * c)
+
+    def _interaction_stride(self, total):
+        """Sürüklerken hedef süreye sığacak seyreltme adımı (1 → tam)."""
+        if (not self._interacting or self.interactive_policy == "off"
+                or not self._elem_cost or not total):
+            return 1
+        budget = max(self.interactive_target_ms / self._elem_cost, 1.0)
+        return max(1, int(np.ceil(total / budget)))
+
+    def _interact(self):
+        """
+        Kamera / nesne sürükleniyor: yeniden çizimi ekran tazelemesine
+        bağlar (olay başına değil) ve girdi durunca tam kaliteye döner.
+        """
+        self._interacting = True
+        self._idle_clock.start(self.interactive_idle_ms)
+        if not self._frame_clock.isActive():
+            try:
+                hz = self.screen().refreshRate() or 60.0
+            except Exception:
+                hz = 60.0
+            self._frame_clock.start(max(1, int(1000.0 / hz)))
+
+    def _end_interaction(self):
+        self._idle_clock.stop()
+        if self._interacting:
+            self._interacting = False
+            self.update()  # tam kalite kare
 
     def _highlight(self, m):
         glDisable(GL_LIGHTING)
@@ -465,6 +690,10 @@ class Cube3DWidget(QOpenGLWidget):
             return
         cx, cy = self.erase_cursor.x(), self.height() - self.erase_cursor.y()
         rad_px = self.erase_radius_px
+        if self.overlays is not None:
+            glLineWidth(1.0)
+            self.overlays.draw_circle(self.width(), self.height(), cx, cy, rad_px)
+            return
 
         glMatrixMode(GL_PROJECTION);
         glPushMatrix();
@@ -491,18 +720,17 @@ class Cube3DWidget(QOpenGLWidget):
         glMatrixMode(GL_MODELVIEW)
 
     def _model_matrix(self, m):
-        S = np.diag([m.scale if np.isscalar(m.scale) else 1,
-                     m.scale if np.isscalar(m.scale) else 1,
-                     m.scale if np.isscalar(m.scale) else 1, 1]).astype(np.float32)
-        R = np.identity(4, np.float32)
-        R[:3, :3] = m.rotation if m.rotation.shape == (3, 3) \
-            else m.rotation.reshape(4, 4)[:3, :3]
-        T = np.identity(4, np.float32);
-        T[:3, 3] = m.translation
-        return T @ R @ S
+        return m.model_matrix()
     def _draw_cut_line(self):
         if not (self.cut_mode and self.cut_start_pos and self.cut_end_pos):
             return
+        if self.overlays is not None:
+            glLineWidth(0.5)
+            self.overlays.draw_line2d(
+                self.width(), self.height(),
+                (self.cut_start_pos.x(), self.cut_start_pos.y()),
+                (self.cut_end_pos.x(), self.cut_end_pos.y()))
+            return
         glMatrixMode(GL_PROJECTION)
         glPushMatrix()
         glLoadIdentity()
@@ -523,161 +751,32 @@ class Cube3DWidget(QOpenGLWidget):
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
 
-    def save_state(self):
-        # Create a deep copy of meshes with proper color handling
-        meshes_copy = []
-        for m in self.meshes:
-            mesh_copy = copy.deepcopy(m)
-            # Ensure colors are properly copied if they exist
-            if hasattr(m, 'colors') and m.colors is not None:
-                mesh_copy.colors = m.colors.copy()
-            meshes_copy.append(mesh_copy)
-
-        self.undo_stack.append({
-            'meshes': meshes_copy,
-            'rotation_matrix': self.rotation_matrix.copy(),
-            'x_translation': self.x_translation,
-            'y_translation': self.y_translation,
-            'zoom': self.zoom,
-            'bg_color': self.bg_color,
-            'selected_id': self.selected_mesh.id if self.selected_mesh else None
-        })
-        self.redo_stack.clear()
-
-    def load_state(self, s):
+    def save_state(self, label: str = ""):
         """
-        Undo/redo için kaydedilmiş durumu geri yükler ve GPU tamponlarını günceller.
+        Undo için “önce” görüntüsünü alır (yalnızca referanslar; kopya yok).
+        İşlem bitince commit_state() farkı kaydeder; unutulursa bir sonraki
+        save_state / undo / redo bunu kendisi yapar.
+        label: aynı etiketli hızlı ardışık adımlar (zoom, move, …) tek
+        undo kaydında birleştirilir (history.COALESCE_LABELS).
         """
-        try:
-            self.makeCurrent()
+        self.history.begin(label)
 
-            # 1) Önce mevcut GPU kaynaklarını temizle (sadece gerçekten var olanları sil)
-            for m in self.meshes:
-                if hasattr(m, 'vbo_v') and m.vbo_v:
-                    glDeleteBuffers(1, [m.vbo_v])
-                if hasattr(m, 'vbo_i') and m.vbo_i:
-                    glDeleteBuffers(1, [m.vbo_i])
-                if hasattr(m, 'vbo_c') and m.vbo_c:
-                    glDeleteBuffers(1, [m.vbo_c])
-                if hasattr(m, 'vbo_n') and m.vbo_n:
-                    glDeleteBuffers(1, [m.vbo_n])
-                if hasattr(m, 'vao') and m.vao:
-                    glDeleteVertexArrays(1, [m.vao])
-
-            # 2) Kaydedilmiş durumu geri yükle
-            self.meshes = s['meshes']
-            self.selected_mesh = s.get('selected_mesh')
-            self.next_color_id = s.get('next_color_id', self.next_color_id)
-            # (Burada gerektiği kadar diğer durum verilerini de yüklersiniz.)
-
-            # 3) Yüklenen her mesh için VBO/VAO oluştur
-            for m in self.meshes:
-                m.vbo_v = glGenBuffers(1)
-                glBindBuffer(GL_ARRAY_BUFFER, m.vbo_v)
-                glBufferData(GL_ARRAY_BUFFER, m.vertices.nbytes, m.vertices, GL_STATIC_DRAW)
-
-                if m.indices is not None and len(m.indices):
-                    m.vbo_i = glGenBuffers(1)
-                    if m.vbo_i:  # 0 veya None değilse bağla
-                        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, m.vbo_i)
-                    else:
-                        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)  # boş bağ
-                    glBufferData(GL_ELEMENT_ARRAY_BUFFER, m.indices.nbytes, m.indices, GL_STATIC_DRAW)
-                else:
-                    m.vbo_i = glGenBuffers(1)
-                    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, m.vbo_i)
-                    glBufferData(GL_ELEMENT_ARRAY_BUFFER, 0, None, GL_STATIC_DRAW)
-
-                if hasattr(m, 'colors') and m.colors is not None:
-                    m.vbo_c = glGenBuffers(1)
-                    glBindBuffer(GL_ARRAY_BUFFER, m.vbo_c)
-                    glBufferData(GL_ARRAY_BUFFER, m.colors.nbytes, m.colors, GL_STATIC_DRAW)
-                else:
-                    m.vbo_c = None
-
-                if hasattr(m, 'normals') and m.normals is not None:
-                    m.vbo_n = glGenBuffers(1)
-                    glBindBuffer(GL_ARRAY_BUFFER, m.vbo_n)
-                    glBufferData(GL_ARRAY_BUFFER, m.normals.nbytes, m.normals, GL_STATIC_DRAW)
-                else:
-                    m.vbo_n = None
-
-                # VAO oluştur ve ilgili vertex attrib pointer’ları ayarla
-                m.vao = glGenVertexArrays(1)
-                glBindVertexArray(m.vao)
-                glBindBuffer(GL_ARRAY_BUFFER, m.vbo_v)
-                glEnableVertexAttribArray(0)
-                glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 0, None)
-
-                if m.vbo_c:
-                    glBindBuffer(GL_ARRAY_BUFFER, m.vbo_c)
-                    glEnableVertexAttribArray(1)
-                    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 0, None)
-
-                if m.vbo_n:
-                    glBindBuffer(GL_ARRAY_BUFFER, m.vbo_n)
-                    glEnableVertexAttribArray(2)
-                    glVertexAttribPointer(2, 3, GL_FLOAT, GL_FALSE, 0, None)
-
-                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, m.vbo_i or 0)
-                glBindVertexArray(0)
-
-            # 4) Kamera & sahne durumunu yükle
-            self.rotation_matrix = s['rotation_matrix'].copy()
-            self.x_translation = s['x_translation']
-            self.y_translation = s['y_translation']
-            self.zoom = s['zoom']
-
-            # 5) Arkaplan rengi
-            self.bg_color = s.get('bg_color', self.bg_color)
-            glClearColor(*self.bg_color)
-
-            # 6) Seçili mesh
-            sid = s['selected_id']
-            self.selected_mesh = next((m for m in self.meshes if m.id == sid), None)
-
-            # 7) Görünümü yenile
-            self.scene_changed.emit()
-            self.update()
+    def commit_state(self):
+        """Bekleyen undo adımını (önce/sonra farkı) kaydeder."""
+        self.history.commit()
 
-        except Exception as e:
-            print(f"Error in load_state: {e}")
-        finally:
-            self.doneCurrent()
+    def _after_history(self):
+        self.scene_changed.emit()  # <<< panel
+        self.selection_changed.emit(self.selected_index)  # <<< panel
+        self.update()
 
     def undo(self):
-        if not self.undo_stack:
-            return
-        self.redo_stack.append({
-            'meshes': copy.deepcopy(self.meshes),
-            'rotation_matrix': self.rotation_matrix.copy(),
-            'x_translation': self.x_translation,
-            'y_translation': self.y_translation,
-            'zoom': self.zoom,
-            'bg_color': self.bg_color,
-            'selected_id': self.selected_mesh.id if self.selected_mesh else None
-        })
-        self.load_state(self.undo_stack.pop())
-        self.scene_changed.emit()                           #  <<< panel
-        sid = self.selected_mesh.id if self.selected_mesh else -1
-        self.selection_changed.emit(sid)
+        if self.history.undo():
+            self._after_history()
 
     def redo(self):
-        if not self.redo_stack:
-            return
-        self.undo_stack.append({
-            'meshes': copy.deepcopy(self.meshes),
-            'rotation_matrix': self.rotation_matrix.copy(),
-            'x_translation': self.x_translation,
-            'y_translation': self.y_translation,
-            'zoom': self.zoom,
-            'bg_color': self.bg_color,
-            'selected_id': self.selected_mesh.id if self.selected_mesh else None
-        })
-        self.load_state(self.redo_stack.pop())
-        self.scene_changed.emit()  # <<< panel
-        sid = self.selected_mesh.id if self.selected_mesh else -1
-        self.selection_changed.emit(sid)  # <<< panel
+        if self.history.redo():
+            self._after_history()
 
     def clear_scene(self):
         """Tüm objeleri ve dönüşümleri sıfırla."""
@@ -685,99 +784,89 @@ class Cube3DWidget(QOpenGLWidget):
         self.meshes.clear()
         self.selected_mesh = None
         self.rotation_matrix = np.identity(4, np.float32)
+        self.commit_state()
         self.scene_changed.emit()  # <<< panel
         self.selection_changed.emit(-1)  # <<< panel
         self.update()
 
     def load_obj(self, fn: str):
         """
-        HIZLI OBJ yükleyici:
-          •   read() → tek pass; NumPy ile vertex/faces çıkarımı
-          •   "f" satırlarındaki n-gon'ları tek seferde üçgen fana açar
-          •   Vertex-renk yoksa MTL renklerini korur
+        Senkron OBJ yükleme (GUI iş parçacığında).  Ayrıştırma ve normal
+        hesabı obj_loader’da; dönüş: eklenen ilk Mesh (yoksa None).
+        Büyük dosyalar için load_obj_async tercih edilmeli.
         """
-        import re, numpy as np, os
-        from collections import defaultdict
-
-        txt = open(fn, "r", errors="ignore").read().splitlines()
-
-        v_lines = [l for l in txt if l.startswith("v ")]
-        f_lines = [l for l in txt if l.startswith("f ")]
-        usemtl = np.array([i for i, l in enumerate(txt) if l.startswith("usemtl")])
-        mtl_of_line = {}
-        for i in range(len(usemtl)):
-            start = usemtl[i]
-            end = usemtl[i + 1] if i + 1 < len(usemtl) else len(txt)
-            mat = txt[start].split()[1]
-            for ln in range(start + 1, end):
-                mtl_of_line[ln] = mat
-
-        # ---------- Vertex pozisyonları (r g b varsa al) ----------
-        verts = np.empty((len(v_lines), 3), np.float32)
-        vcols = np.empty((len(v_lines), 3), np.float32)
-        has_col = False
-        for i, l in enumerate(v_lines):
-            vals = list(map(float, l.split()[1:]))
-            verts[i] = vals[:3]
-            if len(vals) >= 6:
-                vcols[i] = vals[3:6]
-                has_col = True
-        c_arr = vcols if has_col else None
-        verts -= verts.mean(0)
-
-        # ---------- Faces → tek pass triangülasyon ----------
-        faces_by_mat = defaultdict(list)
-        tri_cnt = 0
-        for ln, l in enumerate(f_lines):
-            idx = [int(tok.split("/")[0]) - 1 for tok in l.split()[1:]]
-            if len(idx) < 3:
-                continue
-            # fan
-            base = idx[0]
-            tris = [[base, idx[i], idx[i + 1]] for i in range(1, len(idx) - 1)]
-            mat = mtl_of_line.get(ln, None)
-            faces_by_mat[mat].extend(tris)
-            tri_cnt += len(tris)
-
-        if tri_cnt == 0:
-            self.save_state()
-            col = (0.8, 0.8, 0.8)  # varsayılan tek renk
-            m = Mesh(verts,
-                     indices=np.empty(0, np.uint32),  # yüzey yok
-                     colors=c_arr if has_col else None,
-                     color=col,
-                     mesh_name=os.path.basename(fn) + "_pts")
-            m.draw_mode = GL_POINTS  # güvence
-            m.id = self.next_color_id;
-            self.next_color_id += 1
-            self.meshes.append(m)
-            self.scene_changed.emit()
-            self.update()
-            return
+        meshes = load_obj_meshes(fn)
+        self.add_meshes(meshes)
+        return meshes[0] if meshes else None
+
+    def load_obj_async(self, fn: str, on_done=None, on_progress=None):
+        """
+        OBJ’yi arka planda okur (Mesh saf NumPy → GL bağlamı gerekmez);
+        bitince GUI iş parçacığında sahneye ekler ve on_done(meshes) çağırır.
+        """
+        def _done(meshes):
+            self.add_meshes(meshes)
+            if on_done:
+                on_done(meshes or [])
 
-            # ---------- .mtl renklerini yükle ----------
-        mtl_colors = {}
-        mtl_match = re.search(r"mtllib +(\S+)", "\n".join(txt))
-        if mtl_match:
-            mtl_path = os.path.join(os.path.dirname(fn), mtl_match.group(1))
-            mtl_colors = _parse_mtl(mtl_path)
+        return self._run_task(
+            lambda cb, stop: load_obj_meshes(fn, cb, stop), _done, on_progress)
 
-        # ---------- Mesh'leri oluştur ----------
+    def add_meshes(self, meshes):
+        """Hazır Mesh’leri tek undo kaydıyla sahneye ekler (GUI iş parçacığı)."""
+        if not meshes:
+            return
         self.save_state()
-        for mat, tris in faces_by_mat.items():
-            v_idx = np.array(tris, np.uint32).flatten()
-            col = mtl_colors.get(mat, (0.8, 0.8, 0.8))
-            m = Mesh(verts, v_idx,
-                     colors=c_arr if has_col else None,
-                     color=col,
-                     mesh_name=f"{os.path.basename(fn)}_{mat or 'def'}")
-            m.id = self.next_color_id;
+        for m in meshes:
+            m.id = self.next_color_id
             self.next_color_id += 1
             self.meshes.append(m)
-
+            self._schedule_bvh(m)
+        self.commit_state()
         self.scene_changed.emit()
         self.update()
 
+    def stop_workers(self):
+        """Arka plan işlerini (BVH, OBJ okuma, kesme) durdurup bekler."""
+        for worker in list(self._workers):
+            worker.stop()
+        for worker in list(self._workers):
+            worker.wait()
+
+    def _run_task(self, fn, on_result, on_progress=None):
+        """fn(progress_cb, stop_flag) işini MeshTaskWorker’da başlatır."""
+        worker = MeshTaskWorker(fn, self)
+        worker.result_signal.connect(on_result)
+        if on_progress is not None:
+            worker.progress_signal.connect(on_progress)
+        worker.failed_signal.connect(
+            lambda msg: print(f"[worker] {msg}", file=sys.stderr))
+        worker.finished.connect(lambda: self._workers.discard(worker))
+        self._workers.add(worker)
+        worker.start()
+        return worker
+
+    # ---------- BVH (kesin ışın sorguları) ----------------------------
+    def _schedule_bvh(self, m):
+        """m’nin BVH’sini arka planda (yeniden) kurar; sonuç m._bvh’ye."""
+        if (id(m) in self._bvh_jobs or m.vertices is None or not len(m.vertices)
+                or getattr(m, "out_of_core", False)):  # octree zaten uzaysal
+            return
+        self._bvh_jobs.add(id(m))
+
+        def _done(result):
+            install_bvh(m, result)
+            self._bvh_jobs.discard(id(m))
+        worker = self._run_task(bvh_job(m), _done)
+        worker.finished.connect(lambda: self._bvh_jobs.discard(id(m)))
+
+    def mesh_bvh(self, m):
+        """Güncel BVH; yoksa / bayatsa arka planda kurulur ve None döner."""
+        bvh = current_bvh(m)
+        if bvh is None:
+            self._schedule_bvh(m)
+        return bvh
+
     def set_background_color(self):
         self.save_state()
         c = QColorDialog.getColor()
@@ -787,6 +876,7 @@ class Cube3DWidget(QOpenGLWidget):
             glClearColor(*self.bg_color)
             self.doneCurrent()
             self.update()
+        self.commit_state()
 
     def delete_selected_object(self):
         """Seçili mesh'i sil."""
@@ -794,6 +884,7 @@ class Cube3DWidget(QOpenGLWidget):
             self.save_state()
             self.meshes.remove(self.selected_mesh)
             self.selected_mesh = None
+            self.commit_state()
             self.scene_changed.emit()                       #  <<< panel
             self.selection_changed.emit(-1)                 #  <<< panel
             self.update()
@@ -827,15 +918,18 @@ class Cube3DWidget(QOpenGLWidget):
 
         # ---------------- ERASE modu ---------------------------------------
         if self.mode == "erase" and e.button() == Qt.LeftButton:
-            if not self.erase_dirty:
-                self.save_state()
-                self.erase_dirty = True
+            # undo kaydı darbe sonunda (_finish_erase) maske farkıyla alınır
+            self.erase_dirty = True
 
             self.erase_cursor = e.pos()
             self._erase_triangles()
             self.update()
             return
 
+        # ---------------- Sürükleme (move / rotate / resize) ----------------
+        if self.mode in ('move', 'rotate', 'resize'):
+            self.save_state(self.mode)  # “önce”; bırakınca commit_state()
+
         # ---------------- NORMAL seçim -------------------------------------
         if self.mode is None and e.button() == Qt.LeftButton:
             if not self.meshes:  # sahne boş
@@ -927,7 +1021,7 @@ class Cube3DWidget(QOpenGLWidget):
                                        self.rotation_matrix
 
         self.last_mouse_position = e.pos()
-        self.update()
+        self._interact()  # vekil kare, tazeleme hızında
 
     def _inverse_mats(self):
         proj = glGetDoublev(GL_PROJECTION_MATRIX)
@@ -941,7 +1035,7 @@ class Cube3DWidget(QOpenGLWidget):
         # Silgi modunda release anında undo kaydı almak için:
         if self.mode == 'erase' and e.button() == Qt.LeftButton:
             if self.erase_dirty:
-                self.save_state()  # değişiklik: silme sonrası undo için durum kaydı
+                self._finish_erase()  # ertelenmiş sıkıştırma + tek tam yükleme
                 self.erase_dirty = False  # bayrak sıfırlanıyor
             return
 
@@ -957,114 +1051,236 @@ class Cube3DWidget(QOpenGLWidget):
 
         # diğer release olayları
         if self._dragging and not self.cut_mode and not self.mode == 'erase':
-            self.save_state()
+            self.commit_state()
         self._dragging = False
         self.last_mouse_position = None
+        self._end_interaction()
 
     def _erase_triangles(self):
         """
         Silgi dairesine giren üçgenleri *veya* nokta bulutundaki
-        noktaları siler; mesh boşalırsa sahneden çıkarır.
+        noktaları silindi olarak işaretler.  CPU dizileri darbe boyunca
+        küçültülmez; GPU’da yalnızca etkilenen indeks aralıkları yeniden
+        yazılır.  Gerçek sıkıştırma darbe bitince _finish_erase()’de yapılır.
         """
         if self.erase_cursor is None:
             return
 
         # Ekran koordinatları
         cx, cy = self.erase_cursor.x(), self.erase_cursor.y()
-        r2 = self.erase_radius_px ** 2
 
-        changed = False
-        # Bir kopya üzerinde döngü: mesh listesi içinde silme yapacağız
-        for m in list(self.meshes):
+        # ID geçişi varsa: yalnızca fırça altındaki GÖRÜNÜR üçgen/noktalar
+        id_hits = None
+        if self.id_buffer is not None:
             try:
-                # ----------------------------------------------------------------
-                # 1) Mesh vertekslerini dünya → ekran dönüştür
-                # ----------------------------------------------------------------
-                verts_w = (
-                                  self._model_matrix(m) @
-                                  np.c_[m.vertices, np.ones(len(m.vertices))].T
-                          ).T[:, :3]
-                scr_xy = self._screen_coords(verts_w)  # (N,2)
-
-                # ----------------------------------------------------------------
-                # 2) Hangi verteks(-ler) daire içinde?
-                # ----------------------------------------------------------------
-                dx = scr_xy[:, 0] - cx
-                dy = scr_xy[:, 1] - cy
-                inside = dx * dx + dy * dy < r2
-                if not inside.any():  # isabet yok
-                    continue
+                id_hits = self._id_hits(cx, cy, self.erase_radius_px)
+            except (GLError, IdBufferError) as e:
+                # yalnızca bu hareket için izdüşüm yöntemi
+                print(f"[erase] ID geçişi başarısız, izdüşüme düşülüyor: {e}",
+                      file=sys.stderr)
 
-                # ----------------------------------------------------------------
-                # 3-A) Üçgenli mesh
-                # ----------------------------------------------------------------
-                if m.draw_mode == GL_TRIANGLES and m.index_count:
-                    tri = m.indices.reshape(-1, 3)
-                    hit_tri = inside[tri].any(axis=1)  # üçgenden ≥1 vert içerde mi?
-                    if not hit_tri.any():
-                        continue
-
-                    keep_tri = ~hit_tri
-                    changed = True
-
-                    if not keep_tri.any():  # tümü silinecek
-                        self._delete_mesh_gpu(m)
-                        self.meshes.remove(m)
+        changed = False
+        for m in self.meshes:
+            try:
+                if id_hits is not None:
+                    hit_ids = id_hits.get(id(m))
+                    if hit_ids is None:
                         continue
-
-                    keep_idx = tri[keep_tri].flatten()
-                    uniq, new_idx = np.unique(keep_idx, return_inverse=True)
-
-                    # Eşlenik dizileri küçült
-                    m.vertices = m.vertices[uniq]
-                    if getattr(m, "colors", None) is not None:
-                        m.colors = m.colors[uniq]
-                    if getattr(m, "normals", None) is not None:
-                        m.normals = m.normals[uniq]
-
-                    m.indices = new_idx.astype(np.uint32)
-                    m.index_count = len(m.indices)
-
-                # ----------------------------------------------------------------
-                # 3-B) Nokta bulutu (GL_POINTS)
-                # ----------------------------------------------------------------
                 else:
-                    keep = ~inside
-                    if keep.all():  # hiçbir nokta kesilmedi
+                    # ------------------------------------------------------------
+                    # 1-2) Önbellekli ekran ızgarasından daire altındaki verteksler
+                    # ------------------------------------------------------------
+                    hit_v = self._screen_grid(m).query_circle(cx, cy, self.erase_radius_px)
+                    if hit_v.size == 0:  # isabet yok
                         continue
 
-                    changed = True
-                    if not keep.any():  # tamamı silindi
-                        self._delete_mesh_gpu(m)
-                        self.meshes.remove(m)
-                        continue
+                    # ------------------------------------------------------------
+                    # 3-A) Üçgenli mesh: üçgenden ≥1 vert içerde mi?
+                    # 3-B) Nokta bulutu: doğrudan nokta id’leri
+                    # ------------------------------------------------------------
+                    if m.draw_mode == GL_TRIANGLES and m.index_count:
+                        starts, tri_ids = m.vertex_triangles()
+                        hit_ids = csr_gather(starts, tri_ids, hit_v)
+                    else:
+                        hit_ids = hit_v
 
-                    # Noktaları (ve varsa renk/normali) filtrele
-                    m.vertices = m.vertices[keep]
-                    if getattr(m, "colors", None) is not None:
-                        m.colors = m.colors[keep]
-                    if getattr(m, "normals", None) is not None:
-                        m.normals = m.normals[keep]
+                new_ids = m.mark_erased(hit_ids)
+                if new_ids.size == 0:
+                    continue
 
                 # ----------------------------------------------------------------
-                # 4) GPU tamponlarını tazele
+                # 4) Yalnızca etkilenen indeks aralıklarını GPU’ya yaz
                 # ----------------------------------------------------------------
-                self._update_gpu_buffers(m)
+                self._upload_erased(m, new_ids)
+                changed = True
 
             except Exception as e:
                 print(f"[erase] {e}")
                 continue
 
-        # --------------------------------------------------------------------
-        # 5) Undo kaydı + ekran yenileme
-        # --------------------------------------------------------------------
         if changed:
-            self.save_state()
+            self.update()
+
+    def _id_key(self):
+        """ID geçişini etkileyen durum: kamera, boyut, sahne sırası, sürümler."""
+        return (self._camera_key(), self._id_epoch,
+                tuple((id(m), m.version, m.transform_version,
+                       getattr(m, "point_size", 2.0), len(m.draw_parts()))
+                      for m in self.meshes))  # parça sayısı: octree akışı
+
+    def _ensure_id_pass(self, readback=False):
+        """
+        ID geçişini yalnızca sahne veya kamera değiştiyse yeniden çizer.
+        readback=True → obje yuvaları PBO ile eşzamansız CPU’ya kopyalanır
+        (sonraki tıklamalar GL’ye dokunmadan okunur).  Bağlam etkin olmalı.
+        """
+        key = self._id_key()
+        if key != self._id_pass_key:
+            self._render_id_pass()
+            self._id_pass_key = key
+        if readback:
+            self.id_buffer.start_readback(self.defaultFramebufferObject())
+
+    def _render_id_pass(self):
+        """Sahneyi ekran-dışı ID tamponuna çizer (bağlam etkin olmalı)."""
+        PV = self._proj_mat().astype(np.float64) @ self._view_mat().astype(np.float64)
+        items = []
+        for slot, m in enumerate(self.meshes, 1):
+            PVM = PV @ self._model_matrix(m)
+            for d, base in m.draw_parts():
+                g = self.gpu.get(d)
+                items.append((slot, d, g, g.model(PVM).astype(np.float32), base))
+        self.id_buffer.render(items, self.width(), self.height(),
+                              self.defaultFramebufferObject())
+
+    def _read_ids(self, cx, cy, radius):
+        """
+        ID geçişini çizip (cx,cy) merkezli kareyi okur; daire dışını atar.
+        Dönüş: (K,2) uint32 – benzersiz (slot, eleman+1) çiftleri.
+        """
+        r = int(math.ceil(radius))
+        self.makeCurrent()
+        try:
+            self._ensure_id_pass()
+            ids, x0, y0 = self.id_buffer.read_rect(
+                cx - r, cy - r, 2 * r + 1, 2 * r + 1,
+                self.defaultFramebufferObject())
+        finally:
+            self.doneCurrent()
+        if ids.size == 0:
+            return np.empty((0, 2), np.uint32)
+        yy, xx = np.mgrid[y0:y0 + ids.shape[0], x0:x0 + ids.shape[1]]
+        inside = (xx - cx) ** 2 + (yy - cy) ** 2 <= radius * radius
+        px = ids[inside & (ids[..., 0] > 0)]
+        return np.unique(px, axis=0) if len(px) else px
+
+    def _id_hits(self, cx, cy, radius):
+        """Fırça altındaki görünür elemanlar: {id(mesh): eleman id’leri}."""
+        px = self._read_ids(cx, cy, radius)
+        hits = {}
+        for slot in np.unique(px[:, 0]):
+            if slot > len(self.meshes):
+                continue  # bayat yuva (sahne bu arada değişti)
+            m = self.meshes[int(slot) - 1]
+            hits[id(m)] = px[px[:, 0] == slot, 1].astype(np.int64) - 1
+        return hits
+
+    def _upload_erased(self, m, new_ids):
+        """
+        Silinen üçgenlerin indekslerini dejenere (0,0,0) yapar; nokta
+        bulutunda ise nokta indeks listesindeki girdileri primitive-restart
+        değeriyle ezer.  Her iki durumda da glBufferSubData ile yalnızca
+        değişen aralıklar yüklenir.
+        """
+        self._id_epoch += 1  # görünür yüzey değişti → ID geçişi bayat
+        self.makeCurrent()
+        try:
+            for d, base in m.draw_parts():  # parçalı mesh: yalnızca etkilenenler
+                ids = new_ids[(new_ids >= base) & (new_ids < base + d._n_elems())]
+                if ids.size:
+                    self._upload_erased_part(d, ids - base)
+        finally:
+            self.doneCurrent()
+
+    def _upload_erased_part(self, m, new_ids):
+        """_upload_erased’in tek parça (Mesh) için işi; bağlam etkin olmalı."""
+        g = self.gpu.get(m)
+        if m.draw_mode == GL_TRIANGLES and m.index_count:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, g.vbo_i)
+            tri = m.indices.reshape(-1, 3)
+            tri_bytes = 3 * np.dtype(g.index_dtype).itemsize
+            for t0, t1 in index_runs(new_ids):
+                part = tri[t0:t1].astype(g.index_dtype)
+                part[m.erase_mask[t0:t1]] = 0
+                glBufferSubData(GL_ELEMENT_ARRAY_BUFFER, t0 * tri_bytes,
+                                part.nbytes, part)
+        else:
+            if not g.vbo_pts:
+                # darbe başı: tüm noktalar için indeks listesi (bir kez)
+                g.vbo_pts = glGenBuffers(1)
+                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, g.vbo_pts)
+                ids = np.arange(len(m.vertices), dtype=np.uint32)
+                glBufferData(GL_ELEMENT_ARRAY_BUFFER, ids.nbytes, ids,
+                             GL_DYNAMIC_DRAW)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, g.vbo_pts)
+            if self.has_prim_restart:
+                for p0, p1 in index_runs(new_ids):
+                    part = np.arange(p0, p1, dtype=np.uint32)
+                    part[m.erase_mask[p0:p1]] = _RESTART_INDEX
+                    glBufferSubData(GL_ELEMENT_ARRAY_BUFFER, p0 * 4,
+                                    part.nbytes, part)
+                g.pts_count = len(m.vertices)
+            else:
+                # restart yoksa: sıkıştırılmış indeks listesi (4 B/nokta)
+                ids = np.flatnonzero(~m.erase_mask).astype(np.uint32)
+                glBufferData(GL_ELEMENT_ARRAY_BUFFER, ids.nbytes, ids,
+                             GL_DYNAMIC_DRAW)
+                g.pts_count = ids.size
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def _finish_erase(self):
+        """
+        Silgi darbesi bitti: maskeleri uygula (verteks sıkıştırma), boşalan
+        mesh’leri sahneden çıkar.  Sürüm değiştiği için tamponlar bir
+        sonraki çizimde GpuResourceCache tarafından bir kez yüklenir.
+        """
+        changed = False
+        before = list(self.meshes)
+        sel_before = self.selected_mesh
+        steps = []
+        for m in list(self.meshes):
+            if m.erase_mask is None:
+                continue
+            if not m.erase_mask.any():
+                m.erase_mask = None
+                continue
+            changed = True
+            if getattr(m, "out_of_core", False):
+                self._note_in_memory(m)
+            steps.append(EraseStep(m))  # sıkıştırmadan ÖNCE
+            if not m.compact():  # tümü silindi
+                steps.pop()
+                self.makeCurrent()
+                self.gpu.release(m)
+                self.doneCurrent()
+                self.meshes.remove(m)
+
+        if changed:
+            if self.meshes != before:
+                steps.append(ListStep(before, list(self.meshes)))
+            self.history.push(HistoryEntry(steps, "erase", sel_before, None))
             self.selected_mesh = None
             self.scene_changed.emit()
             self.selection_changed.emit(-1)
             self.update()
 
+    def _note_in_memory(self, m):
+        """Octree’li bulut düzenlendi → noktalar RAM’e alınıyor (bkz. point_octree)."""
+        self.status_message.emit(
+            f"{m.name}: düzenleme sonrası nokta bulutu belleğe alındı, "
+            f"octree devre dışı ({len(m.vertices):,} nokta). "
+            f"Geri al ile octree’ye dönülür.")
+
     def _recalc_normals(self, mesh):
         """
         Çok basit – her üçgen normali, o üçgenin üç verteksine kopyalanır.
@@ -1085,47 +1301,6 @@ class Cube3DWidget(QOpenGLWidget):
         lens = np.linalg.norm(n, axis=1, keepdims=True) + 1e-12
         mesh.normals = (n / lens).astype(np.float32)
 
-    # ────────────────────────────────────────────────────────────────────
-    # GPU tamponlarını güvenli sil / güncelle
-    # ────────────────────────────────────────────────────────────────────
-    def _delete_mesh_gpu(self, m):
-        """Bir Mesh’in sahip olduğu tüm GL tamponlarını siler."""
-        for attr in ("vbo_v", "vbo_i", "vbo_c", "vbo_n", "vao"):
-            buf = getattr(m, attr, 0)
-            if buf:
-                if attr == "vao":
-                    glDeleteVertexArrays(1, [buf])
-                else:
-                    glDeleteBuffers(1, [buf])
-                setattr(m, attr, 0)
-
-    def _update_gpu_buffers(self, m):
-        """vertices / colors / normals değiştiyse VBO’ları yeniden yükler."""
-        self.makeCurrent()
-
-        glBindBuffer(GL_ARRAY_BUFFER, m.vbo_v)
-        glBufferData(GL_ARRAY_BUFFER, m.vertices.nbytes,
-                     m.vertices, GL_STATIC_DRAW)
-
-        if getattr(m, "vbo_c", 0) and getattr(m, "colors", None) is not None:
-            glBindBuffer(GL_ARRAY_BUFFER, m.vbo_c)
-            glBufferData(GL_ARRAY_BUFFER, m.colors.nbytes,
-                         m.colors, GL_STATIC_DRAW)
-
-        if getattr(m, "vbo_n", 0) and getattr(m, "normals", None) is not None:
-            glBindBuffer(GL_ARRAY_BUFFER, m.vbo_n)
-            glBufferData(GL_ARRAY_BUFFER, m.normals.nbytes,
-                         m.normals, GL_STATIC_DRAW)
-
-        if getattr(m, "vbo_i", 0) and getattr(m, "indices", None) is not None:
-            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, m.vbo_i)
-            glBufferData(GL_ELEMENT_ARRAY_BUFFER, m.indices.nbytes,
-                         m.indices, GL_STATIC_DRAW)
-
-        glBindBuffer(GL_ARRAY_BUFFER, 0)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
-        self.doneCurrent()
-
     def screen_to_world(self, sx, sy, proj_inv, view_inv):
         """
         Convert 2D widget coords (sx,sy) into a world-space point on the near plane.
@@ -1161,8 +1336,8 @@ class Cube3DWidget(QOpenGLWidget):
         dp.setValue(0)
         dp.show()
 
-        # 3) Undo için mevcut durumu kaydet
-        self.save_state()
+        # 3) Undo kaydı sahne gerçekten değişirken alınır (kesim arka planda
+        #    sürerken yapılan başka işlemler karışmasın)
 
         # 4) GL matrislerini güncelle, paintGL ile senkronize et
         self._update_projection()
@@ -1291,13 +1466,16 @@ class Cube3DWidget(QOpenGLWidget):
 
             # ────────────────────────────────────────────────────────────────
             # 3) “KEEP” tarafını (local) güncelle
+            self.save_state()
             orig.vertices = v_keep
             if c_keep is not None:
                 orig.colors = c_keep
-            orig.update_buffers()  # VBO güncellemesi
+            if orig.normals is not None and len(orig.normals) == len(side):
+                orig.normals = orig.normals[side]
+            orig.bump_version()  # tamponlar çizimde yeniden yüklenir
 
             # 4) “CUT” tarafı için yeni bir Mesh (local-koordinatta) oluştur
-            cut_mesh = Mesh(
+            cut_mesh = build_mesh(
                 v_cut,
                 indices=np.empty((0, 3), np.uint32),
                 colors=c_cut,
@@ -1317,6 +1495,7 @@ class Cube3DWidget(QOpenGLWidget):
             dp.setValue(100)
             dp.close()
             self.selected_mesh = None
+            self.commit_state()
             self.scene_changed.emit()
             self.selection_changed.emit(-1)
             self.update()
@@ -1327,10 +1506,9 @@ class Cube3DWidget(QOpenGLWidget):
             if c_keep is not None:
                 orig.colors = c_keep
             # Eğer colors None ise, orig.colors'ı elle silmeyin, zaten None kalır
-            orig.update_buffers()  # VBO'yu tazeleyin
 
             # 4) CUT tarafı için yeni Mesh oluştur (local‐koordinatlarda)
-            cut_mesh = Mesh(
+            cut_mesh = build_mesh(
                 v_cut,
                 indices=np.empty((0, 3), np.uint32),
                 colors=c_cut,
@@ -1354,63 +1532,72 @@ class Cube3DWidget(QOpenGLWidget):
             self.update()
             return
 
-        # 9) Mesh verilerini kopyala ve yeni Mesh örnekleri oluştur
+        # 9) Kesim arka planda: Mesh saf NumPy → GL bağlamı gerekmez.
+        #    GUI’de yalnızca girdiler yakalanır; dizilere dokunulmaz (kopyala-yaz).
         orig = self.selected_mesh
-        verts = orig.vertices.copy()
-        inds = orig.indices.copy()
+        verts, inds = orig.vertices, orig.indices
         orig_cols = getattr(orig, 'colors', None)
+        xf = (orig.translation.copy(), orig.rotation.copy(), orig.scale,
+              orig.transparent, orig.color, orig.name)
+
+        def _cut(progress, stop):
+            out = []
+            for sgn, suffix, lo in ((1.0, "_keep", 0), (-1.0, "_cut", 50)):
+                if stop():
+                    return None
+                m = type(orig)(verts, inds, colors=orig_cols,
+                         color=xf[4], mesh_name=xf[5] + suffix)
+                # 10) Orijinal transform ve render ayarlarını aktar
+                m.translation = xf[0].copy()
+                m.rotation = xf[1].copy()
+                m.scale = xf[2]
+                m.transparent = xf[3]
+                # 11) Kesme: pozitif yarı %0–50, negatif yarı %50–100
+                ok = m.cut_by_plane(sgn * normal, sgn * d,
+                                    progress_callback=lambda p, lo=lo: progress(lo + int(p * 0.5)))
+                out.append(m if ok else None)  # o tarafta üçgen kalmadı
+            return out
+
+        def _done(parts):
+            # 12) İşlem tamamlandı
+            dp.setValue(100)
+            dp.close()
+            parts = [m for m in (parts or []) if m is not None]
+            if not parts or orig not in self.meshes:
+                return
 
-        mk = Mesh(verts, inds, colors=orig_cols,
-                  color=orig.color, mesh_name=orig.name + "_keep")
-        mc = Mesh(verts, inds, colors=orig_cols,
-                  color=orig.color, mesh_name=orig.name + "_cut")
-
-        # 10) Orijinal transform ve render ayarlarını aktar
-        mk.id, mc.id = orig.id, self.next_color_id
-        self.next_color_id += 1
-        for m in (mk, mc):
-            m.translation = orig.translation.copy()
-            m.rotation = orig.rotation.copy()
-            m.scale = orig.scale
-            m.transparent = orig.transparent
-
-        # VBO renk verisini yeniden yükle
-        if orig_cols is not None:
-            from OpenGL.GL import glBindBuffer, glBufferData
-            glBindBuffer(GL_ARRAY_BUFFER, mk.vbo_c)
-            glBufferData(GL_ARRAY_BUFFER, orig_cols.nbytes, orig_cols, GL_STATIC_DRAW)
-
-        # 11) Kesme işlemini yap ve ilerleme callback ile göster
-        #    Pozitif yarı: %0–50
-        mk.cut_by_plane(normal, d,
-                        progress_callback=lambda p: dp.setValue(int(p * 0.5)))
-        #    Negatif yarı: %50–100
-        mc.cut_by_plane(-normal, -d,
-                        progress_callback=lambda p: dp.setValue(50 + int(p * 0.5)))
-
-        # 12) İşlem tamamlandı
-        dp.setValue(100)
-        dp.close()
-
-        # 13) Sahneyi güncelle: orijinal mesh'i çıkar, yenilerini ekle
-        self.meshes.remove(orig)
-        self.meshes.extend([mk, mc])
-        self.selected_mesh = None
+            # 13) Sahneyi güncelle: orijinal mesh'i çıkar, yenilerini ekle
+            if getattr(orig, "out_of_core", False):
+                self._note_in_memory(orig)
+            self.save_state()
+            parts[0].id = orig.id
+            for m in parts[1:]:
+                m.id = self.next_color_id
+                self.next_color_id += 1
+            self.meshes.remove(orig)
+            self.meshes.extend(parts)
+            self.selected_mesh = None
+            self.commit_state()
 
-        # 14) UI olaylarını tetikle ve yeniden çiz
-        self.scene_changed.emit()
-        self.selection_changed.emit(-1)
-        self.update()
+            # 14) UI olaylarını tetikle ve yeniden çiz
+            self.scene_changed.emit()
+            self.selection_changed.emit(-1)
+            self.update()
+
+        worker = self._run_task(_cut, _done, dp.setValue)
+        worker.failed_signal.connect(dp.close)
+        dp.canceled.connect(worker.stop)
 
     def wheelEvent(self, e):
         delta = e.angleDelta().y()
         if delta:
-            self.save_state()
+            self.save_state("zoom")
             self.zoom += delta * self.sens_zoom  # zoom NEGATİF kalır
             self.zoom = max(self.zoom, -5000.0)  # en uzak
             self.zoom = min(self.zoom, -0.2)  # en yakın
             self._update_projection()  # <- yeni near / far
-            self.update()
+            self.commit_state()
+            self._interact()
 
     def _update_projection(self):
         """Kamera uzaklığına göre near/far düzeltir; hep görünür kalır."""
@@ -1457,7 +1644,31 @@ class Cube3DWidget(QOpenGLWidget):
         Renk-ID yöntemiyle (hızlı) veya ray–AABB yöntemiyle (yedek) sahneden
         bir Mesh döndürür. Hiçbir şey seçilmezse None verir.
         """
-        # 0) OpenGL bağlamını event içinde kendimiz geçerli yapmalıyız
+        # 0) ID geçişi varsa tıklama etrafındaki küçük kareyi oku; merkeze
+        #    en yakın dolu pikselin objesi seçilir
+        if self.id_buffer is not None:
+            try:
+                cx, cy, r = pos.x(), pos.y(), 2
+                self.makeCurrent()
+                try:
+                    self._ensure_id_pass()  # sahne/kamera aynıysa çizim yok
+                    slots, x0, y0 = self.id_buffer.read_slots(
+                        cx - r, cy - r, 2 * r + 1, 2 * r + 1,
+                        self.defaultFramebufferObject())
+                finally:
+                    self.doneCurrent()
+                ys, xs = np.nonzero(slots)
+                if len(ys):
+                    k = np.argmin((xs + x0 - cx) ** 2 + (ys + y0 - cy) ** 2)
+                    slot = int(slots[ys[k], xs[k]])
+                    if slot <= len(self.meshes):
+                        return self.meshes[slot - 1]
+                return self._pick_by_ray(pos)
+            except (GLError, IdBufferError) as e:
+                # yalnızca bu tıklama için renk-ID yöntemine düşülür
+                print(f"[pick] ID geçişi başarısız: {e}", file=sys.stderr)
+
+        # 1) OpenGL bağlamını event içinde kendimiz geçerli yapmalıyız
         self.makeCurrent()
         try:
             # 1) --- Renk-ID buffer'ı çiz -----------------------------------
@@ -1539,13 +1750,18 @@ class Cube3DWidget(QOpenGLWidget):
         glPopAttrib()
         return (r << 16) | (g << 8) | b      # 0 ise arka plan
 
-    # ---------- 2 · Ray + AABB (yedek) --------------------------------
+    # ---------- 2 · Ray + BVH (yedek) ---------------------------------
     def _pick_by_ray(self, pos):
-        # 2-a: Ekran (px) → Normalized Device Coordinate
+        hit = self.ray_hit(pos)
+        return hit[0] if hit is not None else None
+
+    def _screen_ray(self, pos):
+        """Qt pikseli → dünya ışını (başlangıç, birim yön)."""
+        # Ekran (px) → Normalized Device Coordinate
         ndc_x =  2.0 * pos.x() / self.width()  - 1.0
         ndc_y = -2.0 * pos.y() / self.height() + 1.0
 
-        # 2-b: Klip → Göz → Dünya
+        # Klip → Göz → Dünya
         inv_proj = np.linalg.inv(self._proj_mat())
         inv_view = np.linalg.inv(self._view_mat())
 
@@ -1559,21 +1775,49 @@ class Cube3DWidget(QOpenGLWidget):
         world_far  = inv_view @ eye_far
         ray_dir    = world_far[:3] - world_near[:3]
         ray_dir   /= np.linalg.norm(ray_dir)
+        return world_near[:3].astype(np.float64), ray_dir.astype(np.float64)
 
-        # 2-c: Her mesh'in axis-aligned bounding box'ı ile kesişimi bul
-        best_mesh, best_t = None, 1e9
+    def ray_hit(self, pos, pick_px=4.0):
+        """
+        Imlecin altındaki en yakın yüzey: (mesh, dünya noktası, eleman) / None.
+        Önce dünya AABB’si elenir, sonra mesh’in yerel BVH’sinde kesin
+        üçgen (nokta bulutunda pick_px piksel yarıçaplı) testi yapılır.
+        BVH henüz hazır değilse o mesh için AABB girişi kullanılır.
+        """
+        orig, ray_dir = self._screen_ray(pos)
+        px_world = 2.0 * np.tan(np.deg2rad(45) / 2) / max(1, self.height())
+        best, best_t = None, np.inf
         for m in self.meshes:
             mn, mx = m.aabb_world()                # Mesh.aabb_world() şart
-            t1, t2 = self._ray_aabb(world_near[:3], ray_dir, mn, mx)
-            if t2 >= max(t1, 0) and t1 < best_t:   # kesişme ve en yakın
-                best_mesh, best_t = m, t1
-        return best_mesh
+            t1, t2 = self._ray_aabb(orig, ray_dir, mn, mx)
+            if not (t2 >= max(t1, 0) and t1 < best_t):
+                continue
+            bvh = self.mesh_bvh(m)
+            if bvh is None:                        # kurulana kadar kutu
+                t = max(t1, 0.0)
+                best, best_t = (m, orig + t * ray_dir, -1), t
+                continue
+            # afin dönüşüm ışın parametresini korur → t dünya uzaklığıdır
+            inv = np.linalg.inv(m.model_matrix())
+            o = inv[:3, :3] @ orig + inv[:3, 3]
+            d = inv[:3, :3] @ ray_dir
+            radius = 0.0
+            if m.draw_mode == GL_POINTS:
+                # yerel birimde: ölçek s → |d| = 1/s, r_yerel = r_dünya / s
+                radius = (pick_px * px_world * max(t1, 1.0)
+                          * np.linalg.norm(d))
+            hit = bvh.ray(o, d, tmax=best_t, radius=radius,
+                          dead=m.erase_mask)
+            if hit is not None:
+                t, elem = hit
+                best, best_t = (m, orig + t * ray_dir, elem), t
+        return best
 
     # ---------- Yardımcı matrisler ------------------------------------
     def _proj_mat(self):
         f = 1 / np.tan(np.deg2rad(45) / 2)
         asp = self.width() / max(1, self.height())
-        n, fz = 0.1, abs(self.zoom) + 50.0
+        n, fz = max(0.1, abs(self.zoom) * 0.05), abs(self.zoom) + 50.0
         return np.array([[f/asp,0,0,0],
                          [0,f,0,0],
                          [0,0,(fz+n)/(n-fz), 2*fz*n/(n-fz)],
@@ -1595,6 +1839,39 @@ class Cube3DWidget(QOpenGLWidget):
             return 0.0
         return px / abs(dx)
 
+    def _camera_key(self):
+        """Ekran izdüşümünü etkileyen kamera durumunun hash’lenebilir özeti."""
+        return (self.rotation_matrix.tobytes(), self.x_translation,
+                self.y_translation, self.zoom, self.width(), self.height())
+
+    def _screen_grid(self, m) -> ScreenGrid:
+        """
+        Mesh’in ekran izdüşümünü (mesh sürümü, transform, kamera) anahtarıyla
+        önbellekler; değişmedikçe fırça her harekette yalnızca ızgarayı sorgular.
+        """
+        key = (m.version, m.transform_version, self._camera_key())
+        cached = getattr(m, "_scr_grid", None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        # model → dünya → klip tek 4×4 matriste, float32 tek geçiş
+        mvp = (self._proj_mat().astype(np.float64) @
+               self._view_mat().astype(np.float64) @
+               self._model_matrix(m).astype(np.float64)).astype(np.float32)
+        clip = m.vertices @ mvp[:, :3].T + mvp[:, 3]  # (N,4)
+        wc = clip[:, 3]
+        valid = wc > 1e-6  # kamera arkasındakiler fırçaya girmez
+        inv_w = np.where(valid, 1.0 / np.where(valid, wc, 1.0), 0.0)
+
+        w, h = self.width(), self.height()
+        scr = np.empty((len(clip), 2), np.float32)
+        scr[:, 0] = (clip[:, 0] * inv_w * 0.5 + 0.5) * w
+        scr[:, 1] = (0.5 - clip[:, 1] * inv_w * 0.5) * h
+
+        grid = ScreenGrid(scr, valid, w, h)
+        m._scr_grid = (key, grid)
+        return grid
+
     def _screen_coords(self, verts_world: np.ndarray) -> np.ndarray:
         """
         verts_world : (N,3) float32
@@ -6,11 +6,18 @@ from PyQt5.QtWidgets import (
     QHBoxLayout, QMessageBox
 )
 from PyQt5.QtGui import QPixmap, QFont, QIcon
-from PyQt5.QtCore import Qt, QSize
-import os, cv2, numpy as np
+from PyQt5.QtCore import Qt, QSize, QTimer
+import os, sys, time, cv2, numpy as np
+
+from mesh_worker import MeshTaskWorker
+from preview_widget import SurfacePreview
+from surface_extractor import BrickIndex, extract_surface_indexed
+from volume_loader import load_preview_volume
+
+# Eşik önizlemesi: en uzun eksen ≤ 96 voksel → kaba mesh ≈ 100 ms altında
+PREVIEW_MAX_DIM = 96
+PREVIEW_BRICK = 8
 
-from loading_dialog          import LoadingDialog
-from model_generation_worker import ModelGenerationWorker
 
 
 # =================================================================== ANA EKRAN
@@ -65,25 +72,30 @@ class EntryScreen(QWidget):
         if not fn:
             return
 
-        # Sahneyi temizle ve seçilen objeyi yükle
+        # Sahneyi temizle ve seçilen objeyi arka planda yükle
         self.main_window.cube_widget.clear_scene()
-        mesh = self.main_window.cube_widget.load_obj(fn)
+        self.main_window.cube_widget.load_obj_async(
+            fn, on_done=lambda meshes: self._on_obj_loaded(meshes, 5.0))
 
-        # Yüklenen mesh bir nokta bulutuysa, başlangıç point_size’ı uygulamak
-        # (Varsayılan olarak 5.0 piksel atıyoruz; isterseniz burada değiştirin)
-        if mesh and mesh.draw_mode == GL_POINTS:
-            mesh.point_size = 5.0
-            self.main_window.cube_widget.update()
+    def _on_obj_loaded(self, meshes, point_size):
+        """Arka plan yüklemesi bitti (GUI iş parçacığı): nokta boyutu + seçim."""
+        cube = self.main_window.cube_widget
+        mesh = meshes[0] if meshes else None
 
-        # Henüz hiçbir mesh seçili değil → menüde “Nokta Boyutu” pasif olsun
-        self.main_window.cube_widget.selected_index = -1
-        self.main_window.cube_widget.selection_changed.emit(-1)
+        # Yüklenen mesh bir nokta bulutuysa, başlangıç point_size’ı uygula
+        if mesh and mesh.draw_mode == GL_POINTS:
+            mesh.point_size = point_size
+            cube.update()
 
-        # Eğer yüklenen mesh noktabilimi ise onu seçili yapıp menüyü aktif edelim
+        # Nokta bulutu ise onu seçili yapıp menüyü aktif edelim; değilse
+        # hiçbir mesh seçili değil → menüde “Nokta Boyutu” pasif olsun
         if mesh and mesh.draw_mode == GL_POINTS:
-            idx = self.main_window.cube_widget.meshes.index(mesh)
-            self.main_window.cube_widget.selected_index = idx
-            self.main_window.cube_widget.selection_changed.emit(idx)
+            idx = cube.meshes.index(mesh)
+            cube.selected_index = idx
+            cube.selection_changed.emit(idx)
+        else:
+            cube.selected_index = -1
+            cube.selection_changed.emit(-1)
 
         # Ana ekrana geçiş
         self.main_window.go_main_screen()
@@ -107,7 +119,8 @@ class EntryScreen(QWidget):
             return
 
         output_path = os.path.join(folder, f"{name}.obj")
-        if os.path.exists(output_path):
+        if (os.path.exists(output_path)
+                or output_path in self.main_window.job_queue.pending_output_paths()):
             QMessageBox.warning(
                 self,
                 "Dosya Zaten Var",
@@ -130,16 +143,18 @@ class EntryScreen(QWidget):
         )
 
 
-    # -------------------------------------------------------- İş parçacığını başlat
+    # -------------------------------------------------------- İşi kuyruğa ver
     def start_loading_screen(self, slice_folder, output_path, noise_method,
                              scale_factor, z_increment, threshold, resolution,
                              render_mode, point_size):
         """
         render_mode: "mesh" veya "point"
         point_size:  Nokta bulutu modu ise glPointSize için kullanılacak değer (px)
+
+        Üretim JobQueue’ya gönderilir; ilerleme sağdaki “İşler” panelinde
+        görünür, biten model MainWindow.on_job_finished ile sahneye eklenir.
         """
-        self.loading_dialog = LoadingDialog(self)
-        self.worker = ModelGenerationWorker(
+        self.main_window.job_queue.submit(
             slice_folder, output_path,
             scale_factor=scale_factor,
             z_increment=z_increment,
@@ -149,46 +164,7 @@ class EntryScreen(QWidget):
             render_mode=render_mode,
             point_size=point_size
         )
-        self.worker.progress_signal.connect(self.loading_dialog.update_progress)
-        self.worker.finished_signal.connect(self.on_generation_finished)
-        self.loading_dialog.cancel_requested.connect(self.worker.stop)
-        self.loading_dialog.cancel_requested.connect(self.loading_dialog.close)
-        self.worker.start()
-        self.loading_dialog.exec_()
-
-
-    # -------------------------------------------------------- İşlem tamamlandığında
-    def on_generation_finished(self, output_path: str):
-        self.loading_dialog.close()
-        if output_path:
-            QMessageBox.information(
-                self,
-                "İşlem Tamamlandı",
-                f"‘{os.path.basename(output_path)}’ modeli başarıyla oluşturuldu."
-            )
-            # Oluşan objeyi sahneye yükle ve gerekli ayarları yap
-            self.main_window.cube_widget.clear_scene()
-            mesh = self.main_window.cube_widget.load_obj(output_path)
-
-            # Eğer nokta bulutu ise point_size’ı atayalım
-            if mesh and mesh.draw_mode == GL_POINTS:
-                mesh.point_size = self.worker.point_size
-                self.main_window.cube_widget.update()
-
-            # Seçimi “o mesh” olarak yapalım, böylece menü aktifleşsin
-            if mesh and mesh.draw_mode == GL_POINTS:
-                idx = self.main_window.cube_widget.meshes.index(mesh)
-                self.main_window.cube_widget.selected_index = idx
-                self.main_window.cube_widget.selection_changed.emit(idx)
-            else:
-                # Mesh moduysa, hiçbir nokta seçili değil demektir
-                self.main_window.cube_widget.selected_index = -1
-                self.main_window.cube_widget.selection_changed.emit(-1)
-
-            self.main_window.go_main_screen()
-        else:
-            QMessageBox.warning(self, "İşlem İptal",
-                                "Model oluşturulamadı veya işlem iptal edildi.")
+        self.main_window.go_main_screen()
 
 
 
@@ -203,7 +179,9 @@ class ObjCreationDialog(QDialog):
         self.setWindowTitle("Obje Oluştur")
         self.slice_folder = None
 
-        vbox = QVBoxLayout(self)
+        outer = QHBoxLayout(self)
+        vbox = QVBoxLayout()
+        outer.addLayout(vbox)
 
         # --- model tipi (EN ÜSTTE)
         self.render_combo = QComboBox()
@@ -291,6 +269,36 @@ class ObjCreationDialog(QDialog):
         buttons.rejected.connect(self.reject)
         vbox.addWidget(buttons)
 
+        # --- canlı eşik önizlemesi (yalnızca Mesh modunda)
+        self.preview_widget = SurfacePreview()
+        self.preview_info = QLabel("Önizleme: klasör seçin")
+        self.preview_info.setAlignment(Qt.AlignCenter)
+        self.preview_box = QWidget()
+        pbox = QVBoxLayout(self.preview_box)
+        pbox.setContentsMargins(0, 0, 0, 0)
+        pbox.addWidget(QLabel("Önizleme:"))
+        pbox.addWidget(self.preview_widget, 1)
+        pbox.addWidget(self.preview_info)
+        outer.addWidget(self.preview_box, 1)
+
+        self._preview = None        # (hacim, BrickIndex, f)
+        self._preview_mesh = None   # (verts, faces, f) – voksel koordinatında
+        self._preview_seq = 0       # her yeni girdide artar → eski sonuç atılır
+        self._pending_level = None  # çalışan iş bitince çıkarılacak son eşik
+        self._build_worker = None
+        self._extract_worker = None
+
+        self._rebuild_timer = QTimer(self)
+        self._rebuild_timer.setSingleShot(True)
+        self._rebuild_timer.setInterval(400)
+        self._rebuild_timer.timeout.connect(self._build_preview)
+
+        self.th_spin.valueChanged.connect(self._request_preview)
+        self.res_w.valueChanged.connect(self._rebuild_timer.start)
+        self.res_h.valueChanged.connect(self._rebuild_timer.start)
+        self.scale_spin.valueChanged.connect(self._show_preview_mesh)
+        self.zinc_spin.valueChanged.connect(self._show_preview_mesh)
+
         # ───────────────────────────────────────────────────────────────────
         # Model Tipi değişince, ilgili alanları gizle/göster:
         self.render_combo.currentIndexChanged.connect(self._update_fields_visibility)
@@ -319,6 +327,11 @@ class ObjCreationDialog(QDialog):
         self.ps_label.setVisible(not is_mesh)
         self.ps_spin.setVisible(not is_mesh)
 
+        # Eşik önizlemesi yalnızca Mesh modunda; hacim gerekirse kurulur
+        self.preview_box.setVisible(is_mesh)
+        if is_mesh and self._preview is None:
+            self._build_preview()
+
         # Eğer isterseniz, çözünürlük (WxH) bilgisini de yalnızca Mesh’te gösterip nokta modunda gizleyebilirsiniz:
         # self.res_label.setVisible(is_mesh)
         # self.res_w.setVisible(is_mesh)
@@ -363,7 +376,116 @@ class ObjCreationDialog(QDialog):
             self.slice_label.setText(f"Klasör: {folder}")
 
         self.slice_folder = folder
+        self._build_preview()
+
+
+    # ------------------------------------------------ canlı eşik önizlemesi
+    def _build_preview(self):
+        """Kaba piramit seviyesi + blok indeksi arka planda (eskisi iptal)."""
+        if not self.slice_folder or self.render_combo.currentIndex() != 0:
+            return
+        if self._build_worker is not None:
+            self._build_worker.stop()
+        if self._extract_worker is not None:
+            self._extract_worker.stop()
+        self._preview = None
+        self._preview_seq += 1
+        self.preview_info.setText("Önizleme hazırlanıyor…")
+        folder, res = self.slice_folder, self.get_resolution()
+
+        def job(progress_cb, stop_flag):
+            vol, f = load_preview_volume(folder, res, PREVIEW_MAX_DIM, stop_flag)
+            if vol is None:
+                return None
+            return vol, BrickIndex(vol, PREVIEW_BRICK), f
+
+        w = MeshTaskWorker(job, self)
+        w.result_signal.connect(self._on_preview_volume)
+        w.failed_signal.connect(self._on_preview_failed)
+        w.finished.connect(lambda w=w: self._on_worker_finished(w))
+        self._build_worker = w
+        w.start()
+
+    def _on_preview_volume(self, result):
+        if result is None:
+            self.preview_info.setText("Önizleme: PNG dilim bulunamadı")
+            self.preview_widget.clear()
+            return
+        self._preview = result
+        self._request_preview()
 
+    def _request_preview(self, *_):
+        """
+        Eşik değişti: çalışan çıkarım iptal edilir (sonucu atılır) ve yalnızca
+        en son eşik bekletilir; iş bitince hemen o çalıştırılır.
+        """
+        if self._preview is None:
+            return
+        self._preview_seq += 1
+        self._pending_level = self.th_spin.value()
+        if self._extract_worker is None:
+            self._start_extract()
+        else:
+            self._extract_worker.stop()
+
+    def _start_extract(self):
+        level, self._pending_level = self._pending_level, None
+        seq = self._preview_seq
+        vol, index, f = self._preview
+
+        def job(progress_cb, stop_flag):
+            t0 = time.perf_counter()
+            verts, faces = extract_surface_indexed(vol, level, index)
+            return seq, verts, faces, f, time.perf_counter() - t0
+
+        w = MeshTaskWorker(job, self)
+        w.result_signal.connect(self._on_preview_mesh)
+        w.failed_signal.connect(self._on_preview_failed)
+        w.finished.connect(lambda w=w: self._on_worker_finished(w))
+        self._extract_worker = w
+        w.start()
+
+    def _on_worker_finished(self, w):
+        if w is self._build_worker:
+            self._build_worker = None
+        elif w is self._extract_worker:
+            self._extract_worker = None
+            if self._pending_level is not None and self._preview is not None:
+                self._start_extract()
+        w.deleteLater()
+
+    def _on_preview_mesh(self, result):
+        seq, verts, faces, f, seconds = result
+        if seq != self._preview_seq:
+            return  # bu arada eşik / hacim değişti
+        self._preview_mesh = (verts, faces, f)
+        self._show_preview_mesh()
+        self.preview_info.setText(
+            f"{len(faces):,} üçgen · {seconds * 1000:.0f} ms · 1/{f} çözünürlük")
+
+    def _show_preview_mesh(self, *_):
+        """Voksel → dünya (mm): f × (scale, scale, z_inc); yalnızca ölçekler."""
+        if self._preview_mesh is None:
+            return
+        verts, faces, f = self._preview_mesh
+        s = self.scale_spin.value()
+        self.preview_widget.set_mesh(
+            verts * np.float32([s * f, s * f, self.zinc_spin.value() * f]), faces)
+
+    def _on_preview_failed(self, msg):
+        print(f"[preview] {msg}", file=sys.stderr)
+        self.preview_info.setText("Önizleme oluşturulamadı")
+
+    def done(self, result):
+        # Diyalog kapanırken arka plan işleri durdurulup beklenir
+        self._rebuild_timer.stop()
+        self._preview = self._pending_level = None
+        self._preview_seq += 1
+        for w in (self._build_worker, self._extract_worker):
+            if w is not None:
+                w.stop()
+                w.wait()
+        super().done(result)
 
     # ----------------------------- getter’lar
     def get_slice_folder(self):
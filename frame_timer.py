@@ -0,0 +1,61 @@
+# frame_timer.py  –  çizim süresi ölçümü (GL_TIME_ELAPSED, beklemesiz okuma)
+import time
+
+import numpy as np
+from OpenGL.GL import *
+
+
+class FrameTimer:
+    """
+    Bir çizim bölümünün süresini ölçer.  GPU zaman sorguları (GL ≥ 3.3)
+    varsa sonuç birkaç kare sonra, boru hattını durdurmadan okunur (poll);
+    yoksa CPU süresi hemen döner.  Bağlam (makeCurrent) çağırana aittir.
+    """
+
+    def __init__(self, depth: int = 4):
+        try:
+            self._free = [int(q) for q in np.atleast_1d(glGenQueries(depth))]
+        except Exception:
+            self._free = []
+        self.gpu = bool(self._free)
+        self._pending = []   # [(sorgu, etiket)] – eskiden yeniye
+        self._q = None
+        self._t0 = 0.0
+
+    def begin(self):
+        self._t0 = time.perf_counter()
+        # GPU çok gerideyse (boş sorgu yok) bu kare ölçülmez
+        self._q = self._free.pop() if self._free else None
+        if self._q is not None:
+            glBeginQuery(GL_TIME_ELAPSED, self._q)
+
+    def end(self, tag):
+        """Ölçümü kapatır; CPU yolunda sonucu hemen döndürür: [(ms, tag)]."""
+        if self._q is not None:
+            glEndQuery(GL_TIME_ELAPSED)
+            self._pending.append((self._q, tag))
+            self._q = None
+            return []
+        if self.gpu:
+            return []
+        return [((time.perf_counter() - self._t0) * 1000.0, tag)]
+
+    def poll(self):
+        """Hazır GPU sonuçları: [(ms, tag)] (beklemez)."""
+        out = []
+        while self._pending:
+            q, tag = self._pending[0]
+            ready = np.asarray(glGetQueryObjectiv(q, GL_QUERY_RESULT_AVAILABLE))
+            if not int(ready.reshape(-1)[0]):
+                break
+            ns = np.asarray(glGetQueryObjectui64v(q, GL_QUERY_RESULT))
+            self._pending.pop(0)
+            self._free.append(q)
+            out.append((int(ns.reshape(-1)[0]) / 1e6, tag))
+        return out
+
+    def release(self):
+        qs = self._free + [q for q, _ in self._pending]
+        if qs:
+            glDeleteQueries(len(qs), qs)
+        self._free, self._pending = [], []
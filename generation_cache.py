@@ -0,0 +1,179 @@
+# generation_cache.py
+"""
+Üretim sonucu önbelleği.  Anahtar = veri kümesi parmak izi (dilim adları,
+boyutları, değişim zamanları) + tüm üretim parametreleri; değer = ikili
+mesh / nokta bulutu dizileri (.npy).  Aynı istek boru hattını baştan
+çalıştırmadan, dosyaları copy-on-write memmap ile açarak döner.
+
+Dizin düzeni:  <kök>/<anahtar>/{verts,faces,colors[,normals]}.npy + meta.json
+Boyut sınırı aşılınca en uzun süredir kullanılmayan girdiler silinir (LRU;
+son kullanım meta.json’un değişim zamanıdır).  Sınır <kök>/cache.json’da
+kalıcıdır.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from volume_loader import list_slices
+
+# Çıkarım algoritmaları değişince artırılır → eski girdiler eşleşmez
+CACHE_VERSION = 2
+DEFAULT_MAX_BYTES = 2 << 30  # 2 GB
+
+# Anahtara giren parametreler.  point_size yalnızca görüntüleme; noise_method
+# generate_model’de henüz uygulanmıyor (çıktıyı değiştirmez) → ikisi de dışarıda
+KEY_PARAMS = ("scale_factor", "z_increment", "threshold", "resolution",
+              "render_mode")
+_ARRAYS = ("verts", "faces", "colors", "normals")
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "3dstudio", "generation")
+
+
+def dataset_fingerprint(slice_folder):
+    """Dilim listesi + (ad, boyut, mtime) özetinden SHA-1; içerik okunmaz."""
+    h = hashlib.sha1()
+    for fn in list_slices(slice_folder):
+        st = os.stat(fn)
+        h.update(f"{os.path.basename(fn)}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def cache_key(slice_folder, params):
+    """Parmak izi + KEY_PARAMS → onaltılık anahtar."""
+    p = {k: params.get(k) for k in KEY_PARAMS}
+    if p["resolution"] is not None:
+        p["resolution"] = list(p["resolution"])
+    blob = json.dumps({"v": CACHE_VERSION,
+                       "data": dataset_fingerprint(slice_folder),
+                       "params": p}, sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()[:32]
+
+
+class GenerationCache:
+    """Disk üzerindeki LRU sonuç önbelleği (süreçler arası güvenli yazım)."""
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = root or default_cache_dir()
+        os.makedirs(self.root, exist_ok=True)
+        cfg = self._read_config()
+        self.max_bytes = int(max_bytes or cfg.get("max_bytes", DEFAULT_MAX_BYTES))
+
+    # ------------------------------------------------------------
+    def _read_config(self):
+        try:
+            with open(os.path.join(self.root, "cache.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def set_max_bytes(self, n):
+        self.max_bytes = int(n)
+        with open(os.path.join(self.root, "cache.json"), "w") as f:
+            json.dump({"max_bytes": self.max_bytes}, f)
+        self.evict()
+
+    def _entry(self, key):
+        return os.path.join(self.root, key)
+
+    # ------------------------------------------------------------
+    def get(self, key):
+        """
+        İsabet → {ad: dizi} (copy-on-write memmap: Mesh yerinde
+        düzenleyebilir, dosya değişmez); yoksa None.
+        """
+        d = self._entry(key)
+        meta = os.path.join(d, "meta.json")
+        if not os.path.exists(meta):
+            return None
+        try:
+            arrays = {name: np.load(os.path.join(d, name + ".npy"), mmap_mode="c")
+                      for name in _ARRAYS
+                      if os.path.exists(os.path.join(d, name + ".npy"))}
+            os.utime(meta)  # LRU: son kullanım
+        except (OSError, ValueError) as e:
+            print(f"[cache] bozuk girdi atlandı {key}: {e}", file=sys.stderr)
+            self.remove(key)
+            return None
+        return arrays
+
+    def put(self, key, arrays, meta=None):
+        """Dizileri geçici dizine yaz, atomik olarak yerine taşı, sonra LRU."""
+        d = self._entry(key)
+        if os.path.exists(d):
+            return
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.root)
+        try:
+            size = 0
+            for name in _ARRAYS:
+                a = arrays.get(name)
+                if a is not None:
+                    np.save(os.path.join(tmp, name + ".npy"), np.asarray(a))
+                    size += os.path.getsize(os.path.join(tmp, name + ".npy"))
+            info = dict(meta or {}, key=key, bytes=size, created=time.time(),
+                        vertices=int(len(arrays["verts"])),
+                        faces=int(len(arrays["faces"])))
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump(info, f, ensure_ascii=False)
+            os.rename(tmp, d)
+        except OSError as e:  # aynı anahtarı başka süreç yazdı / disk dolu
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.exists(d):
+                print(f"[cache] yazılamadı {key}: {e}", file=sys.stderr)
+            return
+        self.evict()
+
+    # ------------------------------------------------------------
+    def entries(self):
+        """Arayüz için girdiler (son kullanım azalan): meta + last_used."""
+        out = []
+        for key in os.listdir(self.root):
+            meta = os.path.join(self.root, key, "meta.json")
+            try:
+                with open(meta) as f:
+                    info = json.load(f)
+                info["last_used"] = os.path.getmtime(meta)
+            except (OSError, ValueError):
+                continue
+            out.append(info)
+        out.sort(key=lambda e: e["last_used"], reverse=True)
+        return out
+
+    def total_bytes(self):
+        return sum(e["bytes"] for e in self.entries())
+
+    def remove(self, key):
+        shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def clear(self):
+        for e in self.entries():
+            self.remove(e["key"])
+
+    def evict(self):
+        """Toplam max_bytes’ın altına inene kadar en eski girdileri sil."""
+        entries = self.entries()
+        total = sum(e["bytes"] for e in entries)
+        while entries and total > self.max_bytes:
+            e = entries.pop()
+            self.remove(e["key"])
+            total -= e["bytes"]
+
+
+_default = None
+
+
+def default_cache():
+    """Süreç genelinde paylaşılan önbellek (varsayılan dizin)."""
+    global _default
+    if _default is None:
+        _default = GenerationCache()
+    return _default
@@ -23,4 +23,59 @@ def world_plane_to_local(mesh, plane_pt, plane_n):
     pt_local = (M_inv @ pt)[:3]
     n_local  = (M_inv[:3,:3].T @ n)          # inverse-transpose rot.
     n_local /= np.linalg.norm(n_local)
-    return pt_local.astype(np.float32), n_local.astype(np.float32)
\ No newline at end of file
+    return pt_local.astype(np.float32), n_local.astype(np.float32)
+
+
+def csr_gather(starts: np.ndarray, values: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """
+    CSR düzenindeki (starts, values) tablosundan verilen anahtarların
+    tüm değerlerini Python döngüsü olmadan toplar.
+    starts : (K+1,) – anahtar k’nın değerleri values[starts[k]:starts[k+1]]
+    """
+    lo = starts[keys]
+    cnt = starts[keys + 1] - lo
+    total = int(cnt.sum())
+    if total == 0:
+        return np.empty(0, values.dtype)
+    # her çıktı elemanı için kaynak indeks: lo[k] + (0..cnt[k]-1)
+    ofs = np.repeat(lo - np.concatenate(([0], np.cumsum(cnt)[:-1])), cnt)
+    return values[np.arange(total) + ofs]
+
+
+def index_runs(ids: np.ndarray, max_gap: int = 64):
+    """
+    Sıralı indeksleri ardışık [başla, bitir) aralıklarına gruplar;
+    aradaki boşluk max_gap’ten küçükse iki aralık birleştirilir
+    (daha az glBufferSubData çağrısı için).
+    """
+    if ids.size == 0:
+        return []
+    brk = np.flatnonzero(np.diff(ids) > max_gap)
+    lo = np.concatenate(([ids[0]], ids[brk + 1]))
+    hi = np.concatenate((ids[brk], [ids[-1]])) + 1
+    return list(zip(lo.tolist(), hi.tolist()))
+
+
+def frustum_planes(mvp: np.ndarray) -> np.ndarray:
+    """
+    Satır-öncelikli MVP → (6,4) kırpma düzlemleri (Gribb–Hartmann):
+    sol, sağ, alt, üst, yakın, uzak.  Normalize edilmez (işaret testi yeter).
+    mvp yerel uzaydan klibe ise düzlemler de yerel uzaydadır.
+    """
+    m = np.asarray(mvp, np.float64)
+    r3 = m[3]
+    return np.stack((r3 + m[0], r3 - m[0],
+                     r3 + m[1], r3 - m[1],
+                     r3 + m[2], r3 - m[2]))
+
+
+def boxes_in_frustum(planes: np.ndarray, mn: np.ndarray, mx: np.ndarray) -> np.ndarray:
+    """
+    (K,3) AABB’ler → (K,) bool.  False: kutu en az bir düzlemin tamamen
+    dışında (kesin görünmez).  True tutucudur (köşe durumlarında çizilir).
+    """
+    c = (mn + mx) * 0.5
+    e = (mx - mn) * 0.5
+    n = planes[:, :3]
+    d = c @ n.T + planes[:, 3] + e @ np.abs(n).T
+    return (d >= 0.0).all(axis=1)
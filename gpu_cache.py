@@ -0,0 +1,321 @@
+# gpu_cache.py  –  Mesh verisi → GL tamponları (sürüm anahtarlı önbellek)
+import ctypes
+import weakref
+
+import numpy as np
+from OpenGL.GL import *
+
+# (MeshBuffers özniteliği, Mesh dizisi, hedef)  –  float32 (ayrık) düzen
+_ATTRS = (("vbo_v", "vertices", GL_ARRAY_BUFFER),
+          ("vbo_c", "colors", GL_ARRAY_BUFFER),
+          ("vbo_n", "normals", GL_ARRAY_BUFFER),
+          ("vbo_i", "indices", GL_ELEMENT_ARRAY_BUFFER))
+
+
+# ----------------------------------------------------------------------
+# Sıkı (compact) köşe biçimi – saf NumPy paketleme
+# ----------------------------------------------------------------------
+def pack_normals_2_10_10_10(n: np.ndarray) -> np.ndarray:
+    """(N,3) birim normal → GL_INT_2_10_10_10_REV (N,) uint32 (w = 0)."""
+    q = np.clip(np.rint(n * 511.0), -511, 511).astype(np.int32) & 0x3FF
+    return (q[:, 0] | (q[:, 1] << 10) | (q[:, 2] << 20)).astype(np.uint32)
+
+
+def pack_interleaved(vertices, colors, normals,
+                     quantize=True, packed_normals=True):
+    """
+    Tek, iç içe (interleaved) köşe tamponu üretir:
+
+      konum  : uint16×4 normalize (AABB içinde nicemlenmiş, 8 B)
+               veya float32×3 (12 B)
+      renk   : uint8×4 normalize (4 B, varsa)
+      normal : GL_INT_2_10_10_10_REV (4 B)  veya  int8×4 normalize (4 B)
+
+    36 B/köşe → 16 B/köşe (nicemleme kapalıyken 20 B).
+    Dönüş: (data, attribs, dequant)
+      attribs : {konum: (boyut, tip, normalize, ofset)}  – stride = data.itemsize
+      dequant : 4×4 (nicemlenmiş [0,1] → yerel koordinat) veya None
+    """
+    v = np.asarray(vertices, np.float32)
+    fields, attribs = [], {}
+    dequant = None
+    if quantize and len(v):
+        mn = v.min(0)
+        ext = v.max(0) - mn
+        ext[ext <= 0] = 1.0
+        fields.append(("pos", np.uint16, (4,)))
+        attribs[0] = (3, GL_UNSIGNED_SHORT, GL_TRUE)
+        dequant = np.identity(4, np.float32)
+        dequant[:3, :3] = np.diag(ext)
+        dequant[:3, 3] = mn
+    else:
+        fields.append(("pos", np.float32, (3,)))
+        attribs[0] = (3, GL_FLOAT, GL_FALSE)
+    if colors is not None:
+        fields.append(("col", np.uint8, (4,)))
+        attribs[1] = (4, GL_UNSIGNED_BYTE, GL_TRUE)
+    if normals is not None:
+        if packed_normals:
+            fields.append(("nrm", np.uint32))
+            attribs[2] = (4, GL_INT_2_10_10_10_REV, GL_TRUE)
+        else:
+            fields.append(("nrm", np.int8, (4,)))
+            attribs[2] = (4, GL_BYTE, GL_TRUE)
+
+    data = np.zeros(len(v), np.dtype(fields))
+    if dequant is not None:
+        q = (v - dequant[:3, 3]) / np.diag(dequant)[:3]
+        data["pos"][:, :3] = np.rint(np.clip(q, 0.0, 1.0) * 65535.0)
+    else:
+        data["pos"] = v
+    if colors is not None:
+        data["col"][:, :3] = np.rint(np.clip(colors, 0.0, 1.0) * 255.0)
+        data["col"][:, 3] = 255
+    if normals is not None:
+        if packed_normals:
+            data["nrm"] = pack_normals_2_10_10_10(normals)
+        else:
+            data["nrm"][:, :3] = np.clip(np.rint(normals * 127.0), -127, 127)
+
+    out = {loc: a + (data.dtype.fields[name][1],)
+           for loc, name, a in ((0, "pos", attribs.get(0)),
+                                (1, "col", attribs.get(1)),
+                                (2, "nrm", attribs.get(2))) if a is not None}
+    return data, out, dequant
+
+
+class MeshBuffers:
+    """Tek mesh’in GL tamponları ve hangi CPU dizisinden yüklendikleri."""
+
+    __slots__ = ("vbo_v", "vbo_c", "vbo_n", "vbo_i", "vao",
+                 "vbo_pts", "pts_count", "version", "src",
+                 "attribs", "dequant", "index_type", "index_dtype",
+                 "vbo_proxy", "proxy_count", "proxy_key")
+
+    def __init__(self):
+        self.vbo_v = self.vbo_c = self.vbo_n = self.vbo_i = 0
+        self.vao = 0
+        self.vbo_pts = 0        # silgi darbesi boyunca maskeli nokta listesi
+        self.pts_count = 0
+        self.version = None     # en son eşitlenen mesh.version
+        self.src = {}           # öznitelik → weakref(np.ndarray)
+        # konum → (tampon, boyut, tip, normalize, stride, ofset)
+        self.attribs = {}
+        self.dequant = None     # nicemlenmiş konum → yerel (4×4) veya None
+        self.index_type = GL_UNSIGNED_INT
+        self.index_dtype = np.uint32
+        self.vbo_proxy = 0      # etkileşim vekili (seyrek indeks listesi)
+        self.proxy_count = 0
+        self.proxy_key = None   # (mesh.version, adım, nokta mı)
+
+    @property
+    def has_color(self) -> bool:
+        return 1 in self.attribs
+
+    def model(self, M: np.ndarray) -> np.ndarray:
+        """Model matrisine nicem çözmeyi katlar (M · D)."""
+        return M if self.dequant is None else M @ self.dequant
+
+
+def bind_attribs(g: MeshBuffers, locs=(0, 1, 2)):
+    """g’nin köşe özniteliklerini (yalnızca locs) bağlar ve etkinleştirir."""
+    for loc in locs:
+        a = g.attribs.get(loc)
+        if a is None:
+            continue
+        buf, size, typ, norm, stride, off = a
+        glBindBuffer(GL_ARRAY_BUFFER, buf)
+        glEnableVertexAttribArray(loc)
+        glVertexAttribPointer(loc, size, typ, norm, stride,
+                              ctypes.c_void_p(off) if off else None)
+
+
+class GpuResourceCache:
+    """
+    Mesh GL tamponlarının TEK sahibi.  Anahtar id(mesh), geçerlilik
+    mesh.version.  Sürüm değişince yalnızca dizi NESNESİ değişen tamponlar
+    yeniden yüklenir: Mesh dizileri yerinde değiştirilmez, yeni dizi atanır
+    → nesne kimliği = içerik.  Yalnızca kamera / transform değiştiren bir
+    undo adımı hiç yükleme yapmaz.
+
+    compact=True  → tek iç içe köşe tamponu (pack_interleaved) ve köşe
+    sayısı izin veriyorsa 16-bit indeks.  quantize / packed_normals
+    pack_interleaved’e aktarılır; packed_normals GL ≥ 3.3 ister.
+
+    Mesh’ler GL kimliği taşımaz; deepcopy / pickle / undo sonrası bayat
+    tampon kimliği oluşmaz.  Tüm çağrılar için bağlam (makeCurrent)
+    çağırana aittir.
+    """
+
+    def __init__(self, compact=True, quantize=True, packed_normals=True):
+        self._entries = {}      # id(mesh) → (weakref(mesh), MeshBuffers)
+        self.compact = compact
+        self.quantize = quantize
+        self.packed_normals = packed_normals
+        self.uploads = 0        # toplam glBufferData çağrısı (istatistik)
+        self.upload_bytes = 0
+
+    # ------------------------------------------------------------------
+    def get(self, m) -> MeshBuffers:
+        """Mesh’in güncel tamponları; gerekiyorsa (yalnızca farkı) yükler."""
+        rec = self._entries.get(id(m))
+        if rec is None or rec[0]() is not m:
+            if rec is not None:          # id yeniden kullanılmış
+                self._free(rec[1])
+            rec = (weakref.ref(m), MeshBuffers())
+            self._entries[id(m)] = rec
+        g = rec[1]
+        if g.version != m.version:
+            self._sync(m, g)
+        return g
+
+    def proxy(self, m, stride: int, points: bool) -> MeshBuffers:
+        """
+        Sürükleme sırasında çizilecek seyrek vekil: her stride’ıncı köşe
+        (points=True veya nokta bulutu) ya da üçgen için uint32 indeks
+        tamponu g.vbo_proxy.  Sürüm / adım değişene kadar önbellekte.
+        """
+        g = self.get(m)
+        key = (m.version, stride, points)
+        if g.proxy_key != key:
+            if points or not m.index_count:
+                ids = np.arange(0, len(m.vertices), stride, dtype=np.uint32)
+            else:
+                tri = m.indices.reshape(-1, 3)[::stride]
+                ids = np.ascontiguousarray(tri, np.uint32).ravel()
+            self._upload(g, "vbo_proxy", GL_ELEMENT_ARRAY_BUFFER, ids)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+            g.proxy_key, g.proxy_count = key, ids.size
+        return g
+
+    def _upload(self, g, attr, target, data):
+        buf = getattr(g, attr)
+        created = not buf
+        if created:
+            buf = glGenBuffers(1)
+            setattr(g, attr, buf)
+        glBindBuffer(target, buf)
+        glBufferData(target, data.nbytes, data, GL_STATIC_DRAW)
+        self.uploads += 1
+        self.upload_bytes += data.nbytes
+        return created
+
+    def _drop(self, g, attr):
+        buf = getattr(g, attr)
+        if buf:
+            glDeleteBuffers(1, [buf])
+            setattr(g, attr, 0)
+        g.src.pop(attr, None)
+        return bool(buf)
+
+    @staticmethod
+    def _arr(m, name):
+        arr = getattr(m, name, None)
+        return None if arr is None or arr.size == 0 else arr
+
+    def _same(self, g, attr, arrs):
+        refs = g.src.get(attr)
+        return refs is not None and len(refs) == len(arrs) and all(
+            (r is None and a is None) or (r is not None and r() is a)
+            for r, a in zip(refs, arrs))
+
+    def _sync(self, m, g: MeshBuffers):
+        layout_changed = False
+        verts = self._arr(m, "vertices")
+        cols, nrms = self._arr(m, "colors"), self._arr(m, "normals")
+
+        if self.compact:
+            # --- tek iç içe köşe tamponu ---------------------------------
+            layout_changed |= self._drop(g, "vbo_c") | self._drop(g, "vbo_n")
+            arrs = (verts, cols, nrms)
+            if verts is None:
+                layout_changed |= self._drop(g, "vbo_v")
+                g.attribs, g.dequant = {}, None
+            elif not self._same(g, "vbo_v", arrs):
+                data, attribs, g.dequant = pack_interleaved(
+                    verts, cols, nrms, self.quantize, self.packed_normals)
+                layout_changed |= self._upload(g, "vbo_v", GL_ARRAY_BUFFER, data)
+                layout_changed |= set(attribs) != set(g.attribs)
+                g.attribs = {loc: (g.vbo_v, a[0], a[1], a[2], data.itemsize, a[3])
+                             for loc, a in attribs.items()}
+                g.src["vbo_v"] = tuple(None if a is None else weakref.ref(a)
+                                       for a in arrs)
+            n_verts = 0 if verts is None else len(verts)
+            idx_dtype = np.uint16 if n_verts <= 0xFFFF else np.uint32
+        else:
+            # --- ayrık float32 tamponlar ---------------------------------
+            for attr, name, _ in _ATTRS[:3]:
+                arr = self._arr(m, name)
+                if arr is None:
+                    layout_changed |= self._drop(g, attr)
+                elif not self._same(g, attr, (arr,)):
+                    data = np.ascontiguousarray(arr, np.float32)
+                    layout_changed |= self._upload(g, attr, GL_ARRAY_BUFFER, data)
+                    g.src[attr] = (weakref.ref(arr),)
+            g.attribs = {loc: (getattr(g, attr), 3, GL_FLOAT, GL_FALSE, 0, 0)
+                         for loc, attr in ((0, "vbo_v"), (1, "vbo_c"), (2, "vbo_n"))
+                         if getattr(g, attr)}
+            g.dequant = None
+            idx_dtype = np.uint32
+
+        # --- indeksler (16-bit yeterse 16-bit) ---------------------------
+        inds = self._arr(m, "indices")
+        if inds is None:
+            self._drop(g, "vbo_i")
+        elif not (self._same(g, "vbo_i", (inds,)) and g.index_dtype == idx_dtype):
+            self._upload(g, "vbo_i", GL_ELEMENT_ARRAY_BUFFER,
+                         np.ascontiguousarray(inds, idx_dtype))
+            g.src["vbo_i"] = (weakref.ref(inds),)
+        g.index_dtype = idx_dtype
+        g.index_type = (GL_UNSIGNED_SHORT if idx_dtype == np.uint16
+                        else GL_UNSIGNED_INT)
+
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        if g.vbo_pts:                       # darbe bitti / veri değişti
+            glDeleteBuffers(1, [g.vbo_pts])
+            g.vbo_pts = g.pts_count = 0
+        if layout_changed and g.vao:        # bağlı tamponlar değişti
+            glDeleteVertexArrays(1, [g.vao])
+            g.vao = 0
+        g.version = m.version
+
+    # ------------------------------------------------------------------
+    def release(self, m):
+        """Tek mesh’in (parçalıysa tüm parçalarının) tamponlarını hemen siler."""
+        for d, _ in m.draw_parts():
+            rec = self._entries.pop(id(d), None)
+            if rec is not None:
+                self._free(rec[1])
+
+    def collect(self, scene):
+        """
+        Ölmüş mesh’lerin ve sahne dışında olup verisi diske taşınmış
+        (vertices None) mesh’lerin tamponlarını siler.  Kare başına bir kez.
+        """
+        live = {id(m) for m in scene}
+        for k, (ref, g) in list(self._entries.items()):
+            m = ref()
+            if m is None or (k not in live and m.vertices is None):
+                self._free(g)
+                del self._entries[k]
+
+    def release_all(self):
+        for _, g in self._entries.values():
+            self._free(g)
+        self._entries.clear()
+
+    @staticmethod
+    def _free(g: MeshBuffers):
+        for attr in ("vbo_v", "vbo_c", "vbo_n", "vbo_i", "vbo_pts", "vbo_proxy"):
+            buf = getattr(g, attr)
+            if buf:
+                glDeleteBuffers(1, [buf])
+                setattr(g, attr, 0)
+        g.proxy_key = None
+        if g.vao:
+            glDeleteVertexArrays(1, [g.vao])
+            g.vao = 0
+        g.src.clear()
+        g.attribs = {}
+        g.version = None
@@ -0,0 +1,682 @@
+# history.py  –  delta tabanlı, kopyala-yaz (copy-on-write) Undo / Redo
+"""
+Her undo adımı yalnızca DEĞİŞENİ tutar:
+
+* transform / görünüm özellikleri  → küçük önce/sonra kopyaları
+* kamera + arka plan              → önce/sonra değerleri
+* mesh listesi (ekle/sil/kes)      → önce/sonra Mesh referansları
+* mesh verisi (kesme vb.)          → önce/sonra dizi REFERANSLARI
+* silgi                            → paketlenmiş bit maskeleri + silinen satırlar
+
+Büyük diziler asla kopyalanmaz: Mesh dizileri yerinde değiştirilmez,
+düzenlemeler her zaman yeni dizi atar; böylece anlık görüntüler aynı
+dizileri paylaşır (kopyala-yaz).
+
+Bellek tavanı: RAM’deki geçmiş RAM_BUDGET’ı aşınca en eski ağır adımlar
+geçici klasöre sıkıştırılmış .npz olarak yazılır (spill) ve undo/redo
+sırasında gerektiğinde geri okunur.  Diskteki toplam DISK_BUDGET’ı aşarsa
+en eski kayıtlar düşürülür.
+
+Birleştirme: aynı etiketli küçük etkileşimli adımlar (tekerlek zoom,
+sürükleme, spin-box) COALESCE_SEC içinde art arda gelirse tek kayda
+katlanır; RepeatButton’la hızlı undo/redo da kayıt sayısı kadar sürer.
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+RAM_BUDGET = 256 * 1024 * 1024     # geçmişin RAM tavanı (bayt)
+DISK_BUDGET = 2 * 1024 ** 3        # spill klasörü tavanı (bayt)
+COALESCE_SEC = 0.8                 # birleştirme penceresi (sn)
+COALESCE_LABELS = {"zoom", "move", "rotate", "resize", "inspector"}
+
+
+# ----------------------------------------------------------------------
+# Hafif sahne yakalama (yalnızca referanslar + küçük kopyalar)
+# ----------------------------------------------------------------------
+def _props(m):
+    return (np.array(m.translation, np.float32),
+            np.array(m.rotation, np.float32),
+            np.array(m.scale, np.float32),
+            getattr(m, "point_size", None),
+            m.transparent, tuple(m.color), m.name)
+
+
+def _data(m):
+    return (m.vertices, m.indices, m.colors, m.normals,
+            m.index_count, m.draw_mode)
+
+
+def _same_props(a, b):
+    return (np.array_equal(a[0], b[0]) and np.array_equal(a[1], b[1])
+            and np.array_equal(a[2], b[2]) and a[3:] == b[3:])
+
+
+def _same_data(a, b):
+    return all(x is y for x, y in zip(a[:4], b[:4])) and a[4:] == b[4:]
+
+
+_MESH_ARRAYS = ("vertices", "indices", "colors", "normals")
+
+
+def _mesh_arrays(m):
+    return (m.vertices, m.indices, m.colors, m.normals)
+
+
+def _on_disk(a):
+    """memmap (octree bulutu, önbellek isabeti) veya onun görünümü mü."""
+    while isinstance(a, np.ndarray):
+        if isinstance(a, np.memmap):
+            return True
+        a = a.base
+    return False
+
+
+def _spillable(a, live=()):
+    """
+    RAM’de yalnızca geçmişin tuttuğu dizi mi: memmap’ler zaten diskte,
+    sahnenin kullandıkları yazılsa da bellek boşalmaz, sıfır adımlı
+    yayınlar (np.broadcast_to) yer kaplamaz.
+    """
+    return (a is not None and id(a) not in live and not _on_disk(a)
+            and 0 not in a.strides)
+
+
+def _nbytes(arrs, live=()):
+    seen, total = set(), 0
+    for a in arrs:
+        if _spillable(a, live) and id(a) not in seen:
+            seen.add(id(a))
+            total += a.nbytes
+    return total
+
+
+def _scene_arrays(meshes):
+    """Sahnedeki mesh’lerin tuttuğu dizilerin id’leri (birleştirme yapmadan)."""
+    out = set()
+    for m in meshes:
+        for p, _ in m.draw_parts():
+            out.update(id(a) for a in _mesh_arrays(p) if a is not None)
+        flat = m.__dict__.get("_flat")  # ChunkedMesh’in düz dizileri
+        if flat:
+            out.update(id(a) for a in flat[1:] if a is not None)
+    return out
+
+
+def _save(path, arrays):
+    """None olmayan dizileri sıkıştırılmış .npz olarak yazar; dosya boyu döner."""
+    np.savez_compressed(path, **{k: v for k, v in arrays.items() if v is not None})
+    return os.path.getsize(path)
+
+
+def _load(path, names):
+    with np.load(path) as z:
+        out = {k: (z[k] if k in z.files else None) for k in names}
+    os.remove(path)
+    return out
+
+
+def _kept_vertices(m):
+    """
+    Silgi maskesi uygulanınca kalacak verteksler – Mesh.compact /
+    ChunkedMesh.compact ile AYNI kural, parça parça: maskesi boş parça hiç
+    dokunulmadan kalır (kullanılmayan verteksleri dahil), tamamen silinen
+    parça düşer, diğerlerinde kalan üçgenlerin gösterdiği verteksler.
+    """
+    out = []
+    for p, _ in m.draw_parts():
+        mk, n = p.erase_mask, len(p.vertices)
+        if mk is None or not mk.any():
+            keep = np.ones(n, bool)
+        elif p.index_count and len(mk) * 3 == p.index_count:
+            keep = np.zeros(n, bool)
+            keep[p.indices.reshape(-1, 3)[~mk].ravel()] = True
+        else:
+            keep = ~mk
+        out.append(keep)
+    return np.concatenate(out) if out else np.zeros(0, bool)
+
+
+class SceneState:
+    """Sahnenin O(#mesh) maliyetli, dizileri paylaşan anlık görüntüsü."""
+
+    def __init__(self, w):
+        self.meshes = list(w.meshes)
+        self.props = {id(m): _props(m) for m in self.meshes}
+        self.data = {id(m): _data(m) for m in self.meshes}
+        self.camera = (w.rotation_matrix.copy(), w.x_translation,
+                       w.y_translation, w.zoom)
+        self.bg_color = tuple(w.bg_color)
+        self.selected = w.selected_mesh
+
+
+# ----------------------------------------------------------------------
+# Adımlar
+# ----------------------------------------------------------------------
+class _Step:
+    """
+    Ortak arayüz: undo / redo / nbytes + isteğe bağlı spill / load.
+    Spill edilebilen adımlar _ARRAYS’teki öznitelikleri diske yazar.
+    """
+    _ARRAYS = ()
+    spill_path = None
+    spilled = ()
+    disk_bytes = 0
+
+    def meshes(self):
+        m = getattr(self, "mesh", None)
+        return [m] if m is not None else []
+
+    def check(self, w, undo):
+        """Adım şu anki sahneye uygulanabilir mi (False → kayıt olduğu yerde kalır)."""
+        return True
+
+    def nbytes(self, live=()):
+        return _nbytes((getattr(self, k) for k in self._ARRAYS), live)
+
+    def spill(self, new_path, live=()):
+        """
+        Yalnızca geçmişe ait RAM dizilerini yazar (memmap / sahnedekiler
+        yerinde kalır).  new_path() yazılacak dizi varsa çağrılır.
+        """
+        if self.spill_path:
+            return 0
+        names = tuple(k for k in self._ARRAYS if _spillable(getattr(self, k), live))
+        if not names:
+            return 0
+        path = new_path()
+        self.disk_bytes = _save(path, {k: getattr(self, k) for k in names})
+        for k in names:
+            setattr(self, k, None)
+        self.spill_path, self.spilled = path, names
+        return self.disk_bytes
+
+    def load(self):
+        if not self.spill_path:
+            return
+        for k, v in _load(self.spill_path, self.spilled).items():
+            setattr(self, k, v)
+        self.spill_path, self.spilled, self.disk_bytes = None, (), 0
+
+    def drop(self):
+        """Kayıt tamamen atılırken diskteki dosyayı siler."""
+        if self.spill_path and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+        self.spill_path, self.spilled, self.disk_bytes = None, (), 0
+
+
+class ListStep(_Step):
+    """Sahnedeki mesh listesi (ekleme / silme / kesme)."""
+
+    def __init__(self, before, after):
+        self.before, self.after = before, after
+
+    def _apply(self, w, meshes):
+        w.meshes[:] = meshes  # tamponlar GpuResourceCache’te durur
+
+    def meshes(self):
+        return list(self.before) + [m for m in self.after
+                                    if m not in self.before]
+
+    def undo(self, w):
+        self._apply(w, self.before)
+
+    def redo(self, w):
+        self._apply(w, self.after)
+
+    def nbytes(self, live=()):
+        return 0  # sahne dışı mesh’ler UndoHistory tarafından sayılır
+
+
+class PropsStep(_Step):
+    """Tek mesh’in transform ve görünüm özellikleri."""
+
+    def __init__(self, mesh, before, after):
+        self.mesh, self.before, self.after = mesh, before, after
+
+    def _apply(self, p):
+        m = self.mesh
+        m.translation = p[0].copy()
+        m.rotation = p[1].copy()
+        m.scale = float(p[2]) if p[2].ndim == 0 else p[2].tolist()
+        if p[3] is not None:
+            m.point_size = p[3]
+        m.transparent, m.color, m.name = p[4], p[5], p[6]
+
+    def undo(self, w):
+        self._apply(self.before)
+
+    def redo(self, w):
+        self._apply(self.after)
+
+    def nbytes(self, live=()):
+        return 2 * 128
+
+
+class DataStep(_Step):
+    """Mesh verisi değişimi: önce/sonra dizi referansları (kopya yok)."""
+    _ARRAYS = ("b0", "b1", "b2", "b3", "a0", "a1", "a2", "a3")
+
+    def __init__(self, mesh, before, after):
+        self.mesh = mesh
+        self.b0, self.b1, self.b2, self.b3 = before[:4]
+        self.a0, self.a1, self.a2, self.a3 = after[:4]
+        self.b_meta, self.a_meta = before[4:], after[4:]
+
+    @property
+    def before(self):
+        return (self.b0, self.b1, self.b2, self.b3) + self.b_meta
+
+    @property
+    def after(self):
+        return (self.a0, self.a1, self.a2, self.a3) + self.a_meta
+
+    def _apply(self, w, d):
+        m = self.mesh
+        (m.vertices, m.indices, m.colors, m.normals,
+         m.index_count, m.draw_mode) = d
+        m.erase_mask = None
+        m.bump_version()  # yalnızca değişen diziler yeniden yüklenir
+
+    def undo(self, w):
+        self._apply(w, self.before)
+
+    def redo(self, w):
+        self._apply(w, self.after)
+
+    def nbytes(self, live=()):
+        # mesh’in şu an kullandığı diziler zaten sahnede → ek maliyet değil
+        own = {id(a) for a in _mesh_arrays(self.mesh)}
+        return _nbytes((a for a in self.before[:4] + self.after[:4]
+                        if id(a) not in own), live)
+
+
+class CameraStep(_Step):
+    """Kamera (rotasyon, pan, zoom) ve arka plan rengi."""
+
+    def __init__(self, before, after):
+        self.before, self.after = before, after
+
+    def _apply(self, w, s):
+        cam, bg = s
+        w.rotation_matrix = cam[0].copy()
+        w.x_translation, w.y_translation, w.zoom = cam[1:]
+        w.bg_color = bg
+        w.makeCurrent()
+        w._update_projection()
+        w.doneCurrent()
+
+    def undo(self, w):
+        self._apply(w, self.before)
+
+    def redo(self, w):
+        self._apply(w, self.after)
+
+    def nbytes(self, live=()):
+        return 2 * 96
+
+
+class EraseStep(_Step):
+    """
+    Silgi darbesi: sıkıştırmadan ÖNCE yakalanır.  Tutulanlar:
+    paketlenmiş verteks-koru ve üçgen-sil maskeleri (bit başına eleman),
+    silinen verteks satırları ve silinen üçgenler → maliyet silinenle orantılı.
+    """
+    _ARRAYS = ("vkeep", "dead", "dead_tris", "rm_v", "rm_c", "rm_n")
+
+    def __init__(self, m):
+        self.mesh = m
+        self.dead = self.dead_tris = None
+        mask = m.erase_mask
+        self.n_verts = len(m.vertices)
+        self.tris = bool(m.index_count) and len(mask) * 3 == m.index_count
+        if self.tris:
+            tri = m.indices.reshape(-1, 3)
+            self.n_tris = len(mask)
+            self.dead = np.packbits(mask)
+            self.dead_tris = tri[mask].copy()
+        vkeep = _kept_vertices(m)
+        self.vkeep = np.packbits(vkeep)
+        gone = ~vkeep
+        self.rm_v = m.vertices[gone]
+        self.rm_c = m.colors[gone] if m.colors is not None else None
+        self.rm_n = m.normals[gone] if m.normals is not None else None
+
+    def check(self, w, undo):
+        """Mesh hâlâ bu adımın beklediği durumda mı (undo: sıkıştırılmış)."""
+        m = self.mesh
+        if m.vertices is None:
+            return True  # diskte (UndoHistory geri okuyacak)
+        if undo:
+            n = int(np.unpackbits(self.vkeep, count=self.n_verts).sum())
+        else:
+            n = self.n_verts
+        if self.tris:
+            t = self.n_tris
+            if undo:
+                t -= int(np.unpackbits(self.dead, count=self.n_tris).sum())
+            if m.index_count != 3 * t:
+                return False
+        return len(m.vertices) == n
+
+    def undo(self, w):
+        m = self.mesh
+        vkeep = np.unpackbits(self.vkeep, count=self.n_verts).astype(bool)
+
+        def _expand(cur, removed):
+            if cur is None:
+                return None
+            full = np.empty((self.n_verts,) + cur.shape[1:], cur.dtype)
+            full[vkeep] = cur
+            full[~vkeep] = removed
+            return full
+
+        if self.tris:
+            dead = np.unpackbits(self.dead, count=self.n_tris).astype(bool)
+            uniq = np.flatnonzero(vkeep).astype(np.uint32)
+            tri = np.empty((self.n_tris, 3), np.uint32)
+            tri[~dead] = uniq[m.indices.reshape(-1, 3)]
+            tri[dead] = self.dead_tris
+            m.indices = tri.ravel()
+            m.index_count = m.indices.size
+
+        m.vertices = _expand(m.vertices, self.rm_v)
+        m.colors = _expand(m.colors, self.rm_c)
+        m.normals = _expand(m.normals, self.rm_n)
+        m.erase_mask = None
+        m.bump_version()
+
+    def redo(self, w):
+        m = self.mesh
+        if self.tris:
+            m.erase_mask = np.unpackbits(self.dead, count=self.n_tris).astype(bool)
+        else:
+            m.erase_mask = ~np.unpackbits(self.vkeep, count=self.n_verts).astype(bool)
+        m.compact()
+
+
+# ----------------------------------------------------------------------
+# Kayıt
+# ----------------------------------------------------------------------
+class HistoryEntry:
+    """Tek kullanıcı işlemi = bir veya daha fazla adım."""
+
+    def __init__(self, steps, label="", sel_before=None, sel_after=None):
+        self.steps = steps
+        self.label = label
+        self.sel_before, self.sel_after = sel_before, sel_after
+        self.time = time.monotonic()
+
+    def meshes(self):
+        return [m for st in self.steps for m in st.meshes()]
+
+    def disk_bytes(self):
+        return sum(st.disk_bytes for st in self.steps)
+
+    def load(self):
+        for st in self.steps:
+            st.load()
+
+    def drop(self):
+        for st in self.steps:
+            st.drop()
+
+    def coalescible(self):
+        return all(isinstance(st, (PropsStep, CameraStep)) for st in self.steps)
+
+    def merge(self, newer):
+        """Aynı patlamadaki yeni kaydı buna katlar: önce’ler korunur, sonra’lar güncellenir."""
+        for st in newer.steps:
+            for old in self.steps:
+                if type(old) is type(st) and getattr(old, "mesh", None) is getattr(st, "mesh", None):
+                    old.after = st.after
+                    break
+            else:
+                self.steps.append(st)
+        self.sel_after = newer.sel_after
+        self.time = newer.time
+
+    def check(self, w, undo=True):
+        return all(st.check(w, undo) for st in self.steps)
+
+    def undo(self, w):
+        for st in reversed(self.steps):
+            st.undo(w)
+        return self.sel_before
+
+    def redo(self, w):
+        for st in self.steps:
+            st.redo(w)
+        return self.sel_after
+
+    def nbytes(self, live=()):
+        return sum(st.nbytes(live) for st in self.steps)
+
+
+def diff_states(a: SceneState, b: SceneState):
+    """İki hafif görüntü arasındaki en küçük adım listesini üretir."""
+    steps = []
+    if a.meshes != b.meshes:
+        steps.append(ListStep(a.meshes, b.meshes))
+    for m in b.meshes:
+        k = id(m)
+        if k not in a.props:
+            continue
+        if not _same_data(a.data[k], b.data[k]):
+            steps.append(DataStep(m, a.data[k], b.data[k]))
+        if not _same_props(a.props[k], b.props[k]):
+            steps.append(PropsStep(m, a.props[k], b.props[k]))
+    cam_a, cam_b = (a.camera, a.bg_color), (b.camera, b.bg_color)
+    if not (np.array_equal(a.camera[0], b.camera[0])
+            and a.camera[1:] == b.camera[1:] and a.bg_color == b.bg_color):
+        steps.append(CameraStep(cam_a, cam_b))
+    return steps
+
+
+class UndoHistory:
+    """
+    save_state() → begin(): “önce” görüntüsünü alır.
+    İşlem bitince commit(): “sonra” ile farkı hesaplayıp bir kayıt ekler.
+    commit() unutulursa bir sonraki begin()/undo()/redo() bunu yapar.
+
+    ram_budget / disk_budget / coalesce_sec  → modül sabitleri varsayılan.
+    """
+
+    def __init__(self, widget, ram_budget=RAM_BUDGET, disk_budget=DISK_BUDGET,
+                 coalesce_sec=COALESCE_SEC):
+        self.w = widget
+        self.undo_stack = []
+        self.redo_stack = []
+        self._pending = None
+        self._label = ""
+        self.ram_budget = ram_budget
+        self.disk_budget = disk_budget
+        self.coalesce_sec = coalesce_sec
+        self._last = None               # birleştirilebilir son kayıt
+        self._dir = None                # spill klasörü (ilk ihtiyaçta)
+        self._seq = 0
+        self._spilled_meshes = {}       # id(mesh) → (mesh, path, bayt)
+
+    # ------------------------------------------------------------------
+    def begin(self, label=""):
+        self.commit()
+        self._pending = SceneState(self.w)
+        self._label = label
+
+    def commit(self):
+        if self._pending is None:
+            return
+        before, self._pending = self._pending, None
+        after = SceneState(self.w)
+        steps = diff_states(before, after)
+        if steps:
+            self.push(HistoryEntry(steps, self._label,
+                                   before.selected, after.selected))
+
+    def push(self, entry):
+        last = self._last
+        if (last is not None and self.undo_stack and self.undo_stack[-1] is last
+                and entry.label in COALESCE_LABELS and entry.label == last.label
+                and entry.time - last.time < self.coalesce_sec
+                and last.coalescible() and entry.coalescible()):
+            last.merge(entry)
+        else:
+            self.undo_stack.append(entry)
+            self._last = entry
+        for e in self.redo_stack:
+            e.drop()
+        self.redo_stack.clear()
+        self._gc_meshes()
+        self._enforce_budget()
+
+    def undo(self):
+        self.commit()
+        if not self.undo_stack:
+            return False
+        entry = self.undo_stack[-1]
+        self._prepare(entry)
+        if not entry.check(self.w, undo=True):
+            self._broken(entry, "undo")
+            return False
+        self.undo_stack.pop()
+        self._select(entry.undo(self.w))
+        self.redo_stack.append(entry)
+        self._last = None
+        self._enforce_budget()
+        return True
+
+    def redo(self):
+        self.commit()
+        if not self.redo_stack:
+            return False
+        entry = self.redo_stack[-1]
+        self._prepare(entry)
+        if not entry.check(self.w, undo=False):
+            self._broken(entry, "redo")
+            return False
+        self.redo_stack.pop()
+        self._select(entry.redo(self.w))
+        self.undo_stack.append(entry)
+        self._last = None
+        self._enforce_budget()
+        return True
+
+    def _broken(self, entry, what):
+        # zincir bozulmuş (kayıtsız değişiklik): hiçbir şey uygulanmaz,
+        # yığınlar değişmez
+        print(f"[Undo] '{entry.label}' kaydı sahneyle uyuşmuyor, {what} "
+              f"uygulanmadı", file=sys.stderr)
+
+    def clear(self):
+        for e in self.undo_stack + self.redo_stack:
+            e.drop()
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._spilled_meshes.clear()
+        self._last = None
+        if self._dir:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+    def _select(self, mesh):
+        w = self.w
+        w.selected_mesh = mesh if mesh in w.meshes else None
+        w.selected_index = (w.meshes.index(w.selected_mesh)
+                            if w.selected_mesh is not None else -1)
+
+    # ------------------------------------------------------------------
+    # Bellek tavanı
+    # ------------------------------------------------------------------
+    def _path(self):
+        if self._dir is None:
+            self._dir = tempfile.mkdtemp(prefix="2dto3d_undo_")
+            atexit.register(shutil.rmtree, self._dir, True)
+        self._seq += 1
+        return os.path.join(self._dir, f"{self._seq:07d}.npz")
+
+    def _prepare(self, entry):
+        """Uygulanacak kaydın ve dokunduğu sahne dışı mesh’lerin verisini geri oku."""
+        entry.load()
+        for m in entry.meshes():
+            rec = self._spilled_meshes.pop(id(m), None)
+            if rec is not None:
+                for k, v in _load(rec[1], rec[3]).items():
+                    setattr(m, k, v)
+
+    def _offscene(self, entries):
+        """Yalnızca geçmişte yaşayan (sahnede olmayan, RAM’deki) mesh’ler."""
+        live = {id(m) for m in self.w.meshes}
+        out = {}
+        for e in entries:
+            for m in e.meshes():
+                k = id(m)
+                if k not in live and k not in self._spilled_meshes:
+                    out[k] = m
+        return out
+
+    def ram_bytes(self, live=None):
+        entries = self.undo_stack + self.redo_stack
+        if live is None:
+            live = _scene_arrays(self.w.meshes)
+        return (sum(e.nbytes(live) for e in entries)
+                + sum(_nbytes(_mesh_arrays(m), live)
+                      for m in self._offscene(entries).values()))
+
+    def disk_bytes(self):
+        return (sum(e.disk_bytes() for e in self.undo_stack + self.redo_stack)
+                + sum(r[2] for r in self._spilled_meshes.values()))
+
+    def _spill_mesh(self, m, live=()):
+        arrs = {k: a for k, a in zip(_MESH_ARRAYS, _mesh_arrays(m))
+                if _spillable(a, live)}
+        if not arrs:
+            return
+        path = self._path()
+        size = _save(path, arrs)
+        for k in arrs:
+            setattr(m, k, None)
+        self._spilled_meshes[id(m)] = (m, path, size, tuple(arrs))
+
+    def _enforce_budget(self):
+        live = _scene_arrays(self.w.meshes)
+        used = self.ram_bytes(live)
+        if used > self.ram_budget:
+            # en uzak kayıtlar önce: undo’nun dibi, sonra redo’nun dibi
+            for e in self.undo_stack + self.redo_stack:
+                if used <= self.ram_budget:
+                    break
+                if e is self._last:
+                    continue  # hâlâ birleştirilebilir
+                for st in e.steps:
+                    used -= st.nbytes(live)
+                    st.spill(self._path, live)
+                for m in self._offscene([e]).values():
+                    used -= _nbytes(_mesh_arrays(m), live)
+                    self._spill_mesh(m, live)
+
+        # disk tavanı: en eski undo kayıtlarını tamamen düşür
+        dropped = False
+        while self.undo_stack and self.disk_bytes() > self.disk_budget:
+            old = self.undo_stack.pop(0)
+            old.drop()
+            dropped = True
+            if old is self._last:
+                self._last = None
+            self._gc_meshes()
+        if dropped:
+            print(f"[Undo] disk tavanı aşıldı, {len(self.undo_stack)} kayıt kaldı",
+                  file=sys.stderr)
+
+    def _gc_meshes(self):
+        """Hiçbir kaydın artık göstermediği spill edilmiş mesh dosyalarını sil."""
+        used = {id(m) for e in self.undo_stack + self.redo_stack
+                for m in e.meshes()}
+        for k in [k for k in self._spilled_meshes if k not in used]:
+            path = self._spilled_meshes.pop(k)[1]
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,236 @@
+# id_buffer.py  –  ekran-dışı üçgen/nokta ID geçişi (silgi + seçim)
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+from shader_utils import build_program
+from gpu_cache import bind_attribs
+
+# R = obje yuvası (meshes listesindeki sıra + 1), G = üçgen/nokta id + 1.
+# 0 → arka plan.  Derinlik testi açık: yalnızca görünen yüzey yazılır.
+_ID_VSRC = """
+#version 150
+in vec3 a_pos;
+uniform mat4 u_mvp;
+flat out uint v_vid;
+void main(){
+    v_vid = uint(gl_VertexID);
+    gl_Position = u_mvp * vec4(a_pos, 1.0);
+}"""
+
+_ID_FSRC = """
+#version 150
+flat in uint v_vid;
+uniform uint u_obj;
+uniform uint u_base;              // parçalı mesh: parçanın eleman ofseti
+uniform bool u_points;
+out uvec2 o_id;
+void main(){
+    uint prim = u_points ? v_vid : uint(gl_PrimitiveID);
+    o_id = uvec2(u_obj, u_base + prim + 1u);
+}"""
+
+
+class IdBufferError(RuntimeError):
+    """ID FBO kurulamadı (sürücü / biçim desteği)."""
+
+
+class IdBuffer:
+    """
+    GL_RG32UI renk hedefi + derinlik tamponlu FBO.  Sahne obje/üçgen
+    kimlikleriyle çizilir, sonra küçük bir piksel dikdörtgeni okunur.
+    Bağlam (makeCurrent) çağıran tarafından sağlanmalıdır.
+    """
+
+    def __init__(self, prim_restart=True):
+        # maskeli nokta listesi primitive restart ile mi (yoksa sıkıştırılmış)
+        self.prim_restart = prim_restart
+        self.prog = build_program(_ID_VSRC, _ID_FSRC)
+        self.u_mvp = glGetUniformLocation(self.prog, "u_mvp")
+        self.u_obj = glGetUniformLocation(self.prog, "u_obj")
+        self.u_points = glGetUniformLocation(self.prog, "u_points")
+        self.u_base = glGetUniformLocation(self.prog, "u_base")
+        glBindFragDataLocation(self.prog, 0, "o_id")
+        glLinkProgram(self.prog)
+        self.fbo = self.rb_id = self.rb_depth = 0
+        self.size = (0, 0)
+        # obje-yuvası (R) kanalının eşzamansız kopyası: PBO + çit
+        self.pbo = 0
+        self._fence = None
+        self._snap = None    # (H, W) uint32, Qt yönünde; içerik değişince None
+
+    # ------------------------------------------------------------------
+    def _ensure_fbo(self, w: int, h: int):
+        if self.fbo and self.size == (w, h):
+            return
+        self.release()
+        self.fbo = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+
+        self.rb_id = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.rb_id)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RG32UI, w, h)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0,
+                                  GL_RENDERBUFFER, self.rb_id)
+
+        self.rb_depth = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.rb_depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, w, h)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT,
+                                  GL_RENDERBUFFER, self.rb_depth)
+
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise IdBufferError("ID FBO tamamlanamadı")
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+        self.size = (w, h)
+
+    def release(self):
+        self._drop_snapshot()
+        if self.pbo:
+            glDeleteBuffers(1, [self.pbo])
+            self.pbo = 0
+        if self.fbo:
+            glDeleteFramebuffers(1, [self.fbo])
+        for rb in (self.rb_id, self.rb_depth):
+            if rb:
+                glDeleteRenderbuffers(1, [rb])
+        self.fbo = self.rb_id = self.rb_depth = 0
+        self.size = (0, 0)
+
+    # ------------------------------------------------------------------
+    def render(self, items, w: int, h: int, restore_fbo: int):
+        """
+        items : [(slot, mesh, MeshBuffers, mvp(4×4 float32), base)] – slot ≥ 1
+                mesh: çizilen parça (Mesh.draw_parts), base: eleman ofseti.
+                mvp nicem çözmeyi (MeshBuffers.model) içermelidir.
+        restore_fbo : çizimden sonra geri bağlanacak FBO
+                      (QOpenGLWidget.defaultFramebufferObject()).
+        """
+        self._ensure_fbo(w, h)
+        self._drop_snapshot()
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glPushAttrib(GL_ALL_ATTRIB_BITS)
+        glViewport(0, 0, w, h)
+        glDisable(GL_BLEND)
+        glDisable(GL_MULTISAMPLE)
+        glEnable(GL_DEPTH_TEST)
+        glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+        glClearBufferuiv(GL_COLOR, 0, np.zeros(4, np.uint32))
+        glClear(GL_DEPTH_BUFFER_BIT)
+
+        glUseProgram(self.prog)
+        glDisableVertexAttribArray(1)
+        glDisableVertexAttribArray(2)
+        for slot, m, g, mvp, base in items:
+            glUniformMatrix4fv(self.u_mvp, 1, GL_TRUE, mvp)
+            glUniform1ui(self.u_obj, slot)
+            glUniform1ui(self.u_base, base)
+
+            bind_attribs(g, (0,))  # yalnızca konum (float32 veya nicemli)
+
+            if m.draw_mode == GL_TRIANGLES and m.index_count:
+                glUniform1i(self.u_points, 0)
+                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, g.vbo_i)
+                glDrawElements(GL_TRIANGLES, m.index_count, g.index_type, None)
+            else:
+                glUniform1i(self.u_points, 1)
+                glPointSize(getattr(m, "point_size", 2.0))
+                if g.vbo_pts:  # silgi maskeli liste
+                    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, g.vbo_pts)
+                    if self.prim_restart:
+                        glEnable(GL_PRIMITIVE_RESTART)
+                    glDrawElements(GL_POINTS, g.pts_count, GL_UNSIGNED_INT, None)
+                    if self.prim_restart:
+                        glDisable(GL_PRIMITIVE_RESTART)
+                else:
+                    glDrawArrays(GL_POINTS, 0, len(m.vertices))
+
+        glUseProgram(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glPopAttrib()
+        glBindFramebuffer(GL_FRAMEBUFFER, restore_fbo)
+
+    # ------------------------------------------------------------------
+    # Eşzamansız geri okuma (seçim / üzerinde gezinme)
+    # ------------------------------------------------------------------
+    def _drop_snapshot(self):
+        if self._fence is not None:
+            glDeleteSync(self._fence)
+            self._fence = None
+        self._snap = None
+
+    def start_readback(self, restore_fbo: int):
+        """
+        Son çizilen ID geçişinin obje yuvası (R) kanalını PBO’ya kopyalamayı
+        başlatır; glReadPixels hemen döner (DMA arka planda).  Sonuç ilk
+        read_slots çağrısında CPU’ya alınır ve içerik değişene kadar
+        tekrar kullanılır.
+        """
+        W, H = self.size
+        if not self.fbo or self._fence is not None or self._snap is not None:
+            return
+        if not self.pbo:
+            self.pbo = glGenBuffers(1)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbo)
+        glBufferData(GL_PIXEL_PACK_BUFFER, W * H * 4, None, GL_STREAM_READ)
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.fbo)
+        glReadBuffer(GL_COLOR_ATTACHMENT0)
+        glPixelStorei(GL_PACK_ALIGNMENT, 4)
+        glReadPixels(0, 0, W, H, GL_RED_INTEGER, GL_UNSIGNED_INT,
+                     ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        glBindFramebuffer(GL_FRAMEBUFFER, restore_fbo)
+        self._fence = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+    def _snapshot(self):
+        if self._snap is None and self._fence is not None:
+            # genelde çoktan tamam; değilse kopya bitene kadar bekler
+            glClientWaitSync(self._fence, GL_SYNC_FLUSH_COMMANDS_BIT, 10 ** 9)
+            glDeleteSync(self._fence)
+            self._fence = None
+            W, H = self.size
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbo)
+            raw = glGetBufferSubData(GL_PIXEL_PACK_BUFFER, 0, W * H * 4)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+            arr = np.frombuffer(memoryview(raw), np.uint32).reshape(H, W)
+            self._snap = arr[::-1]  # GL alt-sol → Qt üst-sol
+        return self._snap
+
+    def read_slots(self, x: int, y: int, w: int, h: int, restore_fbo: int):
+        """
+        read_rect gibi, ama yalnızca obje yuvaları (R): eşzamansız kopya
+        hazırsa GL çağrısı yapılmadan ondan dilimlenir.
+        Dönüş: (slots (h', w') uint32, x0, y0).
+        """
+        snap = self._snapshot()
+        if snap is None:
+            ids, x0, y0 = self.read_rect(x, y, w, h, restore_fbo)
+            return ids[..., 0], x0, y0
+        H, W = snap.shape
+        x0, x1 = max(x, 0), min(x + w, W)
+        y0, y1 = max(y, 0), min(y + h, H)
+        if x0 >= x1 or y0 >= y1:
+            return np.zeros((0, 0), np.uint32), x0, y0
+        return snap[y0:y1, x0:x1], x0, y0
+
+    def read_rect(self, x: int, y: int, w: int, h: int, restore_fbo: int):
+        """
+        Qt koordinatında (0,0 sol-üst) dikdörtgeni okur, ekrana sığmayan
+        kısmı kırpar.  Dönüş: (ids, x0, y0) – ids (h', w', 2) uint32,
+        satır 0 = Qt y0 satırı; (x0, y0) kırpılmış sol-üst köşe.
+        """
+        W, H = self.size
+        x0, x1 = max(x, 0), min(x + w, W)
+        y0, y1 = max(y, 0), min(y + h, H)
+        if x0 >= x1 or y0 >= y1:
+            return np.zeros((0, 0, 2), np.uint32), x0, y0
+
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.fbo)
+        glReadBuffer(GL_COLOR_ATTACHMENT0)
+        glPixelStorei(GL_PACK_ALIGNMENT, 4)
+        raw = glReadPixels(x0, H - y1, x1 - x0, y1 - y0,
+                           GL_RG_INTEGER, GL_UNSIGNED_INT)
+        glBindFramebuffer(GL_FRAMEBUFFER, restore_fbo)
+        arr = np.frombuffer(raw, np.uint32).reshape(y1 - y0, x1 - x0, 2)
+        return arr[::-1], x0, y0  # GL alt-sol → Qt üst-sol
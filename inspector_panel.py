@@ -1,8 +1,8 @@
 from __future__ import annotations
 """
 Inspector panel — editable transform with spin‑boxes and “–” placeholder.
-Her değer değişikliğinde **Cube3DWidget.save_state()** çağırarak Undo/Redo’ya
-kaydedilir.
+Her değer değişikliği **Cube3DWidget.save_state()** / **commit_state()**
+arasında yapılır; Undo/Redo’ya yalnızca değişen transform kaydedilir.
 """
 
 from typing import Sequence, Optional
@@ -137,7 +137,7 @@ class InspectorPanel(QWidget):
             return
 
         # --- 1) Save previous state before mutating anything ---------
-        self.cube_widget.save_state()
+        self.cube_widget.save_state("inspector")
 
         axis = "xyz".index(tag[-1])
 
@@ -174,6 +174,9 @@ class InspectorPanel(QWidget):
             M[:3, :3] = Rz @ Ry @ Rx
             mesh.rotation = M
 
+        # --- 2) Record the delta ---------------------------------------
+        self.cube_widget.commit_state()
+
         # Redraw & refresh fields
         self.cube_widget.update()
         self._refresh()
@@ -0,0 +1,111 @@
+from PyQt5.QtWidgets import (
+    QWidget, QListWidget, QListWidgetItem, QVBoxLayout, QHBoxLayout, QLabel,
+    QPushButton, QSpinBox, QSizePolicy
+)
+from PyQt5.QtCore import Qt
+
+from job_queue import QUEUED, RUNNING, DONE, FAILED, CANCELLED
+
+
+_STATE_TEXT = {
+    QUEUED:    "⏳ {name} – sırada",
+    RUNNING:   "▶ {name} – %{progress}",
+    DONE:      "✓ {name}{cached}",
+    FAILED:    "✗ {name} – {error}",
+    CANCELLED: "⊘ {name} – iptal",
+}
+
+
+class JobPanel(QWidget):
+    """
+    Sağ kenarda model üretim işleri (sırada / çalışıyor / bitti).
+    Modal değildir: işler sürerken sahne kullanılmaya devam eder.
+    """
+    def __init__(self, job_queue, parent=None):
+        super().__init__(parent)
+        self.job_queue = job_queue
+        self._items = {}  # job.id → QListWidgetItem
+
+        self.setFixedWidth(180)
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
+
+        self.title = QLabel("▾ İşler")
+        self.title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        self.title.setStyleSheet("background:#dddddd;font-weight:bold;")
+        self.title.mousePressEvent = self._toggle
+
+        self.list = QListWidget()
+
+        self.cancel_btn = QPushButton("İptal")
+        self.cancel_btn.clicked.connect(self._cancel_selected)
+        self.clear_btn = QPushButton("Temizle")
+        self.clear_btn.clicked.connect(self._clear_finished)
+
+        self.limit_spin = QSpinBox()
+        self.limit_spin.setRange(1, 8)
+        self.limit_spin.setValue(job_queue.max_concurrent)
+        self.limit_spin.setToolTip("Aynı anda çalışan en çok iş")
+        self.limit_spin.valueChanged.connect(job_queue.set_max_concurrent)
+
+        self.body = QWidget()
+        row = QHBoxLayout(); row.setContentsMargins(0, 0, 0, 0)
+        row.addWidget(self.cancel_btn); row.addWidget(self.clear_btn)
+        limit_row = QHBoxLayout(); limit_row.setContentsMargins(0, 0, 0, 0)
+        limit_row.addWidget(QLabel("Eşzamanlı:")); limit_row.addWidget(self.limit_spin)
+        body = QVBoxLayout(self.body); body.setContentsMargins(0, 0, 0, 0)
+        body.addWidget(self.list); body.addLayout(row); body.addLayout(limit_row)
+
+        lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0)
+        lay.addWidget(self.title); lay.addWidget(self.body)
+
+        job_queue.job_added.connect(self._add)
+        job_queue.job_changed.connect(self._update)
+        job_queue.job_finished.connect(self._update)
+
+        self._collapsed = False
+        for job in job_queue.jobs:
+            self._add(job)
+
+    # ------------------------------------------------------------
+    def _toggle(self, *_):
+        self._collapsed = not self._collapsed
+        self.body.setVisible(not self._collapsed)
+        self.title.setText(("▾ " if not self._collapsed else "▸ ") + "İşler")
+
+        if self._collapsed:
+            self.setMaximumHeight(self.title.sizeHint().height())
+            self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Minimum)
+        else:
+            self.setMaximumHeight(16777215)
+            self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
+
+        self.parent().updateGeometry()
+
+    # ------------------------------------------------------------
+    def _add(self, job):
+        item = QListWidgetItem()
+        item.setData(Qt.UserRole, job)
+        self.list.addItem(item)
+        self._items[job.id] = item
+        self._update(job)
+
+    def _update(self, job):
+        item = self._items.get(job.id)
+        if item is None:
+            return
+        item.setText(_STATE_TEXT[job.state].format(
+            name=job.name, progress=job.progress, error=job.error,
+            cached=" (önbellek)" if job.cached else ""))
+        item.setToolTip(f"{job.slice_folder}\n→ {job.output_path}"
+                        + (f"\n{job.error}" if job.error else ""))
+
+    def _cancel_selected(self):
+        for item in self.list.selectedItems():
+            self.job_queue.cancel(item.data(Qt.UserRole))
+
+    def _clear_finished(self):
+        self.job_queue.clear_finished()
+        for job_id, item in list(self._items.items()):
+            if item.data(Qt.UserRole).finished:
+                self.list.takeItem(self.list.row(item))
+                del self._items[job_id]
@@ -0,0 +1,201 @@
+# job_queue.py
+"""
+Model üretim iş kuyruğu: birden çok dilim klasörü / parametre seti sıraya
+alınır, en çok max_concurrent iş aynı anda çalışır.
+
+Bellek farkındalıklı kabul: her işin tepe belleği dilim boyutundan
+kestirilir (estimate_job_bytes); çalışanların toplamı + yeni iş, boş
+belleğin memory_fraction’ını aşıyorsa iş beklemede kalır.  Sıradaki iş
+sığmıyorsa arkasındaki daha küçük iş öne geçebilir; hiç iş çalışmıyorsa
+ilk iş her durumda başlar (büyük iş sonsuza dek beklemesin).
+
+Durumlar: queued → running → done | failed | cancelled
+"""
+import itertools
+import os
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from model_generation import available_memory
+from model_generation_worker import ModelGenerationWorker
+from volume_loader import list_slices
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = (
+    "queued", "running", "done", "failed", "cancelled")
+
+# Voksel başına tepe bayt: yüzey yolu hacmin tamamını (float32 gri +
+# BGR + dilim listeleri + marching-cubes geçicileri) tutar; nokta yolu
+# bloklarla akar, yalnızca bloklar ve sonuç kalır.
+_MESH_BYTES_PER_VOXEL = 16
+_POINT_BYTES_PER_VOXEL = 0.5
+_POINT_SLAB_BYTES_PER_PIXEL = 16 * 4 * 3  # 16 dilimlik blok × (gri+BGR) × ~3 kopya
+
+
+def estimate_job_bytes(slice_folder, resolution, render_mode):
+    """Üretim işinin kabaca tepe belleği (bayt)."""
+    files = list_slices(slice_folder)
+    if not files:
+        return 0
+    if resolution:
+        w, h = resolution
+    else:  # dilim boyutu ilk PNG’den
+        import cv2
+        img = cv2.imread(files[0], cv2.IMREAD_GRAYSCALE)
+        h, w = img.shape if img is not None else (0, 0)
+    voxels = w * h * len(files)
+    if render_mode == "point":
+        return int(w * h * _POINT_SLAB_BYTES_PER_PIXEL
+                   + voxels * _POINT_BYTES_PER_VOXEL)
+    return int(voxels * _MESH_BYTES_PER_VOXEL)
+
+
+class GenerationJob:
+    """Kuyruktaki tek üretim işi (ModelGenerationWorker parametreleri)."""
+    _ids = itertools.count(1)
+
+    def __init__(self, slice_folder, output_path, **params):
+        self.id = next(self._ids)
+        self.slice_folder = slice_folder
+        self.output_path = output_path
+        self.params = params           # scale_factor, threshold, …
+        self.name = os.path.splitext(os.path.basename(output_path))[0]
+        self.state = QUEUED
+        self.progress = 0
+        self.error = ""
+        self.est_bytes = 0
+        self.meshes = None
+        self.worker = None
+        self.cached = False            # sonuç generation_cache’ten geldi
+
+    @property
+    def point_size(self):
+        return self.params.get("point_size", 5.0)
+
+    @property
+    def finished(self):
+        return self.state in (DONE, FAILED, CANCELLED)
+
+
+class JobQueue(QObject):
+    """
+    submit() → iş sıraya girer; durum değişiklikleri job_changed ile,
+    sonuç job_finished ile (GUI iş parçacığında) bildirilir.
+    """
+    job_added = pyqtSignal(object)
+    job_changed = pyqtSignal(object)
+    job_finished = pyqtSignal(object)
+
+    def __init__(self, parent=None, max_concurrent=2, memory_fraction=0.7):
+        super().__init__(parent)
+        self.max_concurrent = max_concurrent
+        self.memory_fraction = memory_fraction
+        self.jobs = []
+
+    # ------------------------------------------------------------
+    def submit(self, slice_folder, output_path, **params):
+        job = GenerationJob(slice_folder, output_path, **params)
+        try:
+            job.est_bytes = estimate_job_bytes(
+                slice_folder, params.get("resolution"),
+                params.get("render_mode"))
+        except OSError as e:
+            job.state, job.error = FAILED, str(e)
+        self.jobs.append(job)
+        self.job_added.emit(job)
+        if job.finished:
+            self.job_finished.emit(job)
+        self._schedule()
+        return job
+
+    def cancel(self, job):
+        if job.state == QUEUED:
+            job.state = CANCELLED
+            self.job_changed.emit(job)
+            self.job_finished.emit(job)
+        elif job.state == RUNNING and job.worker is not None:
+            job.worker.stop()  # bitişte CANCELLED işaretlenir
+
+    def shutdown(self):
+        """
+        Uygulama kapanırken: bekleyenleri iptal et, çalışanları durdurup
+        bitmelerini bekle (çalışan QThread yok edilirse Qt süreci düşürür).
+        """
+        for job in self.jobs:
+            self.cancel(job)
+        for job in self.running:
+            if job.worker is not None:
+                job.worker.wait()
+
+    def clear_finished(self):
+        self.jobs = [j for j in self.jobs if not j.finished]
+
+    def set_max_concurrent(self, n):
+        self.max_concurrent = max(1, int(n))
+        self._schedule()
+
+    @property
+    def running(self):
+        return [j for j in self.jobs if j.state == RUNNING]
+
+    def pending_output_paths(self):
+        """Henüz bitmemiş işlerin çıktı yolları (aynı ada iki iş gitmesin)."""
+        return {j.output_path for j in self.jobs if not j.finished}
+
+    # ------------------------------------------------------------
+    def _admit(self, job, running):
+        if not running:
+            return True
+        free = available_memory()
+        if free is None:
+            return True
+        # Temkinli: çalışan işler tahminlerini henüz ayırmamış sayılır
+        reserved = sum(j.est_bytes for j in running)
+        return reserved + job.est_bytes <= free * self.memory_fraction
+
+    def _schedule(self):
+        running = self.running
+        for job in self.jobs:
+            if len(running) >= self.max_concurrent:
+                break
+            if job.state != QUEUED or not self._admit(job, running):
+                continue
+            self._start(job)
+            running.append(job)
+
+    def _start(self, job):
+        p = job.params
+        w = ModelGenerationWorker(
+            job.slice_folder, job.output_path,
+            scale_factor=p["scale_factor"],
+            z_increment=p["z_increment"],
+            threshold=p["threshold"],
+            resolution=p.get("resolution"),
+            noise_method=p.get("noise_method"),
+            render_mode=p.get("render_mode", "mesh"),
+            point_size=job.point_size,
+            parent=self)
+        job.worker, job.state, job.progress = w, RUNNING, 0
+        w.progress_signal.connect(lambda v, j=job: self._on_progress(j, v))
+        w.finished.connect(lambda j=job: self._on_done(j))
+        w.start()
+        self.job_changed.emit(job)
+
+    def _on_progress(self, job, value):
+        if value != job.progress:
+            job.progress = value
+            self.job_changed.emit(job)
+
+    def _on_done(self, job):
+        w, job.worker = job.worker, None
+        if w.stop_requested:
+            job.state = CANCELLED
+        elif w.meshes is not None:
+            job.state, job.meshes, job.progress = DONE, w.meshes, 100
+            job.cached = w.cache_hit
+        else:
+            job.state = FAILED
+            job.error = w.error or "model oluşturulamadı"
+        w.deleteLater()
+        self.job_changed.emit(job)
+        self.job_finished.emit(job)
+        self._schedule()
@@ -11,6 +11,7 @@ from repeat_button import RepeatButton
 from object_panel import ObjectPanel
 from inspector_panel import InspectorPanel
 from notes_panel import NotesPanel
+from job_panel import JobPanel
 
 
 class MainScreen(QWidget):
@@ -140,12 +141,14 @@ class MainScreen(QWidget):
         self.object_panel    = ObjectPanel(cube_widget)
         self.inspector_panel = InspectorPanel(cube_widget)
         self.notes_panel     = NotesPanel()
+        self.job_panel       = JobPanel(main_window.job_queue)
 
         sidebar = QWidget()
         sb = QVBoxLayout(sidebar); sb.setContentsMargins(0, 0, 0, 0)
         sb.addWidget(self.object_panel)
         sb.addWidget(self.inspector_panel)
-        sb.addWidget(self.notes_panel); sb.addStretch()
+        sb.addWidget(self.notes_panel)
+        sb.addWidget(self.job_panel); sb.addStretch()
 
         # ───── ana yerleşim
         lay = QHBoxLayout(self)
@@ -189,8 +192,8 @@ class MainScreen(QWidget):
         if dlg.exec_() == QDialog.Accepted:
             _, fn = dlg.get_selection()
             if fn:
-                self.cube_widget.load_obj(fn)
-                self.main_window.go_main_screen()
+                self.cube_widget.load_obj_async(
+                    fn, on_done=lambda _: self.main_window.go_main_screen())
 
     def update_theme(self, theme: str):
         """Update the UI elements based on the selected theme."""
@@ -200,9 +203,11 @@ class MainScreen(QWidget):
             self.object_panel.setStyleSheet("background:#F2F4F7;color:#1565C0;")
             self.inspector_panel.setStyleSheet("background:#F2F4F7;color:#1565C0;")
             self.notes_panel.setStyleSheet("background:#F2F4F7;color:#1565C0;")
+            self.job_panel.setStyleSheet("background:#F2F4F7;color:#1565C0;")
 
             # Panel titles
-            for panel in [self.object_panel, self.inspector_panel, self.notes_panel]:
+            for panel in [self.object_panel, self.inspector_panel, self.notes_panel,
+                          self.job_panel]:
                 panel.title.setStyleSheet("background:#dddddd;color:#1565C0;font-weight:bold;")
 
             # Object panel list
@@ -241,9 +246,11 @@ class MainScreen(QWidget):
             self.object_panel.setStyleSheet("background:#1E1E1E;color:#EDEDED;")
             self.inspector_panel.setStyleSheet("background:#1E1E1E;color:#EDEDED;")
             self.notes_panel.setStyleSheet("background:#1E1E1E;color:#EDEDED;")
+            self.job_panel.setStyleSheet("background:#1E1E1E;color:#EDEDED;")
 
             # Panel titles
-            for panel in [self.object_panel, self.inspector_panel, self.notes_panel]:
+            for panel in [self.object_panel, self.inspector_panel, self.notes_panel,
+                          self.job_panel]:
                 panel.title.setStyleSheet("background:#222;color:#EDEDED;font-weight:bold;")
 
             # Object panel list
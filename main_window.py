@@ -11,15 +11,15 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui     import QCursor
 from PyQt5.QtCore    import Qt, pyqtSignal
-from OpenGL.GL import (
-    glGenBuffers, glBindBuffer, glBufferData,
-    GL_ARRAY_BUFFER, GL_STATIC_DRAW, GL_POINTS
-)
+from OpenGL.GL import GL_POINTS
 
 from mesh            import Mesh
+from chunked_mesh    import build_mesh
 from cube_3d_widget  import Cube3DWidget
 from entry_screen    import EntryScreen
 from main_screen     import MainScreen
+from job_queue       import JobQueue, DONE, FAILED
+from cache_dialog    import CacheDialog
 
 
 def export_mesh(mesh: Mesh, filepath: str) -> None:
@@ -49,6 +49,10 @@ class MainWindow(QMainWindow):
         self.current_project = None
         self.next_color_id = 1
 
+        # Model üretim kuyruğu (EntryScreen gönderir, JobPanel gösterir)
+        self.job_queue = JobQueue(self)
+        self.job_queue.job_finished.connect(self.on_job_finished)
+
         # Stack & ekranlar
         self.stack = QStackedWidget()
         self.entry_screen = EntryScreen(self)
@@ -65,6 +69,9 @@ class MainWindow(QMainWindow):
 
         # **Burada on_selection_changed metodu yoksa hata alırsınız**
         self.cube_widget.selection_changed.connect(self.on_selection_changed)
+        self.cube_widget.render_stats_changed.connect(self.on_render_stats)
+        self.cube_widget.status_message.connect(
+            lambda msg: self.statusBar().showMessage(msg, 10000))
 
         # Ekran değişimine göre aksiyon durumu
         self.stack.currentChanged.connect(self.update_actions)
@@ -72,6 +79,13 @@ class MainWindow(QMainWindow):
         self.update_actions(self.stack.currentIndex())
 
 
+    def closeEvent(self, event):
+        # Üretim ve mesh işleri modal değil → pencere kapanırken çalışıyor
+        # olabilirler; QThread’ler yok edilmeden önce durdurulup beklenir
+        self.job_queue.shutdown()
+        self.cube_widget.stop_workers()
+        super().closeEvent(event)
+
     def create_menu(self):
         """Menü çubuğuna Dosya ve Ayarlar menülerini ekler ve aksiyonları oluşturur."""
         menubar = self.menuBar()
@@ -96,6 +110,11 @@ class MainWindow(QMainWindow):
         self.close_act.triggered.connect(self.close_project)
         file_menu.addAction(self.close_act)
 
+        file_menu.addSeparator()
+        self.create_act = QAction("Obje Oluştur...", self)
+        self.create_act.triggered.connect(self.entry_screen.create_obj)
+        file_menu.addAction(self.create_act)
+
         # ---------------------------------------------------------------
         # Ayarlar menüsü
         settings_menu = menubar.addMenu("Ayarlar")
@@ -180,6 +199,28 @@ class MainWindow(QMainWindow):
         self.action_point_size.triggered.connect(self.on_change_point_size)
         settings_menu.addAction(self.action_point_size)
 
+        # ---------------------------
+        # Sürükleme sırasında çizim kalitesi (vekil politikası + hedef süre)
+        interact_menu = settings_menu.addMenu("Sürükleme Kalitesi")
+        interact_group = QActionGroup(self)
+        for label, policy in (("Seyrek Noktalar", "points"),
+                              ("Seyrek Üçgenler", "triangles"),
+                              ("Tam Kalite", "off")):
+            act = QAction(label, self, checkable=True)
+            act.setChecked(self.cube_widget.interactive_policy == policy)
+            act.triggered.connect(
+                lambda _, p=policy: setattr(self.cube_widget, "interactive_policy", p))
+            interact_group.addAction(act)
+            interact_menu.addAction(act)
+        target_act = QAction("Hedef Kare Süresi…", self)
+        target_act.triggered.connect(self.adjust_interactive_target)
+        interact_menu.addAction(target_act)
+
+        # Üretim sonuç önbelleği (girdiler, boyut sınırı)
+        cache_act = QAction("Üretim Önbelleği…", self)
+        cache_act.triggered.connect(lambda: CacheDialog(self).exec_())
+        settings_menu.addAction(cache_act)
+
         # Renk şeması (aktif/devre dışı öğeler için)
         style = """
             QMenu::item:enabled { color: black; }
@@ -208,6 +249,18 @@ class MainWindow(QMainWindow):
         )
 
 
+    def adjust_interactive_target(self):
+        """Sürüklerken hedeflenen kare süresi (ms); aşılırsa vekil çizilir."""
+        val, ok = QInputDialog.getDouble(
+            self, "Hedef Kare Süresi",
+            "Sürükleme karesi en fazla (ms):",
+            self.cube_widget.interactive_target_ms,
+            4.0, 200.0, 1
+        )
+        if ok:
+            self.cube_widget.interactive_target_ms = val
+
+
     def _disable_grid(self):
         """Grid'leri tamamen kapat."""
         self.cube_widget.set_grid_visible(False)
@@ -396,10 +449,7 @@ class MainWindow(QMainWindow):
             if entry.get("colors") is not None:
                 cols = np.array(entry["colors"], dtype=np.float32)
                 mesh.colors = cols
-                if not getattr(mesh, "vbo_c", None):
-                    mesh.vbo_c = glGenBuffers(1)
-                glBindBuffer(GL_ARRAY_BUFFER, mesh.vbo_c)
-                glBufferData(GL_ARRAY_BUFFER, cols.nbytes, cols, GL_STATIC_DRAW)
+                mesh.bump_version()
 
             self.cube_widget.meshes.append(mesh)
 
@@ -493,8 +543,8 @@ class MainWindow(QMainWindow):
 
         verts_arr = np.array(verts, dtype=np.float32)
         inds_arr  = np.array(faces, dtype=np.uint32).flatten()
-        mesh = Mesh(verts_arr, inds_arr,
-                    mesh_name=os.path.splitext(os.path.basename(filepath))[0])
+        mesh = build_mesh(verts_arr, inds_arr,
+                          mesh_name=os.path.splitext(os.path.basename(filepath))[0])
         mesh.id = self.next_color_id
         self.next_color_id += 1
         return mesh
@@ -532,6 +582,33 @@ class MainWindow(QMainWindow):
             self.action_point_size.setEnabled(False)
 
 
+    def on_render_stats(self, stats: dict):
+        """Görüş-hacmi ayıklama sayaçlarını durum çubuğunda gösterir."""
+        self.statusBar().showMessage(
+            f"Çizilen nesne: {stats['meshes'] - stats['culled']}/{stats['meshes']}"
+            f"  ·  ayıklanan blok: {stats['chunks_culled']}/{stats['chunks']}"
+            + (f"  ·  önizleme 1/{stats['stride']}" if stats.get("stride", 1) > 1 else "")
+            + (f"  ·  octree düğüm: {stats['nodes']}" if stats.get("nodes") else "")
+            + ("  (yükleniyor…)" if stats.get("streaming") else ""))
+
+    def on_job_finished(self, job):
+        """Biten üretim işinin Mesh’lerini sahneye ekler (kullanıcıyı bölmeden)."""
+        if job.state == DONE and job.meshes:
+            meshes, job.meshes = job.meshes, None  # sahne sahiplenir
+            for m in meshes:
+                if m.draw_mode == GL_POINTS:
+                    m.point_size = job.point_size
+            self.cube_widget.add_meshes(meshes)
+            self._update_point_size_menu()
+            self.statusBar().showMessage(
+                f"‘{os.path.basename(job.output_path)}’ modeli "
+                + ("önbellekten alındı" if job.cached else "oluşturuldu")
+                + " ve sahneye eklendi.",
+                5000)
+        elif job.state == FAILED:
+            self.statusBar().showMessage(
+                f"‘{job.name}’ oluşturulamadı: {job.error}", 8000)
+
     def on_selection_changed(self, mesh_index: int):
         """
         Kullanıcı sahnede seçim değiştirdiğinde tetiklenir:
@@ -577,6 +654,7 @@ class MainWindow(QMainWindow):
 
         self.cube_widget.save_state()  # ← **Undo kaydı eklendi**
         mesh.point_size = new_size
+        self.cube_widget.commit_state()
         self.cube_widget.update()
 
 
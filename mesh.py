@@ -1,9 +1,15 @@
-# mesh.py  –  CPU-optimize & stable
+# mesh.py  –  CPU-optimize & stable (saf NumPy: GL bağlamı gerekmez)
 import numpy as np
-from OpenGL.GL import *
 from numba import njit            #  ← eklendi
-from OpenGL.GL import GL_POINTS, GL_TRIANGLES
-from math import radians, sin, cos
+
+# OpenGL enum değerleriyle aynı; Mesh GL’e bağımlı olmadan her iş
+# parçacığında kurulabilsin diye burada tanımlı (GPU tarafı: gpu_cache.py).
+GL_POINTS = 0x0000
+GL_TRIANGLES = 0x0004
+
+# Görüş-hacmi ayıklamasında sınır kutusu başına ardışık eleman
+# (üçgen veya nokta) sayısı; küçük mesh’ler tek kutu olur.
+CULL_CHUNK = 1 << 15
 
 # ----------------------------------------------------------------------
 # Numba JIT’li Sutherland–Hodgman clip
@@ -54,16 +60,25 @@ class Mesh:
                  colors: np.ndarray | None = None,
                  color: tuple = (0.8, 0.8, 0.8),
                  normals: np.ndarray | None = None,
-                 mesh_name: str | None = None):
+                 mesh_name: str | None = None,
+                 copy: bool = True):
 
         # ---------- CPU kopyaları ----------
-        self.vertices = vertices.astype(np.float32).copy()
-        self.indices = indices.astype(np.uint32).copy()
+        # copy=False → tür zaten uygunsa diziler kopyalanmadan sahiplenilir
+        # (paylaşımlı bellek / önbellek memmap’i; çağıran başka kullanmamalı)
+        own = (lambda a, t: a.astype(t).copy()) if copy else \
+              (lambda a, t: np.asarray(a, t))
+        self.vertices = own(vertices, np.float32)
+        self.indices = own(indices, np.uint32)
         self.index_count = self.indices.size
         self.draw_mode = GL_POINTS if self.index_count == 0 else GL_TRIANGLES
-        self.colors = colors.astype(np.float32).copy() if colors is not None else None
+        self.colors = own(colors, np.float32) if colors is not None else None
         self.color = color
-        self.vao = 0
+        # CPU verisi her değiştiğinde artar → önbellekler (ekran ızgarası vb.)
+        self.version = 0
+        # Silgi darbesi boyunca silinen üçgen / nokta maskesi (True = silindi).
+        # Diziler darbe bitene kadar küçültülmez → bkz. compact()
+        self.erase_mask = None
 
 
         # ---------- Normalleri üret ----------
@@ -83,28 +98,14 @@ class Mesh:
                 lens = np.linalg.norm(normals, axis=1)
                 mask = lens > 1e-8
                 normals[mask] /= lens[mask][:, None]
-        self.normals = normals.astype(np.float32)
-
-        # ---------- GPU tamponları ----------
-        self.vbo_v = glGenBuffers(1)
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_v)
-        glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW)
-
-        self.vbo_i = glGenBuffers(1)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.vbo_i)
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
-
-        self.vbo_c = None
-        if self.colors is not None:
-            self.vbo_c = glGenBuffers(1)
-            glBindBuffer(GL_ARRAY_BUFFER, self.vbo_c)
-            glBufferData(GL_ARRAY_BUFFER, self.colors.nbytes, self.colors, GL_STATIC_DRAW)
+        self.normals = np.asarray(normals, np.float32) if not copy \
+            else normals.astype(np.float32)
 
-        self.vbo_n = glGenBuffers(1)
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_n)
-        glBufferData(GL_ARRAY_BUFFER, self.normals.nbytes, self.normals, GL_STATIC_DRAW)
+        # GPU tamponları Mesh’te tutulmaz → GpuResourceCache (ilk çizimde)
 
         # ---------- Transform ----------
+        # Atamalar transform_version’ı artırır → model matrisi önbelleği
+        self.transform_version = 0
         self.translation = np.zeros(3, np.float32)
         self.scale = 1.0
         self.rotation = np.identity(4, np.float32)
@@ -112,24 +113,185 @@ class Mesh:
         self.name = mesh_name or f"Mesh_{id(self)}"
         # self.id  → Cube3DWidget atar
 
+    # ------------------------------------------------------------------
+    # Veri sürümü / türetilmiş önbellekler
+    # ------------------------------------------------------------------
+    def bump_version(self):
+        """vertices / indices / colors / normals değiştiğinde çağrılmalı."""
+        self.version += 1
+        self.__dict__.pop("_aabb_local", None)
+
+    def draw_parts(self):
+        """
+        GPU’ya ayrı yüklenen / ayrı ayıklanan birimler: [(mesh, eleman ofseti)].
+        Düz mesh’te kendisi; parçalı mesh → chunked_mesh.ChunkedMesh.
+        """
+        return ((self, 0),)
+
+    # ------------------------------------------------------------------
+    # Transform (özellik: atama → transform_version += 1)
+    # Yerinde güncelleme de (m.translation += d) setter’dan geçer.
+    # ------------------------------------------------------------------
+    @property
+    def translation(self):
+        return self._translation
+
+    @translation.setter
+    def translation(self, v):
+        self._translation = np.asarray(v, np.float32)
+        self.transform_version += 1
+
+    @property
+    def rotation(self):
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, v):
+        self._rotation = np.asarray(v, np.float32)
+        self.transform_version += 1
+
+    @property
+    def scale(self):
+        return self._scale
+
+    @scale.setter
+    def scale(self, v):
+        self._scale = v
+        self.transform_version += 1
+
+    def model_matrix(self) -> np.ndarray:
+        """
+        Yerel → dünya 4×4 (T·R·S, float64).  Transform değişene kadar
+        önbellekte; döndürülen dizi değiştirilmemeli.
+        """
+        cached = self.__dict__.get("_model_cache")
+        if cached is not None and cached[0] == self.transform_version:
+            return cached[1]
+        s = self._scale
+        sx, sy, sz = (s if isinstance(s, (list, tuple, np.ndarray)) else (s,) * 3)
+        R = self._rotation
+        M = np.identity(4)
+        M[:3, :3] = (R if R.shape == (3, 3) else R.reshape(4, 4)[:3, :3]) \
+            * np.array([sx, sy, sz], np.float64)           # R·S
+        M[:3, 3] = self._translation
+        self._model_cache = (self.transform_version, M)
+        return M
+
+    def __getstate__(self):
+        # Türetilmiş önbellekler (ekran ızgarası, komşuluk, BVH) kopyalanmaz;
+        # deepcopy/pickle sonrası ilk kullanımda yeniden üretilir.
+        state = self.__dict__.copy()
+        for key in ("_scr_grid", "_vtri", "_cull", "_bvh"):
+            state.pop(key, None)
+        return state
+
+    def vertex_triangles(self):
+        """
+        Vertex → üçgen komşuluğu (CSR).  Dönüş: (starts, tri_ids)
+        vertex v’ye değen üçgenler tri_ids[starts[v]:starts[v+1]].
+        Sürüm değişene kadar önbellekte tutulur.
+        """
+        cached = getattr(self, "_vtri", None)
+        if cached is not None and cached[0] == self.version:
+            return cached[1], cached[2]
+        order = np.argsort(self.indices, kind="stable")
+        tri_ids = (order // 3).astype(np.int64)
+        counts = np.bincount(self.indices, minlength=len(self.vertices))
+        starts = np.zeros(len(self.vertices) + 1, np.int64)
+        np.cumsum(counts, out=starts[1:])
+        self._vtri = (self.version, starts, tri_ids)
+        return starts, tri_ids
+
+    # ------------------------------------------------------------------
+    # Ertelenmiş silme (maske + sıkıştırma)
+    # ------------------------------------------------------------------
+    def _n_elems(self) -> int:
+        """Silgi / ID geçişi eleman sayısı: üçgen (mesh) veya nokta (bulut)."""
+        return (self.index_count // 3 if self.draw_mode == GL_TRIANGLES
+                else len(self.vertices))
+
+    def mark_erased(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Üçgen (mesh) veya nokta (bulut) id’lerini silindi olarak işaretler.
+        Dönüş: bu çağrıda YENİ silinen id’ler (sıralı).
+        """
+        if self.erase_mask is None:
+            self.erase_mask = np.zeros(self._n_elems(), bool)
+        ids = np.unique(ids)
+        ids = ids[~self.erase_mask[ids]]
+        self.erase_mask[ids] = True
+        return ids
+
+    def compact(self) -> bool:
+        """
+        Bekleyen silgi maskesini uygular: kullanılmayan verteksleri atar ve
+        indeksleri yeniden numaralar.  False → mesh tamamen boşaldı.
+        """
+        mask = self.erase_mask
+        self.erase_mask = None
+        if mask is None or not mask.any():
+            return True
+        if not (~mask).any():
+            return False
+
+        if self.draw_mode == GL_TRIANGLES and self.index_count:
+            keep_idx = self.indices.reshape(-1, 3)[~mask].ravel()
+            uniq, new_idx = np.unique(keep_idx, return_inverse=True)
+            self.indices = new_idx.astype(np.uint32)
+            self.index_count = self.indices.size
+        else:
+            uniq = ~mask
+
+        self.vertices = self.vertices[uniq]
+        if self.colors is not None:
+            self.colors = self.colors[uniq]
+        if self.normals is not None:
+            self.normals = self.normals[uniq]
+        self.bump_version()
+        return True
+
     # ------------------------------------------------------------------
     # Axis-aligned bounding box (world space)
     # ------------------------------------------------------------------
     def aabb_world(self):
+        """Dünya AABB’si; veri veya transform değişene kadar önbellekte."""
+        key = (self.version, self.transform_version)
+        cached = self.__dict__.get("_aabb_world")
+        if cached is not None and cached[0] == key:
+            return cached[1]
         if not hasattr(self, "_aabb_local"):
             self._aabb_local = (self.vertices.min(0), self.vertices.max(0))
         mn, mx = self._aabb_local
-        R = self.rotation[:3, :3] * self.scale
-        corners = (R @ np.array(
-            [[mn[0], mn[1], mn[2]],
-             [mx[0], mn[1], mn[2]],
-             [mn[0], mx[1], mn[2]],
-             [mx[0], mx[1], mn[2]],
-             [mn[0], mn[1], mx[2]],
-             [mx[0], mn[1], mx[2]],
-             [mn[0], mx[1], mx[2]],
-             [mx[0], mx[1], mx[2]]]).T).T + self.translation
-        return corners.min(0), corners.max(0)
+        M = self.model_matrix()
+        c = M[:3, :3] @ ((mn + mx) * 0.5) + M[:3, 3]
+        e = np.abs(M[:3, :3]) @ ((mx - mn) * 0.5)
+        box = (c - e, c + e)
+        self._aabb_world = (key, box)
+        return box
+
+    def cull_chunks(self):
+        """
+        Görüş-hacmi ayıklaması için CULL_CHUNK’lık ardışık eleman blokları.
+        Dönüş: (n_elem, mn (K,3), mx (K,3)) – yerel uzay; eleman üçgen
+        (mesh) veya nokta (bulut).  Sürüm değişene kadar önbellekte.
+        """
+        cached = self.__dict__.get("_cull")
+        if cached is not None and cached[0] == self.version:
+            return cached[1:]
+        if self.draw_mode == GL_TRIANGLES and self.index_count:
+            tri = self.vertices[self.indices].reshape(-1, 3, 3)
+            e_mn, e_mx = tri.min(1), tri.max(1)
+        else:
+            e_mn = e_mx = self.vertices
+        n = len(e_mn)
+        if n == 0:
+            mn = mx = np.empty((0, 3), np.float32)
+        else:
+            starts = np.arange(0, n, CULL_CHUNK)
+            mn = np.minimum.reduceat(e_mn, starts, axis=0)
+            mx = np.maximum.reduceat(e_mx, starts, axis=0)
+        self._cull = (self.version, n, mn, mx)
+        return n, mn, mx
 
     # ------------------------------------------------------------------
     # Kesme işlemi (CPU, hızlı)
@@ -137,8 +299,7 @@ class Mesh:
     def cut_by_plane(self,
                      n: np.ndarray,          # dünya uzayı normali
                      d: float,               # world denklem sabiti
-                     progress_callback=None,
-                     flush_gpu=True) -> bool:
+                     progress_callback=None) -> bool:
         """
         n·p + d = 0 düzlemiyle mesh’i ikiye böler.  Pozitif yarı tutulur.
         True dönerse kesim sonrası üçgen kaldı.
@@ -212,6 +373,7 @@ class Mesh:
         self.index_count = self.indices.size
         if new_C is not None:
             self.colors = np.asarray(new_C, np.float32)
+        self.bump_version()
 
         # 6) Normalleri tek geçişte hesapla
         normals = np.zeros_like(self.vertices)
@@ -229,95 +391,4 @@ class Mesh:
         normals[mask] /= lens[mask][:, None]  # ← broadcast
         self.normals = normals.astype(np.float32)
 
-        # 7) GPU tamponlarını istersek tazele
-        if flush_gpu:
-            glBindBuffer(GL_ARRAY_BUFFER, self.vbo_v)
-            glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW)
-
-            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.vbo_i)
-            glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
-
-            if self.colors is not None:
-                if self.vbo_c is None:
-                    self.vbo_c = glGenBuffers(1)
-                glBindBuffer(GL_ARRAY_BUFFER, self.vbo_c)
-                glBufferData(GL_ARRAY_BUFFER, self.colors.nbytes, self.colors, GL_STATIC_DRAW)
-
-            glBindBuffer(GL_ARRAY_BUFFER, self.vbo_n)
-            glBufferData(GL_ARRAY_BUFFER, self.normals.nbytes, self.normals, GL_STATIC_DRAW)
-
         return True
-
-    def _update_gpu(self):
-        """
-        vertices / colors / normals / indices dizilerindeki son
-        değişiklikleri mevcut VBO’lara kopyalar.
-        """
-        import numpy as np
-        from OpenGL.GL import (
-            glBindBuffer, glBufferData,
-            GL_ARRAY_BUFFER, GL_ELEMENT_ARRAY_BUFFER, GL_STATIC_DRAW
-        )
-
-        # --- vertex pozisyonu ------------------------------------------------
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_v)
-        glBufferData(GL_ARRAY_BUFFER,
-                     self.vertices.astype(np.float32).nbytes,
-                     self.vertices.astype(np.float32),
-                     GL_STATIC_DRAW)
-
-        # --- renk ------------------------------------------------------------
-        if getattr(self, "vbo_c", 0) and getattr(self, "colors", None) is not None:
-            glBindBuffer(GL_ARRAY_BUFFER, self.vbo_c)
-            glBufferData(GL_ARRAY_BUFFER,
-                         self.colors.astype(np.float32).nbytes,
-                         self.colors.astype(np.float32),
-                         GL_STATIC_DRAW)
-
-        # --- normal ----------------------------------------------------------
-        if getattr(self, "vbo_n", 0) and getattr(self, "normals", None) is not None:
-            glBindBuffer(GL_ARRAY_BUFFER, self.vbo_n)
-            glBufferData(GL_ARRAY_BUFFER,
-                         self.normals.astype(np.float32).nbytes,
-                         self.normals.astype(np.float32),
-                         GL_STATIC_DRAW)
-
-        # --- indeks ----------------------------------------------------------
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.vbo_i)
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER,
-                     self.indices.astype(np.uint32).nbytes,
-                     self.indices.astype(np.uint32),
-                     GL_STATIC_DRAW)
-
-    def update_buffers(self):
-
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_v)
-        glBufferData(GL_ARRAY_BUFFER,
-                     self.vertices.astype(np.float32).nbytes,
-                     self.vertices.astype(np.float32),
-                     GL_STATIC_DRAW)
-
-        if getattr(self, "vbo_c", None) and self.colors is not None:
-            glBindBuffer(GL_ARRAY_BUFFER, self.vbo_c)
-            glBufferData(GL_ARRAY_BUFFER,
-                         self.colors.astype(np.float32).nbytes,
-                         self.colors.astype(np.float32),
-                         GL_STATIC_DRAW)
-
-    def model_matrix(self) -> np.ndarray:
-        sx, sy, sz = self.scale, self.scale, self.scale
-        rx, ry, rz = map(radians, self.rotation)  # deg→rad
-        cx, sx_ = cos(rx), sin(rx)
-        cy, sy_ = cos(ry), sin(ry)
-        cz, sz_ = cos(rz), sin(rz)
-
-        R = np.array([
-            [cy * cz, -cy * sz_, sy_, 0],
-            [sx_ * sy_ * cz + cx * sz_, -sx_ * sy_ * sz_ + cx * cz, -sx_ * cy, 0],
-            [-cx * sy_ * cz + sx_ * sz_, cx * sy_ * sz_ + sx_ * cz, cx * cy, 0],
-            [0, 0, 0, 1]
-        ], dtype=np.float32)
-        S = np.diag([sx, sy, sz, 1])
-        T = np.eye(4, dtype=np.float32);
-        T[0:3, 3] = self.translation
-        return T @ R @ S  # T·R·S
\ No newline at end of file
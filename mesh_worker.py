@@ -0,0 +1,36 @@
+# mesh_worker.py  –  GL gerektirmeyen mesh işlerini arka planda çalıştırır
+import traceback
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class MeshTaskWorker(QThread):
+    """
+    fn(progress_callback, stop_flag) → sonuç.  Sonuç GUI iş parçacığına
+    result_signal ile döner (stop() çağrıldıysa gönderilmez).
+
+    Mesh saf NumPy olduğundan OBJ okuma, kesme ve normal hesabı GL bağlamı
+    olmadan burada yapılır; GPU’ya yükleme ilk çizimde GpuResourceCache’te.
+    """
+    progress_signal = pyqtSignal(int)
+    result_signal = pyqtSignal(object)
+    failed_signal = pyqtSignal(str)
+
+    def __init__(self, fn, parent=None):
+        super().__init__(parent)
+        self.fn = fn
+        self.stop_requested = False
+
+    def stop(self):
+        self.stop_requested = True
+
+    def run(self):
+        try:
+            result = self.fn(self.progress_signal.emit,
+                             lambda: self.stop_requested)
+        except Exception as e:
+            traceback.print_exc()
+            self.failed_signal.emit(str(e))
+            return
+        if not self.stop_requested:
+            self.result_signal.emit(result)
@@ -0,0 +1,241 @@
+# model_generation.py
+"""
+Dilim klasörü → mesh / nokta bulutu dönüşümünün Qt’siz çekirdeği.
+
+ModelGenerationWorker (GUI, child_main ile ayrı süreçte) ve
+batch_convert.py (komut satırı) aynı fonksiyonları kullanır; burada ekran,
+sinyal ya da iş parçacığı yoktur.  İlerleme progress_callback(int 0-100)
+ile, iptal stop_flag() ile verilir.
+
+    from model_generation import convert_folder
+    info = convert_folder("MRHead_Slices", "out/head.obj",
+                          threshold=90, render_mode="mesh")
+"""
+import os
+import time
+import traceback
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from volume_loader import load_volume, iter_volume_slabs, list_slices
+from generation_cache import KEY_PARAMS, cache_key
+
+# Bu voksel sayısının üstünde yüzey blok blok çıkarılır (≈ 256×256×512)
+STREAM_SURFACE_VOXELS = 256 * 256 * 512
+
+# Varsayılan üretim parametreleri (GUI diyaloğunun varsayılanları)
+DEFAULTS = {
+    "scale_factor": 0.5,
+    "z_increment": 0.5,
+    "threshold": 100,
+    "resolution": (256, 256),
+    "noise_method": "Yok",
+    "render_mode": "mesh",
+}
+
+
+def available_memory():
+    """Boş (kullanılabilir) fiziksel bellek, bayt; bilinmiyorsa None."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def generate_model(slice_folder, scale_factor, z_increment, threshold,
+                   resolution, render_mode="mesh", noise_method=None,
+                   progress_callback=None, stop_flag=lambda: False):
+    """
+    Dilimleri oku → yüzey (marching-cubes) veya nokta bulutu çıkar.
+    ------------------------------------------------------------------
+    Dönüş: verts(N,3), faces(M,3 uint32), colors(N,3), normals(N,3)|None
+           İptal edilirse None.
+    """
+    emit = progress_callback or (lambda p: None)
+    emit(0)
+
+    if render_mode == "point":
+        # Nokta bulutu: dilimler bloklar halinde okunup geldikçe işlenir
+        # → tam hacim (float32 + maske) hiç kurulmaz
+        from point_cloud_extractor import stream_point_cloud
+        verts, vcols, vnrms = stream_point_cloud(
+            iter_volume_slabs(slice_folder, resolution, stop_flag=stop_flag),
+            threshold=threshold,
+            scale_factor=scale_factor,
+            z_increment=z_increment,
+            # 2×2 piksellik hücrede konum + renk ortalaması
+            # (diğer kipler: "random", "poisson", target_points)
+            mode="voxel", voxel_size=2 * scale_factor,
+            # görünmeyen iç vokseller yok; gradyan normali → ışıklı
+            shell=True, with_normals=True,
+            depth=len(list_slices(slice_folder)),
+            progress_callback=emit, base_progress=0, weight=90,
+            stop_flag=stop_flag
+        )
+        if verts is None or stop_flag():
+            return None
+        faces = np.empty((0, 3), np.uint32)  # nokta bulutu → yüzey yok
+        return verts, faces, vcols, vnrms
+
+    # 1) Hacmi yükle ---------------------------------------------------------------------
+    volume, color_vol = load_volume(slice_folder, resolution,
+                                    stop_flag=stop_flag,
+                                    progress_callback=emit, weight=40)
+    if volume is None or stop_flag():
+        return None
+
+    # 2) Çıkarılacak marching-cubes fonksiyonunu seç -------------------------------------
+    from surface_extractor import extract_surface, stream_extract_surface
+    big = volume.size > STREAM_SURFACE_VOXELS
+    surf_fn = stream_extract_surface if big else extract_surface
+    verts, faces, vcols = surf_fn(
+        volume, color_vol, threshold, scale_factor, z_increment,
+        progress_callback=emit, base_progress=40, weight=60,
+        stop_flag=stop_flag
+    )
+    if verts is None or stop_flag():
+        return None
+    return verts, faces, vcols, None  # üçgen mesh: normaller yüzlerden
+
+
+def write_obj(path, verts, faces, colors):
+    """Köşe renkli OBJ (v x y z r g b / f a b c, 1 tabanlı)."""
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    with open(path, 'w') as f:
+        if len(verts):
+            np.savetxt(f, np.hstack((verts, colors)),
+                       fmt='v %.4f %.4f %.4f %.4f %.4f %.4f')
+        if len(faces):
+            np.savetxt(f, np.asarray(faces, np.int64) + 1, fmt='f %d %d %d')
+
+
+def convert_folder(slice_folder, output_path, progress_callback=None,
+                   stop_flag=lambda: False, cache=None, **params):
+    """
+    generate_model + write_obj.  params: DEFAULTS anahtarları.
+    cache: GenerationCache – aynı veri + parametre daha önce üretildiyse
+    diziler oradan okunur, değilse sonuç oraya yazılır.
+    Dönüş: {"output", "vertices", "faces", "seconds", "cached"} ya da
+    iptalde None.
+    """
+    p = dict(DEFAULTS, **params)
+    t0 = time.perf_counter()
+    key = cache_key(slice_folder, p) if cache is not None else None
+    arrays = cache.get(key) if key else None
+    hit = arrays is not None
+    if not hit:
+        res = generate_model(slice_folder, p["scale_factor"], p["z_increment"],
+                             p["threshold"], p["resolution"], p["render_mode"],
+                             p["noise_method"], progress_callback, stop_flag)
+        if res is None:
+            return None
+        arrays = dict(zip(("verts", "faces", "colors", "normals"), res))
+        if key:
+            cache.put(key, arrays, cache_meta(slice_folder, output_path, p))
+    write_obj(output_path, arrays["verts"], arrays["faces"], arrays["colors"])
+    if progress_callback:
+        progress_callback(100)
+    return {"output": output_path, "vertices": int(len(arrays["verts"])),
+            "faces": int(len(arrays["faces"])),
+            "seconds": round(time.perf_counter() - t0, 3),
+            "cached": hit}
+
+
+def cache_meta(slice_folder, output_path, params):
+    """Önbellek girdisinin arayüzde gösterilen açıklaması."""
+    return {"folder": os.path.abspath(slice_folder),
+            "name": os.path.splitext(os.path.basename(output_path))[0],
+            "params": {k: params.get(k) for k in KEY_PARAMS}}
+
+
+# ----------------------------------------------------------------------
+# Alt süreçte üretim: sonuç dizileri paylaşımlı bellekle döner
+# ----------------------------------------------------------------------
+def _share_array(arr):
+    """
+    Diziyi yeni bir SharedMemory bloğuna koyar → (shm, spec).  Blok ana
+    sürece devredilir: bu sürecin resource_tracker’ı onu sahiplenmez
+    (aksi halde çıkışta “sızıntı” diye silerdi).
+    """
+    arr = np.ascontiguousarray(arr)
+    if not arr.nbytes:
+        return None, (None, arr.shape, arr.dtype.str)
+    shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def attach_array(spec):
+    """
+    spec → paylaşımlı belleğe bakan dizi (kopya yok).  Blok adı hemen
+    silinir (POSIX); eşleme dizi ve görünümleri yaşadıkça kalır.
+    """
+    name, shape, dtype = spec
+    if name is None:
+        return np.empty(shape, dtype)
+    shm = shared_memory.SharedMemory(name=name)
+    arr = np.ndarray(shape, dtype, buffer=shm.buf)
+    weakref.finalize(arr, shm.close)
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+    return arr
+
+
+def child_main(conn, slice_folder, output_path, params):
+    """
+    Alt süreç girişi (spawn).  conn üzerinden gönderilen mesajlar:
+        ("progress", int)  ·  ("result", {ad: spec})  ·  ("error", str)
+    Sonuç gönderildikten sonra ana sürecin "ack"ı beklenir (Windows’ta
+    blok son tutamaç kapanınca yok olur).  İptal: süreç sonlandırılır.
+    """
+    last = [-1]
+
+    def progress(p):
+        if p != last[0]:
+            last[0] = p
+            conn.send(("progress", int(p)))
+
+    shms = []
+    try:
+        p = dict(DEFAULTS, **params)
+        res = generate_model(slice_folder, p["scale_factor"], p["z_increment"],
+                             p["threshold"], p["resolution"], p["render_mode"],
+                             p["noise_method"], progress)
+        verts, faces, colors, normals = res
+        write_obj(output_path, verts, faces, colors)
+        specs = {}
+        for key, arr in (("verts", verts), ("faces", faces),
+                         ("colors", colors), ("normals", normals)):
+            if arr is not None:
+                shm, specs[key] = _share_array(arr)
+                if shm is not None:
+                    shms.append(shm)
+        del res, verts, faces, colors, normals
+        conn.send(("result", specs))
+        conn.recv()
+    except (EOFError, BrokenPipeError):
+        pass  # ana süreç gitti
+    except Exception:
+        conn.send(("error", traceback.format_exc(limit=4)))
+    finally:
+        for shm in shms:
+            shm.close()
+        conn.close()
@@ -1,20 +1,34 @@
 import os
-import numpy as np
+import sys
+import multiprocessing as mp
 from PyQt5.QtCore import QThread, pyqtSignal
 
-from volume_loader import load_volume
-from surface_extractor import extract_surface
-from point_cloud_extractor import extract_point_cloud
+from model_generation import child_main, attach_array, write_obj, cache_meta
+from generation_cache import default_cache, cache_key
+from obj_loader import meshes_from_arrays
 
 class ModelGenerationWorker(QThread):
+    """
+    Üretim ayrı bir süreçte (model_generation.child_main) çalışır: NumPy /
+    skimage işi arayüzle GIL için yarışmaz, marching-cubes’taki çökme ya da
+    bellek taşması yalnızca alt süreci öldürür.  Bu iş parçacığı kanalı
+    dinler (ilerleme, hata, sonuç); sonuç dizileri paylaşımlı bellekten
+    kopyasız bağlanır ve tek parçalı Mesh’e kopyasız devredilir (verteksler
+    yerinde merkezlenir).  Parçalı (ChunkedMesh) ve octree’li büyük
+    sonuçlar parçalarını kurarken yine kopyalar.  stop() süreci hemen
+    sonlandırır.
+
+    use_cache → aynı dilimler + parametreler daha önce üretildiyse süreç
+    hiç başlatılmaz, diziler generation_cache’ten okunur (cache_hit).
+    """
     progress_signal = pyqtSignal(int)
     finished_signal = pyqtSignal(str, float)
 
     def __init__(self, slice_folder, output_path,
                  scale_factor, z_increment,
                  threshold, resolution, noise_method,
-                 render_mode, point_size):
-        super().__init__()
+                 render_mode, point_size, parent=None):
+        super().__init__(parent)
         self.slice_folder = slice_folder
         self.output_path = output_path
         self.scale_factor = scale_factor
@@ -25,58 +39,100 @@ class ModelGenerationWorker(QThread):
         self.stop_requested = False
         self.render_mode = render_mode
         self.point_size = point_size
+        # Sahneye eklenmeye hazır Mesh’ler (saf NumPy → bu iş parçacığında
+        # kurulur; GUI yalnızca add_meshes ile ekler, OBJ’yi yeniden okumaz)
+        self.meshes = None
+        self.error = ""
+        self._proc = None
+        self.use_cache = True
+        self.cache_hit = False
 
     def stop(self):
         self.stop_requested = True
+        proc = self._proc
+        if proc is not None and proc.is_alive():
+            proc.terminate()  # aşama arası stop_flag beklenmez
 
-    def run(self):
-        """Dilimleri oku → marching-cubes → OBJ yaz ve bitti sinyali gönder."""
-        self.progress_signal.emit(0)
-
-        # 1) Hacmi yükle -----------------------------------------------------------------
-        volume, color_vol = load_volume(
-            self.slice_folder, self.resolution,
-            stop_flag=lambda: self.stop_requested,
-            progress_callback=self.progress_signal.emit,
-            weight=40
-        )
-        if volume is None or self.stop_requested:
-            self.finished_signal.emit('')
-            return
+    def params(self):
+        """Üretimi (ve önbellek anahtarını) belirleyen parametreler."""
+        return dict(scale_factor=self.scale_factor,
+                    z_increment=self.z_increment,
+                    threshold=self.threshold,
+                    resolution=self.resolution,
+                    noise_method=self.noise_method,
+                    render_mode=self.render_mode)
 
-        # 2) Çıkarılacak marching-cubes fonksiyonunu seç ---------------------------------
-        from surface_extractor import extract_surface, stream_extract_surface
-        voxels = volume.size
-        big = voxels > 256 * 256 * 512  # ≈ > 32 M voxel
-        surf_fn = stream_extract_surface if big else extract_surface
+    def _run_child(self, params):
+        """Alt süreci başlat, mesajları işle → {ad: dizi} veya None."""
+        ctx = mp.get_context("spawn")  # Qt/GL iş parçacıklı süreçte fork güvensiz
+        conn, child_conn = ctx.Pipe()
+        self._proc = proc = ctx.Process(
+            target=child_main, daemon=True,
+            args=(child_conn, self.slice_folder, self.output_path, params))
+        proc.start()
+        child_conn.close()
+        if self.stop_requested:  # start() sırasında iptal geldiyse
+            proc.terminate()
+        try:
+            while not self.stop_requested:
+                if not conn.poll(0.1):
+                    continue
+                try:
+                    kind, payload = conn.recv()
+                except EOFError:  # süreç mesajsız öldü (çökme / OOM)
+                    proc.join(1.0)
+                    self.error = (f"üretim süreci beklenmedik şekilde sonlandı"
+                                  f" (çıkış kodu {proc.exitcode})")
+                    return None
+                if kind == "progress":
+                    self.progress_signal.emit(payload)
+                elif kind == "error":
+                    self.error = payload.strip().splitlines()[-1]
+                    print(payload, end="", file=sys.stderr)
+                    return None
+                elif kind == "result":
+                    arrays = {k: attach_array(v) for k, v in payload.items()}
+                    conn.send("ack")
+                    return arrays
+            return None
+        finally:
+            if proc.is_alive() and self.stop_requested:
+                proc.terminate()
+            proc.join(5.0)
+            conn.close()
+            self._proc = None
 
-        if self.render_mode == 'point':
-            from point_cloud_extractor import extract_point_cloud
-            verts, vcols = extract_point_cloud(
-                volume, color_vol,
-                threshold=self.threshold,
-                scale_factor=self.scale_factor,
-                z_increment=self.z_increment,
-                step=2  # ister 1,2,3 değiştir
-            )
-            faces = np.empty((0, 3), np.uint32)  # nokta bulutu → yüzey yok
+    def run(self):
+        """Alt süreçte dilimleri oku → çıkar → OBJ yaz; Mesh’leri burada kur."""
+        self.progress_signal.emit(0)
+        params = self.params()
+        cache = key = arrays = None
+        if self.use_cache:
+            cache = default_cache()
+            try:
+                key = cache_key(self.slice_folder, params)
+                arrays = cache.get(key)
+            except OSError as e:
+                print(f"[cache] {e}", file=sys.stderr)
+        if arrays is not None:  # isabet: OBJ yine istenen yola yazılır
+            self.cache_hit = True
+            write_obj(self.output_path, arrays["verts"], arrays["faces"],
+                      arrays["colors"])
         else:
-            verts, faces, vcols = surf_fn(
-                volume, color_vol, self.threshold,
-                self.scale_factor, self.z_increment,
-                progress_callback=self.progress_signal.emit,
-                base_progress=40, weight=60,
-                stop_flag=lambda: self.stop_requested
-            )
-
-        # 4) OBJ dosyasını yaz ------------------------------------------------------------
-        with open(self.output_path, 'w') as f:
-            for (x, y, z), (r, g, b) in zip(verts, vcols):
-                f.write(f'v {x:.4f} {y:.4f} {z:.4f} {r:.4f} {g:.4f} {b:.4f}\n')
-            for a, b_, c_ in (faces + 1) if faces.size else []:
-                f.write(f'f {a} {b_} {c_}\n')
+            arrays = self._run_child(params)
+            if arrays is None or self.stop_requested:
+                self.finished_signal.emit('', 0.0)
+                return
+            if key is not None:
+                cache.put(key, arrays,
+                          cache_meta(self.slice_folder, self.output_path, params))
 
+        # Mesh’leri (normaller dahil) paylaşımlı bellekteki dizilerle kur -------------
+        # OBJ ve önbellek yazıldı → diziler Mesh’e kopyasız devredilir
+        self.meshes = meshes_from_arrays(
+            arrays["verts"], arrays["faces"], arrays["colors"],
+            os.path.basename(self.output_path),
+            normals=arrays.get("normals"), adopt=True)
 
         self.progress_signal.emit(100)
         self.finished_signal.emit(self.output_path,self.point_size)
-
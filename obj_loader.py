@@ -0,0 +1,154 @@
+# obj_loader.py  –  OBJ → Mesh listesi (GL’siz; her iş parçacığında çalışır)
+import os
+import re
+from collections import defaultdict
+
+import numpy as np
+
+from mesh import GL_POINTS
+from chunked_mesh import build_mesh
+from point_octree import OCTREE_MIN_POINTS, build_point_cloud
+
+
+def _parse_mtl(mtl_path: str) -> dict[str, tuple[float, float, float]]:
+    """
+    .mtl dosyasındaki   newmtl <name> / Kd r g b   satırlarını     (0-1 veya 0-255)
+    okur ve  {name: (r,g,b)} sözlüğü döndürür.
+    """
+    if not os.path.isfile(mtl_path):
+        return {}
+
+    mats, current = {}, None
+    with open(mtl_path, "r", errors="ignore") as f:
+        for line in f:
+            if line.startswith("newmtl "):
+                current = line.split(maxsplit=1)[1].strip()
+            elif current and line.startswith("Kd "):
+                r, g, b = map(float, line.split()[1:4])
+                if max(r, g, b) > 1.0:  # 0-255 ise ölçekle
+                    r, g, b = r / 255.0, g / 255.0, b / 255.0
+                mats[current] = (r, g, b)
+    return mats
+
+
+def meshes_from_arrays(verts, faces, colors, name,
+                       faces_by_mat=None, mtl_colors=None, normals=None,
+                       adopt=False):
+    """
+    Hazır dizilerden sahneye eklenecek Mesh listesi.  load_obj ile aynı
+    kurallar: merkez orijine alınır, yüz yoksa tek nokta bulutu
+    (OCTREE_MIN_POINTS’ten büyükse diskte octree’li).
+    faces_by_mat verilirse her malzeme ayrı Mesh olur.  normals yalnızca
+    nokta bulutunda kullanılır (üçgen mesh’te yüzlerden hesaplanır).
+
+    adopt=True → diziler çağıranın değil artık Mesh’indir: verteksler
+    yerinde merkezlenir ve tek Mesh’e kopyasız verilir (paylaşımlı bellek
+    / önbellek memmap’i).  Parçalı (ChunkedMesh) ve çok malzemeli
+    mesh’ler parçalarını yine kendileri kurar.
+    """
+    verts = np.asarray(verts, np.float32)
+    if adopt and verts.flags.writeable:
+        verts -= verts.mean(0)
+    else:
+        verts = verts - verts.mean(0)
+    mtl_colors = mtl_colors or {}
+
+    if faces_by_mat is None:
+        faces = np.asarray(faces, np.uint32).reshape(-1, 3)
+        faces_by_mat = {None: faces} if len(faces) else {}
+
+    if not faces_by_mat and len(verts) > OCTREE_MIN_POINTS:
+        return [build_point_cloud(verts, colors, name + "_pts",
+                                  normals=normals)]
+    if not faces_by_mat:
+        m = build_mesh(verts,
+                       indices=np.empty(0, np.uint32),  # yüzey yok
+                       colors=colors,
+                       normals=normals,
+                       color=(0.8, 0.8, 0.8),           # varsayılan tek renk
+                       mesh_name=name + "_pts",
+                       copy=not adopt)
+        m.draw_mode = GL_POINTS  # güvence
+        return [m]
+
+    # birden çok malzeme aynı verteksleri paylaşır → her Mesh kendi kopyası
+    adopt = adopt and len(faces_by_mat) == 1
+    out = []
+    for mat, tris in faces_by_mat.items():
+        v_idx = np.asarray(tris, np.uint32).ravel()
+        out.append(build_mesh(verts, v_idx,
+                              colors=colors,
+                              color=mtl_colors.get(mat, (0.8, 0.8, 0.8)),
+                              mesh_name=f"{name}_{mat or 'def'}",
+                              copy=not adopt))
+    return out
+
+
+def load_obj_meshes(fn: str, progress_callback=None, stop_flag=None):
+    """
+    HIZLI OBJ okuyucu → [Mesh]  (GL çağrısı yok; arka planda çalışabilir)
+      •   read() → tek pass; NumPy ile vertex/faces çıkarımı
+      •   "f" satırlarındaki n-gon'ları tek seferde üçgen fana açar
+      •   Vertex-renk yoksa MTL renklerini korur
+    stop_flag() True dönerse None döner.
+    """
+    def _progress(p):
+        if progress_callback:
+            progress_callback(int(p))
+
+    txt = open(fn, "r", errors="ignore").read().splitlines()
+    _progress(10)
+
+    v_lines = [l for l in txt if l.startswith("v ")]
+    f_lines = [l for l in txt if l.startswith("f ")]
+    usemtl = np.array([i for i, l in enumerate(txt) if l.startswith("usemtl")])
+    mtl_of_line = {}
+    for i in range(len(usemtl)):
+        start = usemtl[i]
+        end = usemtl[i + 1] if i + 1 < len(usemtl) else len(txt)
+        mat = txt[start].split()[1]
+        for ln in range(start + 1, end):
+            mtl_of_line[ln] = mat
+
+    # ---------- Vertex pozisyonları (r g b varsa al) ----------
+    verts = np.empty((len(v_lines), 3), np.float32)
+    vcols = np.empty((len(v_lines), 3), np.float32)
+    has_col = False
+    for i, l in enumerate(v_lines):
+        vals = list(map(float, l.split()[1:]))
+        verts[i] = vals[:3]
+        if len(vals) >= 6:
+            vcols[i] = vals[3:6]
+            has_col = True
+    c_arr = vcols if has_col else None
+    _progress(50)
+    if stop_flag and stop_flag():
+        return None
+
+    # ---------- Faces → tek pass triangülasyon ----------
+    faces_by_mat = defaultdict(list)
+    for ln, l in enumerate(f_lines):
+        idx = [int(tok.split("/")[0]) - 1 for tok in l.split()[1:]]
+        if len(idx) < 3:
+            continue
+        # fan
+        base = idx[0]
+        tris = [[base, idx[i], idx[i + 1]] for i in range(1, len(idx) - 1)]
+        faces_by_mat[mtl_of_line.get(ln, None)].extend(tris)
+    _progress(80)
+    if stop_flag and stop_flag():
+        return None
+
+    # ---------- .mtl renklerini yükle ----------
+    mtl_colors = {}
+    mtl_match = re.search(r"mtllib +(\S+)", "\n".join(txt))
+    if mtl_match and faces_by_mat:
+        mtl_path = os.path.join(os.path.dirname(fn), mtl_match.group(1))
+        mtl_colors = _parse_mtl(mtl_path)
+
+    # ---------- Mesh'leri oluştur (normaller burada hesaplanır) ----------
+    meshes = meshes_from_arrays(verts, None, c_arr, os.path.basename(fn),
+                                faces_by_mat=dict(faces_by_mat),
+                                mtl_colors=mtl_colors)
+    _progress(100)
+    return meshes
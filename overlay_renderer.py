@@ -0,0 +1,222 @@
+# overlay_renderer.py  –  shader tabanlı sonsuz ızgara + VBO’lu kaplamalar
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+from shader_utils import build_program
+
+# ----------------------------------------------------------------------
+# Izgara: tam ekran dörtgen, çizgiler parça gölgelendiricide hesaplanır
+# ----------------------------------------------------------------------
+_GRID_VSRC = """
+#version 120
+attribute vec2 a_pos;             // NDC köşe
+uniform mat4 u_inv_vp;
+varying vec3 v_near;
+varying vec3 v_far;
+
+vec3 unproject(vec3 ndc){
+    vec4 p = u_inv_vp * vec4(ndc, 1.0);
+    return p.xyz / p.w;
+}
+void main(){
+    v_near = unproject(vec3(a_pos, -1.0));
+    v_far  = unproject(vec3(a_pos,  1.0));
+    gl_Position = vec4(a_pos, 0.0, 1.0);
+}"""
+
+_GRID_FSRC = """
+#version 120
+uniform mat4  u_vp;
+uniform int   u_axis;             // düzlem normali: 0=X (YZ) 1=Y (XZ) 2=Z (XY)
+uniform float u_spacing;
+uniform float u_extent;           // |koordinat| sınırı (eski half_count·spacing)
+uniform vec3  u_color;
+varying vec3 v_near;
+varying vec3 v_far;
+
+void main(){
+    vec3 d = v_far - v_near;
+    float dn = u_axis == 0 ? d.x : (u_axis == 1 ? d.y : d.z);
+    float on = u_axis == 0 ? v_near.x : (u_axis == 1 ? v_near.y : v_near.z);
+    if (abs(dn) < 1e-8) discard;
+    float t = -on / dn;
+    if (t < 0.0 || t > 1.0) discard;
+
+    vec3 p  = v_near + t * d;
+    vec2 uv = u_axis == 0 ? p.yz : (u_axis == 1 ? p.xz : p.xy);
+    if (max(abs(uv.x), abs(uv.y)) > u_extent) discard;
+
+    // çizgiye piksel cinsinden uzaklık → 1 px kenar yumuşatma
+    vec2 g = uv / u_spacing;
+    vec2 a = abs(fract(g - 0.5) - 0.5) / max(fwidth(g), vec2(1e-6));
+    float line = 1.0 - min(min(a.x, a.y), 1.0);
+    if (line <= 0.0) discard;
+
+    vec4 clip = u_vp * vec4(p, 1.0);
+    gl_FragDepth = clip.z / clip.w * 0.5 + 0.5;
+    gl_FragColor = vec4(u_color, line);
+}"""
+
+# ----------------------------------------------------------------------
+# Kaplamalar (eksen, silgi dairesi, kesme çizgisi): düz renk
+# ----------------------------------------------------------------------
+_FLAT_VSRC = """
+#version 120
+attribute vec3 a_pos;
+attribute vec3 a_col;
+uniform mat4 u_mvp;
+varying vec3 v_col;
+void main(){
+    v_col = a_col;
+    gl_Position = u_mvp * vec4(a_pos, 1.0);
+}"""
+
+_FLAT_FSRC = """
+#version 120
+varying vec3 v_col;
+void main(){
+    gl_FragColor = vec4(v_col, 1.0);
+}"""
+
+_GRID_PLANES = {'xy': (2,), 'xz': (1,), 'yz': (0,), 'all': (2, 1, 0)}
+_CIRCLE_SEGS = 64
+
+
+def ortho(left, right, bottom, top, near=-1.0, far=1.0) -> np.ndarray:
+    """glOrtho eşdeğeri (satır-öncelikli 4×4)."""
+    M = np.identity(4, np.float32)
+    M[0, 0] = 2.0 / (right - left)
+    M[1, 1] = 2.0 / (top - bottom)
+    M[2, 2] = -2.0 / (far - near)
+    M[:3, 3] = (-(right + left) / (right - left),
+                -(top + bottom) / (top - bottom),
+                -(far + near) / (far - near))
+    return M
+
+
+class OverlayRenderer:
+    """
+    Kare başına Python’da çizgi döngüsü yoktur:
+      • ızgara  → düzlem başına tek tam ekran dörtgen (gl_FragDepth yazar,
+                  mesh’lerle doğru örtüşür)
+      • eksen   → önbellekli 6 köşe VBO (yalnızca uzunluk değişince yeniden)
+      • daire   → birim çember VBO; konum / yarıçap matriste
+      • kesme   → 2 köşe VBO; uçlar değişince glBufferSubData
+    Bağlam (makeCurrent) çağırana aittir.
+    """
+
+    def __init__(self):
+        self.grid_prog = build_program(_GRID_VSRC, _GRID_FSRC)
+        self.u_grid = {n: glGetUniformLocation(self.grid_prog, n)
+                       for n in ("u_inv_vp", "u_vp", "u_axis", "u_spacing",
+                                 "u_extent", "u_color")}
+        self.flat_prog = build_program(_FLAT_VSRC, _FLAT_FSRC)
+        self.u_mvp = glGetUniformLocation(self.flat_prog, "u_mvp")
+
+        quad = np.array([[-1, -1], [1, -1], [-1, 1], [1, 1]], np.float32)
+        self.vbo_quad = self._static(quad)
+
+        a = 2 * np.pi * np.arange(_CIRCLE_SEGS) / _CIRCLE_SEGS
+        circle = np.c_[np.cos(a), np.sin(a), np.zeros_like(a)].astype(np.float32)
+        self.vbo_circle = self._static(circle)
+
+        self.vbo_axis = glGenBuffers(1)
+        self._axis_len = None
+        self.vbo_line = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_line)
+        glBufferData(GL_ARRAY_BUFFER, 2 * 3 * 4, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self._line_key = None
+
+    @staticmethod
+    def _static(data):
+        buf = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, buf)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        return buf
+
+    def release(self):
+        glDeleteBuffers(4, [self.vbo_quad, self.vbo_circle,
+                            self.vbo_axis, self.vbo_line])
+        glDeleteProgram(self.grid_prog)
+        glDeleteProgram(self.flat_prog)
+
+    # ------------------------------------------------------------------
+    def draw_grid(self, vp, mode, spacing, extent, color=(0.5, 0.5, 0.5)):
+        """vp: proj @ view (4×4).  mode: 'all' | 'xy' | 'xz' | 'yz'."""
+        vp = np.asarray(vp, np.float64)
+        u = self.u_grid
+        glUseProgram(self.grid_prog)
+        glUniformMatrix4fv(u["u_inv_vp"], 1, GL_TRUE,
+                           np.linalg.inv(vp).astype(np.float32))
+        glUniformMatrix4fv(u["u_vp"], 1, GL_TRUE, vp.astype(np.float32))
+        glUniform1f(u["u_spacing"], float(spacing))
+        glUniform1f(u["u_extent"], float(extent))
+        glUniform3f(u["u_color"], *color)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_quad)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 0, None)
+        glDisableVertexAttribArray(1)
+        glDisableVertexAttribArray(2)
+        for axis in _GRID_PLANES[mode]:
+            glUniform1i(u["u_axis"], axis)
+            glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(0)
+
+    def draw_axis(self, vp, length):
+        """X (kırmızı), Y (yeşil), Z (mavi) eksenleri."""
+        if self._axis_len != length:
+            l = float(length)
+            data = np.array([[0, 0, 0, 1, 0, 0], [l, 0, 0, 1, 0, 0],
+                             [0, 0, 0, 0, 1, 0], [0, l, 0, 0, 1, 0],
+                             [0, 0, 0, 0, 0, 1], [0, 0, l, 0, 0, 1]], np.float32)
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo_axis)
+            glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
+            self._axis_len = length
+        self._flat(vp, self.vbo_axis, GL_LINES, 6, stride=24)
+
+    def draw_circle(self, width, height, cx, cy, radius, color=(0, 0, 0)):
+        """Ekran pikselinde (GL alt-sol köşe) daire çizgisi."""
+        M = np.identity(4, np.float32)
+        M[0, 0] = M[1, 1] = radius
+        M[:2, 3] = (cx, cy)
+        glDisable(GL_DEPTH_TEST)
+        self._flat(ortho(0, width, 0, height) @ M, self.vbo_circle,
+                   GL_LINE_LOOP, _CIRCLE_SEGS, color=color)
+        glEnable(GL_DEPTH_TEST)
+
+    def draw_line2d(self, width, height, p0, p1, color=(1, 0, 0)):
+        """Qt pikselinde (0,0 sol-üst) iki nokta arası çizgi."""
+        key = (p0, p1)
+        if self._line_key != key:
+            data = np.array([[p0[0], p0[1], 0], [p1[0], p1[1], 0]], np.float32)
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo_line)
+            glBufferSubData(GL_ARRAY_BUFFER, 0, data.nbytes, data)
+            self._line_key = key
+        glDisable(GL_DEPTH_TEST)
+        self._flat(ortho(0, width, height, 0), self.vbo_line, GL_LINES, 2,
+                   color=color)
+        glEnable(GL_DEPTH_TEST)
+
+    def _flat(self, mvp, vbo, prim, count, stride=0, color=None):
+        glUseProgram(self.flat_prog)
+        glUniformMatrix4fv(self.u_mvp, 1, GL_TRUE,
+                           np.asarray(mvp, np.float32))
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, stride, None)
+        if color is None:  # köşe başına renk (pos3 + col3)
+            glEnableVertexAttribArray(1)
+            glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, stride,
+                                  ctypes.c_void_p(12))
+        else:
+            glDisableVertexAttribArray(1)
+            glVertexAttrib3f(1, *color)
+        glDisableVertexAttribArray(2)
+        glDrawArrays(prim, 0, count)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(0)
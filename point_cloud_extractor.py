@@ -1,35 +1,582 @@
 # point_cloud_extractor.py
+"""
+Eşik üstü vokselleri nokta bulutuna çevirir.  Hacim z-dilim bloklarıyla
+(slab) işlenir: tam hacimlik maske / np.argwhere kurulmaz, her blokta
+yalnızca o bloğun eşik üstü koordinatları tutulur.
+
+Seyreltme kipleri (mode):
+  None       – tüm noktalar
+  "random"   – her nokta fraction olasılıkla kalır
+  "voxel"    – voxel_size’lık (dünya birimi) ızgara hücresi başına tek
+               nokta: konum ve renk ortalaması
+  "poisson"  – radius’tan yakın iki nokta kalmaz (hücre tabanlı paralel
+               Poisson-disk: hücre = r/√3, 27 fazda çakışma elemesi)
+target_points verilirse fraction / voxel_size / radius otomatik seçilir
+(doluluk piramidinden); sonuç hedefi aşarsa rastgele kırpılır.
+
+shell=True → yalnızca kabuk vokselleri (eşik üstü ve 6-komşusundan en az
+biri eşik altı); katı dokunun hiç görünmeyen içi atlanır.  with_normals
+→ nokta başına yoğunluk gradyanından (merkezi fark) dışa bakan normal.
+"""
+import os
+
 import numpy as np
 
+_SQRT3 = np.sqrt(3.0)
+# Poisson yarıçapı dolu hücre boyundan küçük seçilir (disk örtüşmesi;
+# hedefi aşan kısım sonra rastgele kırpılır)
+_POISSON_FILL = 0.7
+
+
+def _threshold(volume, threshold):
+    """Ham değerlerle karşılaştırılacak eşik (float32 hacim 0-1’dir)."""
+    return threshold / 255.0 if volume.dtype == np.float32 else threshold
+
+
+def _cell_rows(D, z_increment, cell, slab):
+    """
+    z ekseninde ~slab dilimlik [k0, k1) blokları; cell verilirse sınırlar
+    ızgara hücresi satırlarına hizalanır (hiçbir hücre iki bloğa bölünmez).
+    """
+    if cell is None:
+        edges = np.arange(0, D, slab)
+    else:
+        # r. hücre satırının ilk dilimi: ceil(r·cell / z_increment)
+        n_rows = int(np.floor((D - 1) * z_increment / cell)) + 1
+        first = np.ceil(np.arange(n_rows) * cell / z_increment).astype(np.int64)
+        first = np.unique(np.clip(first, 0, D))
+        edges, last = [0], 0
+        for f in first[1:]:
+            if f - last >= slab:
+                edges.append(int(f))
+                last = f
+        edges = np.asarray(edges)
+    bounds = np.append(edges, D).tolist()
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _slab_mask(volume, thr, k0, k1, shell=False):
+    """
+    [k0, k1) z-bloğunun eşik maskesi.  shell → komşuları da eşik üstü olan
+    (iç) vokseller düşülür; z’de birer dilim taşma (halo) okunur, hacim
+    dışı eşik altı sayılır.
+    """
+    if not shell:
+        return volume[:, :, k0:k1] >= thr
+    D = volume.shape[2]
+    h0, h1 = max(k0 - 1, 0), min(k1 + 1, D)
+    m = volume[:, :, h0:h1] >= thr
+    inner = m.copy()
+    inner[[0, -1], :, :] = False
+    inner[:, [0, -1], :] = False
+    inner[1:] &= m[:-1]
+    inner[:-1] &= m[1:]
+    inner[:, 1:] &= m[:, :-1]
+    inner[:, :-1] &= m[:, 1:]
+    inner[:, :, 1:] &= m[:, :, :-1]
+    inner[:, :, :-1] &= m[:, :, 1:]
+    if h0 == 0:
+        inner[:, :, 0] = False
+    if h1 == D:
+        inner[:, :, -1] = False
+    m &= ~inner
+    return m[:, :, k0 - h0:k1 - h0]
+
+
+def _slab_coords(volume, thr, k0, k1, step=1, shell=False, z0=0):
+    """
+    [k0, k1) z-bloğundaki eşik üstü (shell → kabuk) voksellerin indeksleri.
+    z0: volume’un ilk diliminin tam hacimdeki indeksi (akışta pencere).
+    """
+    m = _slab_mask(volume, thr, k0, k1, shell)
+    if step > 1:  # gerçek kafes: üç indeks de step’in katı
+        keep = np.zeros(m.shape, bool)
+        kk = np.arange(z0 + k0, z0 + k1) % step == 0
+        keep[::step, ::step, kk] = True
+        m &= keep
+    i, j, k = np.nonzero(m)
+    return i, j, k + k0
+
+
+def _gradient_normals(volume, i, j, k, spacing):
+    """Yoğunluk gradyanının tersi (yüksek → düşük, yani dışa) birim normal."""
+    n = np.empty((len(i), 3), np.float32)
+    for a, idx in enumerate((i, j, k)):
+        size = volume.shape[a]
+        lo, hi = np.maximum(idx - 1, 0), np.minimum(idx + 1, size - 1)
+        ia, ib = [i, j, k], [i, j, k]
+        ia[a], ib[a] = hi, lo
+        diff = (volume[tuple(ia)].astype(np.float32)
+                - volume[tuple(ib)].astype(np.float32))
+        n[:, a] = -diff / (np.maximum(hi - lo, 1) * spacing[a])
+    ln = np.linalg.norm(n, axis=1, keepdims=True)
+    return n / np.where(ln > 1e-12, ln, 1.0)
+
+
+def _to_points(i, j, k, color_vol, scale_factor, z_increment,
+               volume=None, z0=0, c0=0):
+    """
+    İndeks → (verts, attr).  attr: RGB (N,3); volume verilirse yanına
+    gradyan normali eklenir (N,6) – seyreltme ikisini birlikte taşır.
+    Akışta k pencere indeksidir: dünya z’si k + z0, renk dilimi k - c0.
+    """
+    verts = np.empty((len(i), 3), np.float32)
+    verts[:, 0] = i * scale_factor
+    verts[:, 1] = j * scale_factor
+    verts[:, 2] = (k + z0) * z_increment
+    bgr = color_vol[i, j, k - c0].astype(np.float32) / 255.0
+    attr = bgr[:, ::-1]  # BGR → RGB
+    if volume is not None:
+        nrm = _gradient_normals(volume, i, j, k,
+                                (scale_factor, scale_factor, z_increment))
+        return verts, np.hstack((attr, nrm))
+    return verts, attr.copy()
+
+
+def _cell_keys(verts, cell, dims):
+    """Dünya konumu → düz hücre anahtarı ve (N,3) hücre indeksi."""
+    c = np.floor(verts / cell).astype(np.int64)
+    return (c[:, 0] * dims[1] + c[:, 1]) * dims[2] + c[:, 2], c
+
+
+def _grid_dims(shape, scale_factor, z_increment, cell, pad=0):
+    ext = np.array([(shape[0] - 1) * scale_factor, (shape[1] - 1) * scale_factor,
+                    (shape[2] - 1) * z_increment])
+    return (np.floor(ext / cell).astype(np.int64) + 1 + 2 * pad)
+
+
+# ----------------------------------------------------------------------
+# Hedef nokta sayısı → ızgara boyu (doluluk piramidi)
+# ----------------------------------------------------------------------
+def _pool2(m):
+    """Her eksende 2×2×2 blokların VEYA’sı (tek boyut kırpılmaz, doldurulur)."""
+    pad = [(0, s % 2) for s in m.shape]
+    if any(p for _, p in pad):
+        m = np.pad(m, pad)
+    a, b, c = (s // 2 for s in m.shape)
+    return m.reshape(a, 2, b, 2, c, 2).any(axis=(1, 3, 5))
+
+
+def occupancy_counts(volume, threshold, levels=6, slab=64, shell=False):
+    """
+    Voksel ızgara boyu 2^j (j < levels) için dolu hücre sayıları.
+    counts[0] = eşik üstü (shell → kabuk) voksel sayısı.
+    Bloklar 2^(levels-1)’in katı.
+    """
+    thr = _threshold(volume, threshold)
+    blk = 1 << (levels - 1)
+    slab = max(blk, slab // blk * blk)
+    counts = np.zeros(levels, np.int64)
+    D = volume.shape[2]
+    for k0 in range(0, D, slab):
+        m = _slab_mask(volume, thr, k0, min(k0 + slab, D), shell)
+        for j in range(levels):
+            counts[j] += np.count_nonzero(m)
+            if j + 1 < levels:
+                m = _pool2(m)
+    return counts
+
+
+def cell_for_target(counts, target, spacing):
+    """
+    Dolu hücre sayısı ≈ target olacak ızgara boyu (dünya birimi).
+    log(sayı)–log(boy) eğrisinde doğrusal ara/dış değerleme.
+    spacing: voksel başına ortalama dünya boyu.
+    """
+    logn = np.log(np.maximum(counts, 1).astype(np.float64))
+    logk = np.log(2.0) * np.arange(len(counts))
+    t = np.log(max(target, 1))
+    if t >= logn[0]:
+        return spacing
+    j = int(np.searchsorted(-logn, -t))  # logn azalan
+    j = min(max(j, 1), len(counts) - 1)
+    slope = (logn[j] - logn[j - 1]) / (logk[j] - logk[j - 1])
+    if slope >= 0:  # doymuş (tek hücre)
+        return spacing * (1 << (len(counts) - 1))
+    return spacing * float(np.exp(logk[j - 1] + (t - logn[j - 1]) / slope))
+
+
+# ----------------------------------------------------------------------
+# Seyreltme çekirdekleri (blok başına)
+# ----------------------------------------------------------------------
+def _voxel_average(verts, attr, cell, dims):
+    key, _ = _cell_keys(verts, cell, dims)
+    uniq, inv = np.unique(key, return_inverse=True)
+    n = np.bincount(inv, minlength=len(uniq)).astype(np.float64)
+    out_v = np.empty((len(uniq), 3), np.float32)
+    out_a = np.empty((len(uniq), attr.shape[1]), np.float32)
+    for a in range(3):
+        out_v[:, a] = np.bincount(inv, verts[:, a], len(uniq)) / n
+    for a in range(attr.shape[1]):
+        out_a[:, a] = np.bincount(inv, attr[:, a], len(uniq)) / n
+    return out_v, out_a
+
+
+def _cell_candidates(verts, cols, cell, dims, rng):
+    """Hücre başına rastgele tek aday (Poisson-disk ön adımı)."""
+    perm = rng.permutation(len(verts))
+    key, c = _cell_keys(verts[perm], cell, dims)
+    _, first = np.unique(key, return_index=True)
+    sel = perm[first]
+    return verts[sel], cols[sel], c[first]
+
+
+def _poisson_eliminate(verts, cells, radius, dims):
+    """
+    Adaylar hücre başına en çok bir tane; 27 fazda (hücre indeksi mod 3)
+    işlenir.  Aynı fazdaki hücreler ≥ 2 hücre (≈1.15 r) uzak olduğundan
+    birbirleriyle çakışmaz; yalnızca önceki fazlarda kabul edilenlere
+    ±2 hücre komşulukta bakılır.  Dönüş: kabul maskesi.
+    """
+    c = cells + 2  # komşu ofsetleri negatife düşmesin
+    D1, D2 = dims[1] + 4, dims[2] + 4
+    key = (c[:, 0] * D1 + c[:, 1]) * D2 + c[:, 2]
+    phase = (c[:, 0] % 3) * 9 + (c[:, 1] % 3) * 3 + (c[:, 2] % 3)
+    offs = np.array([(a, b, d) for a in range(-2, 3) for b in range(-2, 3)
+                     for d in range(-2, 3)], np.int64)
+    offs_key = (offs[:, 0] * D1 + offs[:, 1]) * D2 + offs[:, 2]
+    r2 = radius * radius
+    accepted = np.zeros(len(verts), bool)
+    for ph in range(27):
+        sel = np.flatnonzero(phase == ph)
+        if not sel.size:
+            continue
+        acc = np.flatnonzero(accepted)
+        if acc.size:
+            o = np.argsort(key[acc])
+            acc_key, acc = key[acc][o], acc[o]
+            conflict = np.zeros(sel.size, bool)
+            for ok in offs_key:
+                nk = key[sel] + ok
+                pos = np.minimum(np.searchsorted(acc_key, nk), acc_key.size - 1)
+                hit = acc_key[pos] == nk
+                if hit.any():
+                    h = np.flatnonzero(hit)
+                    d = verts[sel[h]] - verts[acc[pos[h]]]
+                    conflict[h[(d * d).sum(1) < r2]] = True
+            sel = sel[~conflict]
+        accepted[sel] = True
+    return accepted
+
+
+# ----------------------------------------------------------------------
 def extract_point_cloud(volume: np.ndarray,
                         color_vol: np.ndarray,
                         threshold: int = 80,
                         scale_factor: float = 1.0,
                         z_increment: float = 1.0,
-                        step: int = 1):
+                        step: int = 1,
+                        mode: str | None = None,
+                        voxel_size: float | None = None,
+                        radius: float | None = None,
+                        fraction: float | None = None,
+                        target_points: int | None = None,
+                        seed: int = 0,
+                        slab: int = 64,
+                        shell: bool = False,
+                        with_normals: bool = False):
     """
-    volume    : (H,W,D) uint8 veya float32
+    volume    : (H,W,D) uint8 veya float32 (0-1)
     color_vol : (H,W,D,3) uint8  (BGR)
     threshold : 0-255   – eşiğin ÜSTÜ ‘madde’ sayılır
-    step      : >1 ise seyreltme (performans)
+    step      : >1 ise kafes seyreltme (üç indeks de step’in katı → 1/step³)
+    mode      : None | "random" | "voxel" | "poisson"  (modül açıklaması)
+    voxel_size, radius : dünya biriminde; fraction : 0-1
+    target_points      : verilirse yaklaşık bu kadar nokta (≤)
+    shell     : yalnızca kabuk vokselleri
+    with_normals : gradyan normalleri de döner
     ------------------------------------------------------------------
     Dönüş     : verts(N,3 float32), colors(N,3 float32)  (RGB 0-1)
+                [, normals(N,3 float32)  – with_normals]
+    """
+    if mode not in (None, "random", "voxel", "poisson"):
+        raise ValueError(f"bilinmeyen seyreltme kipi: {mode}")
+    thr = _threshold(volume, threshold)
+    rng = np.random.default_rng(seed)
+    spacing = (scale_factor * scale_factor * z_increment) ** (1 / 3)
+
+    if target_points is not None:
+        counts = occupancy_counts(volume, threshold, slab=slab, shell=shell)
+        if counts[0] <= target_points:
+            mode = None
+        elif mode in (None, "random"):
+            mode, fraction = "random", target_points / counts[0]
+        elif mode == "voxel":
+            voxel_size = cell_for_target(counts, target_points, spacing)
+        else:
+            radius = _POISSON_FILL * cell_for_target(counts, target_points, spacing)
+    if mode == "voxel" and not voxel_size:
+        voxel_size = 2 * scale_factor
+    if mode == "poisson" and not radius:
+        radius = 2 * spacing
+    if mode == "random" and fraction is None:
+        fraction = 0.5
+
+    cell = {"voxel": voxel_size,
+            "poisson": None if radius is None else radius / _SQRT3}.get(mode)
+    dims = (_grid_dims(volume.shape, scale_factor, z_increment, cell)
+            if cell else None)
+
+    out_v, out_c, out_cells = [], [], []
+    for k0, k1 in _cell_rows(volume.shape[2], z_increment, cell, slab):
+        i, j, k = _slab_coords(volume, thr, k0, k1, step, shell)
+        if mode == "random":
+            keep = rng.random(len(i)) < fraction
+            i, j, k = i[keep], j[keep], k[keep]
+        if not len(i):
+            continue
+        v, c = _to_points(i, j, k, color_vol, scale_factor, z_increment,
+                          volume if with_normals else None)
+        del i, j, k
+        if mode == "voxel":  # bloklar hücre satırına hizalı → hücreler tam
+            v, c = _voxel_average(v, c, cell, dims)
+        elif mode == "poisson":
+            v, c, cl = _cell_candidates(v, c, cell, dims, rng)
+            out_cells.append(cl)
+        out_v.append(v)
+        out_c.append(c)
+
+    if not out_v:
+        empty = np.empty((0, 3), np.float32)
+        return (empty, empty.copy()) + ((empty.copy(),) if with_normals else ())
+    verts, colors = np.concatenate(out_v), np.concatenate(out_c)
+    if mode == "poisson":
+        keep = _poisson_eliminate(verts, np.concatenate(out_cells), radius, dims)
+        verts, colors = verts[keep], colors[keep]
+    if target_points is not None and len(verts) > target_points:
+        keep = np.sort(rng.choice(len(verts), target_points, replace=False))
+        verts, colors = verts[keep], colors[keep]
+    return _split_attr(verts, colors, with_normals)
+
+
+def _split_attr(verts, attr, with_normals):
+    """(verts, attr) → dönüş üçlüsü; normaller ortalama sonrası yeniden birimlenir."""
+    if with_normals:
+        nrm = attr[:, 3:]
+        ln = np.linalg.norm(nrm, axis=1, keepdims=True)
+        nrm = nrm / np.where(ln > 1e-12, ln, 1.0)
+        return verts, np.ascontiguousarray(attr[:, :3]), nrm
+    return verts, attr
+
+
+# ----------------------------------------------------------------------
+# Akış (streaming) çıkarımı: bloklar yükleyiciden geldikçe işlenir
+# ----------------------------------------------------------------------
+class PointBuffer:
+    """
+    Büyüyen nokta çıktısı.  Önceden ayrılmış diziler dolunca 2× büyür
+    (toplam kopya maliyeti O(N)).  limit verilirse rezervuar örnekleme:
+    her noktaya rastgele anahtar; boyut 2·limit’i aşınca en küçük limit
+    anahtar kalır → bellek sınırlı, sonuç düzgün rastgele örnek.
+    out_dir verilirse noktalar doğrudan xyz.bin / rgb.bin (/ nrm.bin)
+    dosyalarına eklenir ve finish() memmap döndürür (point_octree ile
+    aynı ham düzen; rezervuar varsa dosyalar sonda yazılır).
+    """
+    _NAMES = ("xyz.bin", "rgb.bin", "nrm.bin")
+
+    def __init__(self, with_normals=False, capacity=1 << 20, limit=None,
+                 rng=None, out_dir=None):
+        self.n_attr = 6 if with_normals else 3
+        self.limit = limit
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.out_dir = out_dir
+        self.n = 0
+        self._files = None
+        if out_dir is not None and limit is None:
+            self._open_files()
+            return
+        self.verts = np.empty((capacity, 3), np.float32)
+        self.attr = np.empty((capacity, self.n_attr), np.float32)
+        self.keys = np.empty(capacity, np.float64) if limit is not None else None
+
+    def _open_files(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        self._files = [open(os.path.join(self.out_dir, f), "wb")
+                       for f in self._NAMES[:self.n_attr // 3 + 1]]
+
+    def _write(self, verts, attr):
+        self._files[0].write(np.ascontiguousarray(verts, np.float32).tobytes())
+        for f, a in zip(self._files[1:], np.hsplit(attr, self.n_attr // 3)):
+            f.write(np.ascontiguousarray(a, np.float32).tobytes())
+
+    def _grow(self, need):
+        cap = max(need, 2 * len(self.verts))
+        for name in ("verts", "attr", "keys"):
+            a = getattr(self, name)
+            if a is None:
+                continue
+            b = np.empty((cap,) + a.shape[1:], a.dtype)
+            b[:self.n] = a[:self.n]
+            setattr(self, name, b)
+
+    def _prune(self, keep_n):
+        if self.n <= keep_n:
+            return
+        sel = np.sort(np.argpartition(self.keys[:self.n], keep_n)[:keep_n])
+        for a in (self.verts, self.attr, self.keys):
+            a[:keep_n] = a[sel]
+        self.n = keep_n
+
+    def append(self, verts, attr):
+        m = len(verts)
+        if not m:
+            return
+        if self._files is not None:
+            self._write(verts, attr)
+            self.n += m
+            return
+        if self.n + m > len(self.verts):
+            self._grow(self.n + m)
+        self.verts[self.n:self.n + m] = verts
+        self.attr[self.n:self.n + m] = attr
+        if self.keys is not None:
+            self.keys[self.n:self.n + m] = self.rng.random(m)
+        self.n += m
+        if self.limit is not None and self.n > 2 * self.limit:
+            self._prune(self.limit)
+
+    def finish(self):
+        """
+        verts, colors, normals|None – bellekte tam boy kopya veya (out_dir)
+        salt-okunur memmap.
+        """
+        if self.limit is not None:
+            self._prune(self.limit)
+            if self.out_dir is not None:
+                self._open_files()
+                self._write(self.verts[:self.n], self.attr[:self.n])
+        if self._files is None:
+            a = self.attr[:self.n]
+            return (self.verts[:self.n].copy(), a[:, :3].copy(),
+                    a[:, 3:].copy() if self.n_attr == 6 else None)
+        for f in self._files:
+            f.close()
+        parts = [np.memmap(f.name, np.float32, "r", shape=(self.n, 3))
+                 if self.n else np.empty((0, 3), np.float32)
+                 for f in self._files]
+        return parts[0], parts[1], parts[2] if len(parts) > 2 else None
+
+
+def stream_point_cloud(slabs,
+                       threshold: int = 80,
+                       scale_factor: float = 1.0,
+                       z_increment: float = 1.0,
+                       step: int = 1,
+                       mode: str | None = None,
+                       voxel_size: float | None = None,
+                       radius: float | None = None,
+                       fraction: float | None = None,
+                       target_points: int | None = None,
+                       seed: int = 0,
+                       shell: bool = False,
+                       with_normals: bool = False,
+                       depth: int | None = None,
+                       out_dir: str | None = None,
+                       progress_callback=None,
+                       base_progress: int = 0,
+                       weight: int = 100,
+                       stop_flag=lambda: False):
     """
-    if volume.dtype != np.float32:
-        volume = volume.astype(np.float32) / 255.0
-    msk = volume >= (threshold / 255.0)
-    if step > 1:            # basit down-sample
-        msk[1::step, 1::step, 1::step] = False
+    extract_point_cloud’un akış sürümü.  slabs: z sırasıyla gelen
+    (gray (H,W,n), color (H,W,n,3) BGR) blokları (volume_loader.
+    iter_volume_slabs).  Bellekte bir blok + bir sonrakinin ilk dilimi
+    (shell / normal için halo) ve sonuç tutulur.
+
+    Tam hacim görülmeden sayım yapılamadığından target_points ızgara
+    boyunu seçmez: noktalar rezervuar örneklemeyle (PointBuffer limit)
+    hedefe indirilir; "voxel" / "poisson" kendi varsayılan boylarıyla
+    çalışır.  Bloklara bölünen hücre satırları bir sonraki bloğa
+    devredilir → sonuç extract_point_cloud ile aynı hücrelemedir.
+
+    depth    : toplam dilim sayısı (ilerleme ve ızgara boyutu için)
+    out_dir  : verilirse noktalar doğrudan ikili dosyalara yazılır
+    Dönüş    : extract_point_cloud gibi; stop_flag → (None, None[, None])
+    """
+    if mode not in (None, "random", "voxel", "poisson"):
+        raise ValueError(f"bilinmeyen seyreltme kipi: {mode}")
+    rng = np.random.default_rng(seed)
+    spacing = (scale_factor * scale_factor * z_increment) ** (1 / 3)
+    if mode == "voxel" and not voxel_size:
+        voxel_size = 2 * scale_factor
+    if mode == "poisson" and not radius:
+        radius = 2 * spacing
+    if mode == "random" and fraction is None and target_points is None:
+        fraction = 0.5
+    cell = {"voxel": voxel_size,
+            "poisson": None if radius is None else radius / _SQRT3}.get(mode)
+
+    out = PointBuffer(with_normals, limit=target_points, rng=rng,
+                      out_dir=out_dir)
+    stopped = (None, None) + ((None,) if with_normals else ())
+    halo = shell or with_normals
+    dims, carry, cand = None, None, []
+    it = iter(slabs)
+    nxt = next(it, None)
+    prev_last, k0 = None, 0
+    while nxt is not None:
+        if stop_flag():
+            return stopped
+        gray, color = nxt
+        nxt = next(it, None)
+        k1 = k0 + gray.shape[2]
+        if dims is None and cell:
+            dims = _grid_dims(gray.shape[:2] + (depth or 1 << 20,),
+                              scale_factor, z_increment, cell)
+
+        # Pencere: [önceki bloğun son dilimi] + blok + [sonrakinin ilki]
+        if halo:
+            parts = ([prev_last] if prev_last is not None else []) + [gray]
+            if nxt is not None:
+                parts.append(nxt[0][:, :, :1])
+            win = np.concatenate(parts, axis=2) if len(parts) > 1 else gray
+            c0 = 1 if prev_last is not None else 0
+            prev_last = gray[:, :, -1:].copy()
+        else:
+            win, c0 = gray, 0
+        z0 = k0 - c0  # pencerenin ilk diliminin hacim indeksi
+
+        thr = _threshold(win, threshold)
+        i, j, k = _slab_coords(win, thr, c0, c0 + gray.shape[2], step, shell, z0)
+        if mode == "random" and fraction is not None:
+            keep = rng.random(len(i)) < fraction
+            i, j, k = i[keep], j[keep], k[keep]
+        v, a = _to_points(i, j, k, color, scale_factor, z_increment,
+                          win if with_normals else None, z0, c0)
+        del i, j, k, win
 
-    coords = np.argwhere(msk)
-    if coords.size == 0:
-        return np.empty((0, 3), np.float32), np.empty((0, 3), np.float32)
+        if cell:
+            if carry is not None:  # önceki bloktan yarım kalan hücre satırı
+                v, a = np.concatenate((carry[0], v)), np.concatenate((carry[1], a))
+                carry = None
+            if nxt is not None:
+                _, nc = _cell_keys(np.array([[0, 0, k1 * z_increment]],
+                                            np.float32), cell, dims)
+                _, c = _cell_keys(v, cell, dims)
+                hold = c[:, 2] >= nc[0, 2]
+                if hold.any():
+                    carry = v[hold], a[hold]
+                    v, a = v[~hold], a[~hold]
+        if len(v):
+            if mode == "voxel":
+                v, a = _voxel_average(v, a, cell, dims)
+            elif mode == "poisson":
+                cand.append(_cell_candidates(v, a, cell, dims, rng))
+                v = v[:0]
+            if with_normals and mode == "voxel":  # ortalama → yeniden birimle
+                v, c, n = _split_attr(v, a, True)
+                a = np.hstack((c, n))
+            out.append(v, a)
+        del v, a
 
-    verts = coords.astype(np.float32)
-    bgr   = color_vol[coords[:, 0], coords[:, 1], coords[:, 2]].astype(np.float32) / 255.0
-    colors = bgr[:, [2, 1, 0]]               # BGR → RGB
+        k0 = k1
+        if progress_callback and depth:
+            progress_callback(base_progress + int(min(k1 / depth, 1.0) * weight))
 
-    verts[:, 0] *= scale_factor
-    verts[:, 1] *= scale_factor
-    verts[:, 2] *= z_increment
-    return verts, colors
+    if cand:  # adaylar hücre başına tek → sonuç ölçeğinde bellek
+        v = np.concatenate([c[0] for c in cand])
+        a = np.concatenate([c[1] for c in cand])
+        keep = _poisson_eliminate(v, np.concatenate([c[2] for c in cand]),
+                                  radius, dims)
+        out.append(v[keep], a[keep])
+    verts, colors, normals = out.finish()
+    return (verts, colors) + ((normals,) if with_normals else ())
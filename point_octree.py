@@ -0,0 +1,381 @@
+# point_octree.py  –  diskte octree’li nokta bulutu (Potree benzeri LOD, saf NumPy)
+"""
+Büyük nokta bulutları tek VBO yerine düğümlere bölünür:
+
+* Her düğüm kendi küpünü 128³’lük bir alt ızgarayla örnekler (hücre başına
+  bir nokta); kalan noktalar 8 çocuğa iner.  Kök tüm bulutun seyrek ama
+  düzgün bir örneğidir, derinleştikçe aralık yarıya iner.
+* Noktalar düğüm sırasıyla diske yazılır (xyz.bin / rgb.bin, float32) ve
+  np.memmap ile açılır → RAM’e yalnızca dokunulan sayfalar gelir.
+  Hiyerarşi (nodes.npz) küçüktür ve bellekte tutulur.
+* Çizimde görüş hacmindeki düğümler ekran-uzayı hatasına göre (nokta
+  aralığı kaç piksel) öncelik sırasıyla, nokta bütçesi dolana kadar
+  seçilir; yalnızca seçilen düğümler yüklenir.  Yüklü düğümler LRU ile
+  sınırlanır (GPU tamponları GpuResourceCache’te düğüm Mesh’ine bağlıdır,
+  düğüm düşünce collect() siler).
+"""
+import atexit
+import heapq
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from mesh import Mesh, GL_POINTS
+from geometry_utils import frustum_planes, boxes_in_frustum
+
+OCTREE_MIN_POINTS = 4_000_000   # bundan büyük bulutlar octree ile kurulur
+CODE_BITS = 21                  # eksen başına Morton biti (63 bit kod)
+SUBGRID_BITS = 7                # düğüm başına 128³ örnekleme ızgarası
+LEAF_POINTS = 20_000            # kalan ≤ bu kadarsa düğüm hepsini alır
+POINT_BUDGET = 3_000_000        # kare başına çizilecek en fazla nokta
+LOAD_POINTS = 1_000_000         # kare başına diskten yüklenecek en fazla nokta
+RESIDENT_POINTS = 8_000_000     # LRU: yüklü tutulan düğüm noktası tavanı
+SSE_PX = 1.5                    # nokta aralığı bu kadar pikseli aşarsa incele
+
+_root_dir = None
+
+
+def _scratch_dir():
+    """Oturumluk octree klasörü (çıkışta silinir)."""
+    global _root_dir
+    if _root_dir is None:
+        _root_dir = tempfile.mkdtemp(prefix="2dto3d_octree_")
+        atexit.register(shutil.rmtree, _root_dir, True)
+    return tempfile.mkdtemp(dir=_root_dir)
+
+
+# ----------------------------------------------------------------------
+# Kurulum
+# ----------------------------------------------------------------------
+def _spread21(x):
+    """21 bitlik tamsayıların bitlerini 3’er aralıkla yayar (63 bit Morton)."""
+    x = x & np.uint64(0x1FFFFF)
+    x = (x | (x << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+    x = (x | (x << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+    x = (x | (x << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+    x = (x | (x << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+    x = (x | (x << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return x
+
+
+def _run_starts(keys):
+    """Sıralı anahtarlarda her grubun ilk indeksi."""
+    brk = np.ones(len(keys), bool)
+    brk[1:] = keys[1:] != keys[:-1]
+    return np.flatnonzero(brk)
+
+
+def build_octree(vertices, colors, out_dir, progress_callback=None,
+                 stop_flag=None, block=4_000_000, normals=None):
+    """
+    vertices (N,3), colors / normals (N,3) | None → out_dir’e octree yazar.
+    Dönüş: out_dir (stop_flag True dönerse None).
+    """
+    def _progress(p):
+        if progress_callback:
+            progress_callback(int(p))
+
+    V = np.asarray(vertices, np.float32)
+    N = len(V)
+    vmin, vmax = V.min(0), V.max(0)
+    lo = vmin.astype(np.float64)
+    size = float((vmax - vmin).max()) * (1 + 1e-6) or 1.0
+    res = 1 << CODE_BITS
+
+    # --- Morton kodu (eksen eksen → geçici bellek N×8 B) -----------------
+    code = np.zeros(N, np.uint64)
+    for a in range(3):
+        q = ((V[:, a] - lo[a]) * (res / size)).astype(np.int64)
+        np.clip(q, 0, res - 1, out=q)
+        code |= _spread21(q.astype(np.uint64)) << np.uint64(a)
+    order = np.argsort(code, kind="stable")
+    code = code[order]
+    _progress(20)
+
+    # --- Düzey düzey örnekleme: alt ızgara hücresi başına ilk nokta -------
+    level = np.empty(N, np.int8)
+    rem = np.arange(N)
+    for L in range(CODE_BITS + 1):
+        if stop_flag and stop_flag():
+            return None
+        c = code[rem]
+        node = c >> np.uint64(3 * (CODE_BITS - L))
+        if L == CODE_BITS:
+            take = np.ones(len(rem), bool)
+        else:
+            sub = c >> np.uint64(3 * max(CODE_BITS - L - SUBGRID_BITS, 0))
+            take = np.zeros(len(rem), bool)
+            take[_run_starts(sub)] = True
+            starts = _run_starts(node)
+            cnt = np.diff(np.append(starts, len(rem)))
+            take |= np.repeat(cnt <= LEAF_POINTS, cnt)  # küçük düğüm → yaprak
+        level[rem[take]] = L
+        rem = rem[~take]
+        _progress(20 + 40 * min(L + 1, 8) / 8)
+        if not len(rem):
+            break
+
+    # --- Düğüm sırası: (düzey, anahtar); düzey içinde kod sırası korunur --
+    perm = np.argsort(level, kind="stable")
+    lvl = level[perm].astype(np.int64)
+    key = code[perm] >> (np.uint64(3) * (CODE_BITS - lvl).astype(np.uint64))
+    del code, level, rem
+    src = order[perm]  # düğüm sıralı nokta → özgün indeks
+    del order, perm
+
+    brk = np.ones(N, bool)
+    brk[1:] = (lvl[1:] != lvl[:-1]) | (key[1:] != key[:-1])
+    start = np.flatnonzero(brk)
+    count = np.diff(np.append(start, N))
+    n_lvl, n_key = lvl[start], key[start]
+
+    # düğüm küpü: ilk noktasının (kodla aynı nicemlenmiş) hücre koordinatı
+    cell = size / (1 << n_lvl).astype(np.float64)
+    q = ((V[src[start]] - lo) * (res / size)).astype(np.int64)
+    np.clip(q, 0, res - 1, out=q)
+    ijk = q >> (CODE_BITS - n_lvl)[:, None]
+    box_lo = lo + ijk * cell[:, None]
+    box_hi = box_lo + cell[:, None]
+    spacing = cell / (1 << SUBGRID_BITS)
+
+    # ebeveyn / çocuklar: düzey içinde anahtar sıralı → kardeşler ardışık
+    parent = np.full(len(start), -1, np.int64)
+    for L in range(1, int(n_lvl.max()) + 1):
+        cur = np.flatnonzero(n_lvl == L)
+        prev = np.flatnonzero(n_lvl == L - 1)
+        parent[cur] = prev[np.searchsorted(n_key[prev], n_key[cur] >> np.uint64(3))]
+    n_child = np.bincount(parent[1:], minlength=len(start))
+    first_child = np.zeros(len(start), np.int64)
+    has = n_child > 0
+    first_child[has] = np.searchsorted(parent[1:], np.flatnonzero(has)) + 1
+    _progress(70)
+
+    # --- Noktaları düğüm sırasıyla blok blok yaz ----------------------------
+    os.makedirs(out_dir, exist_ok=True)
+    arrays = tuple((fname, arr) for fname, arr in
+                   (("xyz.bin", V), ("rgb.bin", colors), ("nrm.bin", normals))
+                   if arr is not None)
+    for fname, arr in arrays:
+        with open(os.path.join(out_dir, fname), "wb") as f:
+            for s in range(0, N, block):
+                if stop_flag and stop_flag():
+                    return None
+                np.ascontiguousarray(arr[src[s:s + block]], np.float32).tofile(f)
+    np.savez(os.path.join(out_dir, "nodes.npz"),
+             level=n_lvl, start=start, count=count,
+             box_lo=box_lo.astype(np.float32), box_hi=box_hi.astype(np.float32),
+             spacing=spacing.astype(np.float32),
+             first_child=first_child, n_child=n_child,
+             vmin=vmin, vmax=vmax, n_points=np.int64(N),
+             has_colors=colors is not None, has_normals=normals is not None)
+    _progress(100)
+    return out_dir
+
+
+# ----------------------------------------------------------------------
+# Okuma / görünüm seçimi
+# ----------------------------------------------------------------------
+class PointOctree:
+    """Diskteki octree: hiyerarşi bellekte, noktalar np.memmap."""
+
+    def __init__(self, path):
+        self.path = path
+        with np.load(os.path.join(path, "nodes.npz")) as z:
+            for k in ("level", "start", "count", "box_lo", "box_hi", "spacing",
+                      "first_child", "n_child", "vmin", "vmax"):
+                setattr(self, k, z[k])
+            n = int(z["n_points"])
+            has_colors = bool(z["has_colors"])
+            has_normals = "has_normals" in z.files and bool(z["has_normals"])
+
+        def _map(fname, present):
+            return (np.memmap(os.path.join(path, fname), np.float32, "r",
+                              shape=(n, 3)) if present else None)
+        self.xyz = _map("xyz.bin", True)
+        self.rgb = _map("rgb.bin", has_colors)
+        self.nrm = _map("nrm.bin", has_normals)
+        self._center = (self.box_lo + self.box_hi) * 0.5
+        self._radius = np.linalg.norm(self.box_hi - self.box_lo, axis=1) * 0.5
+
+    def __len__(self):
+        return len(self.start)
+
+    def select(self, P, MV, height, budget=POINT_BUDGET, sse_px=SSE_PX):
+        """
+        Görünür düğümler (öncelik sırasıyla).  P: izdüşüm, MV: yerel → göz.
+        Bir düğümün nokta aralığı ekranda sse_px’i aşıyorsa çocukları
+        açılır; toplam nokta budget’ı aşınca durulur.
+        """
+        vis = boxes_in_frustum(frustum_planes(P @ MV), self.box_lo, self.box_hi)
+        if not vis[0]:
+            return []
+        eye = self._center @ MV[:3, :3].T + MV[:3, 3]
+        s = abs(np.linalg.det(MV[:3, :3])) ** (1 / 3)  # ortalama ölçek
+        dist = np.maximum(np.linalg.norm(eye, axis=1) - self._radius * s, 1e-6)
+        px = self.spacing * s / dist * (P[1, 1] * height * 0.5)
+
+        out, total = [], 0
+        heap = [(-px[0], 0)]
+        while heap:
+            _, n = heapq.heappop(heap)
+            if total + self.count[n] > budget and out:
+                break
+            out.append(n)
+            total += int(self.count[n])
+            if px[n] <= sse_px:
+                continue
+            for c in range(self.first_child[n], self.first_child[n] + self.n_child[n]):
+                if vis[c]:
+                    heapq.heappush(heap, (-px[c], c))
+        return out
+
+
+def _init_view(m, vertices, colors, color, name, normals=None):
+    """Mesh alanlarını kopyalamadan kurar (memmap dilimleri RAM’e alınmaz)."""
+    m.vertices = vertices
+    m.indices = np.empty(0, np.uint32)
+    m.index_count = 0
+    m.draw_mode = GL_POINTS
+    m.colors = colors
+    m.color = color
+    m.version = 0
+    m.erase_mask = None
+    # normal yoksa (Mesh de sıfır üretir) → sıfır adımlı görünüm
+    m.normals = (normals if normals is not None else
+                 np.broadcast_to(np.zeros(3, np.float32), vertices.shape))
+    m.transform_version = 0
+    m.translation = np.zeros(3, np.float32)
+    m.scale = 1.0
+    m.rotation = np.identity(4, np.float32)
+    m.transparent = False
+    m.name = name
+
+
+def _node_mesh(vertices, colors, color, name, normals=None) -> Mesh:
+    m = Mesh.__new__(Mesh)
+    _init_view(m, vertices, colors, color, name, normals)
+    return m
+
+
+class OctreePointCloud(Mesh):
+    """
+    Octree’li nokta bulutu.  vertices / colors diskteki düğüm sıralı
+    dizilerin memmap’idir; kesme / silgi gibi düzenlemeler yeni dizi atar
+    ve bulut o andan itibaren sıradan (bellekteki) Mesh gibi çizilir.
+    Undo özgün dizileri geri getirirse octree yeniden devreye girer.
+
+    SINIR: ilk silgi darbesi / kesme, kalan TÜM noktaları RAM’e alır ve
+    sonraki çizim tek VBO yükler (out_of_core → False).  Düzenlemeler
+    düğüm dosyalarına geri yazılmaz; widget bunu status_message ile
+    kullanıcıya bildirir.
+
+    Widget her karede select_view() çağırır; draw_parts() o karede seçilen
+    düğüm Mesh’lerini (ofset = düğümün ilk noktası) döndürür, böylece ID
+    geçişi ve silgi yalnızca yüklü düğümlerle çalışır.
+    """
+
+    def __init__(self, octree: PointOctree, color=(0.8, 0.8, 0.8),
+                 mesh_name=None):
+        _init_view(self, octree.xyz, octree.rgb, color,
+                   mesh_name or f"Mesh_{id(self)}", octree.nrm)
+        self.octree = octree
+        self._aabb_local = (octree.vmin, octree.vmax)  # dosyayı taramadan
+        self._nodes = OrderedDict()   # düğüm → düğüm Mesh’i (LRU sırası)
+        self._resident = 0
+        self._view = None             # son seçim: [(düğüm Mesh’i, ofset)]
+        self.pending = 0              # bütçe yüzünden yüklenemeyen düğüm
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_nodes"], state["_resident"], state["_view"] = OrderedDict(), 0, None
+        return state
+
+    @property
+    def out_of_core(self) -> bool:
+        """Diziler hâlâ octree dosyaları mı (düzenleme yoksa)."""
+        return self.vertices is self.octree.xyz and self.colors is self.octree.rgb
+
+    def draw_parts(self):
+        if self._view is not None and self.out_of_core:
+            return self._view
+        return ((self, 0),)
+
+    def select_view(self, P, MV, height, budget=POINT_BUDGET) -> bool:
+        """
+        Bu karenin düğümlerini seçer ve gerekirse diskten yükler.
+        Dönüş: True → yüklenemeyen düğüm kaldı (bir sonraki kare sürdürür).
+        """
+        if not self.out_of_core:
+            self._drop_nodes()
+            return False
+        o = self.octree
+        parts, loaded, self.pending = [], 0, 0
+        for n in o.select(P, MV, height, budget):
+            d = self._nodes.get(n)
+            if d is None:
+                if loaded >= LOAD_POINTS:
+                    self.pending += 1
+                    continue
+                d = self._load(n)
+                loaded += len(d.vertices)
+            else:
+                self._nodes.move_to_end(n)
+            parts.append((d, int(o.start[n])))
+        self._view = parts
+        self._evict({id(d) for d, _ in parts})
+        return self.pending > 0
+
+    def _load(self, n):
+        s, c = int(self.octree.start[n]), int(self.octree.count[n])
+        d = _node_mesh(self.vertices[s:s + c],
+                       None if self.colors is None else self.colors[s:s + c],
+                       self.color, f"{self.name}#{n}",
+                       self.normals[s:s + c])
+        if self.erase_mask is not None:
+            d.erase_mask = self.erase_mask[s:s + c]
+        self._nodes[n] = d
+        self._resident += c
+        return d
+
+    def _evict(self, keep):
+        for n in list(self._nodes):
+            if self._resident <= RESIDENT_POINTS:
+                break
+            d = self._nodes[n]
+            if id(d) not in keep:
+                del self._nodes[n]
+                self._resident -= len(d.vertices)
+
+    def _drop_nodes(self):
+        self._nodes.clear()
+        self._resident = 0
+        self._view = None
+
+    # ---- silgi: düğüm maskeleri genel maskenin görünümleri -------------
+    def mark_erased(self, ids: np.ndarray) -> np.ndarray:
+        new = super().mark_erased(ids)
+        o = self.octree
+        for n, d in self._nodes.items():
+            s = int(o.start[n])
+            d.erase_mask = self.erase_mask[s:s + len(d.vertices)]
+        return new
+
+    def compact(self) -> bool:
+        # Mesh.compact: memmap’ten kalan noktalar bellekte yeni diziye
+        # toplanır → bulut bundan sonra octree’siz (bkz. sınıf notu)
+        self._drop_nodes()  # silgi indeks listeleri düğüm tamponlarında
+        return super().compact()
+
+
+def build_point_cloud(verts, colors, name, color=(0.8, 0.8, 0.8),
+                      out_dir=None, progress_callback=None, stop_flag=None,
+                      normals=None):
+    """Octree’yi (varsayılan: oturum klasörüne) kurar → OctreePointCloud."""
+    path = build_octree(verts, colors, out_dir or _scratch_dir(),
+                        progress_callback, stop_flag, normals=normals)
+    if path is None:
+        return None
+    return OctreePointCloud(PointOctree(path), color=color, mesh_name=name)
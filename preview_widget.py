@@ -0,0 +1,115 @@
+# preview_widget.py  –  eşik önizlemesi için küçük, sabit boru hatlı GL görünümü
+from PyQt5.QtWidgets import QOpenGLWidget
+from PyQt5.QtCore import Qt
+from OpenGL.GL import *
+from OpenGL.GLU import gluPerspective
+import numpy as np
+
+
+def vertex_normals(verts, faces):
+    """Yüz normallerinin köşelere toplanıp normalize edilmesi (Mesh ile aynı)."""
+    tri = verts[faces]
+    fn = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    vn = np.zeros_like(verts)
+    for k in range(3):
+        np.add.at(vn, faces[:, k], fn)
+    ln = np.linalg.norm(vn, axis=1, keepdims=True)
+    ln[ln == 0] = 1.0
+    return (vn / ln).astype(np.float32)
+
+
+class SurfacePreview(QOpenGLWidget):
+    """
+    Kaba önizleme mesh’i: VBO yok, istemci dizileri + glDrawElements.
+    Mesh küçük (≈ 10⁴–10⁵ üçgen) olduğundan her kare doğrudan çizilir.
+    Sürükle → döndür, tekerlek → yakınlaş.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(220, 220)
+        self._verts = self._normals = self._faces = None
+        self._center = np.zeros(3, np.float32)
+        self._radius = 1.0
+        self._rot = [-60.0, 0.0, 30.0]  # x, y, z açıları (derece)
+        self._zoom = 1.0
+        self._last_pos = None
+
+    # ------------------------------------------------------------
+    def set_mesh(self, verts, faces):
+        """verts (N,3) float32 (dünya birimi), faces (M,3); boşsa temizler."""
+        if verts is None or not len(faces):
+            self._verts = self._normals = self._faces = None
+        else:
+            lo, hi = verts.min(axis=0), verts.max(axis=0)
+            self._center = (lo + hi) / 2
+            self._radius = float(np.linalg.norm(hi - lo)) / 2 or 1.0
+            self._verts = np.ascontiguousarray(verts - self._center, np.float32)
+            self._faces = np.ascontiguousarray(faces, np.uint32)
+            self._normals = vertex_normals(self._verts, self._faces)
+        self.update()
+
+    def clear(self):
+        self.set_mesh(None, ())
+
+    # ------------------------------------------------------------
+    def initializeGL(self):
+        glClearColor(0.15, 0.15, 0.17, 1.0)
+        glEnable(GL_DEPTH_TEST)
+        glEnable(GL_LIGHTING)
+        glEnable(GL_LIGHT0)
+        glEnable(GL_COLOR_MATERIAL)
+        glEnable(GL_NORMALIZE)
+        glLightModeli(GL_LIGHT_MODEL_TWO_SIDE, GL_TRUE)
+        glLightfv(GL_LIGHT0, GL_AMBIENT, [0.2, 0.2, 0.2, 1.0])
+        glLightfv(GL_LIGHT0, GL_DIFFUSE, [0.8, 0.8, 0.8, 1.0])
+
+    def resizeGL(self, w, h):
+        glViewport(0, 0, w, max(h, 1))
+
+    def paintGL(self):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        if self._verts is None:
+            return
+        r = self._radius
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluPerspective(35.0, self.width() / max(self.height(), 1),
+                       r * 0.1, r * 10.0)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        # ışık kameraya bağlı (model dönerken sabit kalır)
+        glLightfv(GL_LIGHT0, GL_POSITION, [0.4, 0.4, 1.0, 0.0])
+        glTranslatef(0.0, 0.0, -3.2 * r / self._zoom)
+        glRotatef(self._rot[0], 1, 0, 0)
+        glRotatef(self._rot[1], 0, 1, 0)
+        glRotatef(self._rot[2], 0, 0, 1)
+
+        glColor3f(0.85, 0.8, 0.72)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, self._verts)
+        glNormalPointer(GL_FLOAT, 0, self._normals)
+        glDrawElements(GL_TRIANGLES, self._faces.size, GL_UNSIGNED_INT, self._faces)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    # ------------------------------------------------------------
+    def mousePressEvent(self, event):
+        self._last_pos = event.pos()
+
+    def mouseMoveEvent(self, event):
+        if self._last_pos is None or not (event.buttons() & Qt.LeftButton):
+            return
+        d = event.pos() - self._last_pos
+        self._last_pos = event.pos()
+        self._rot[0] += d.y() * 0.5
+        self._rot[2] += d.x() * 0.5
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._last_pos = None
+
+    def wheelEvent(self, event):
+        self._zoom *= 1.1 ** (event.angleDelta().y() / 120)
+        self._zoom = min(max(self._zoom, 0.2), 10.0)
+        self.update()
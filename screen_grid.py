@@ -0,0 +1,65 @@
+# screen_grid.py  –  ekran-uzayı kova ızgarası (silgi fırçası için)
+import numpy as np
+
+
+class ScreenGrid:
+    """
+    Ekrana izdüşürülmüş verteksleri sabit boyutlu piksel hücrelerine
+    kovalar (CSR düzeni).  Bir fırça dairesi sorgulandığında yalnızca
+    dairenin altındaki hücreler taranır → maliyet fırça alanıyla orantılı.
+
+    scr_xy   : (N,2) float32 – Qt ekran pikseli (0,0 sol-üst)
+    valid    : (N,)  bool    – kamera önünde mi? (False → ızgaraya girmez)
+    width/height : viewport boyutu
+    cell     : hücre kenarı (px)
+    pad      : viewport dışına taşan fırça için kenar payı (px)
+    """
+
+    def __init__(self, scr_xy: np.ndarray, valid: np.ndarray,
+                 width: int, height: int, cell: int = 32, pad: int = 256):
+        self.cell = int(cell)
+        self.pad = int(pad)
+        self.x0 = -self.pad
+        self.y0 = -self.pad
+        self.ncx = (int(width) + 2 * self.pad) // self.cell + 1
+        self.ncy = (int(height) + 2 * self.pad) // self.cell + 1
+
+        x, y = scr_xy[:, 0], scr_xy[:, 1]
+        ok = valid & (x >= self.x0) & (y >= self.y0) \
+            & (x < self.x0 + self.ncx * self.cell) \
+            & (y < self.y0 + self.ncy * self.cell)
+        ids = np.flatnonzero(ok)
+
+        cx = ((x[ids] - self.x0) // self.cell).astype(np.int64)
+        cy = ((y[ids] - self.y0) // self.cell).astype(np.int64)
+        key = cy * self.ncx + cx
+
+        order = np.argsort(key, kind="stable")
+        self.ids = ids[order].astype(np.int64)           # kovalanmış vertex id
+        self.xy = scr_xy[self.ids]                       # aynı sırada ekran xy
+        self.starts = np.searchsorted(key[order],
+                                      np.arange(self.ncx * self.ncy + 1))
+
+    # ------------------------------------------------------------------
+    def query_circle(self, cx: float, cy: float, radius: float) -> np.ndarray:
+        """Daire içindeki vertex id’lerini (sıralı olmayan) döndürür."""
+        cs = self.cell
+        ix0 = max(int((cx - radius - self.x0) // cs), 0)
+        ix1 = min(int((cx + radius - self.x0) // cs), self.ncx - 1)
+        iy0 = max(int((cy - radius - self.y0) // cs), 0)
+        iy1 = min(int((cy + radius - self.y0) // cs), self.ncy - 1)
+        if ix0 > ix1 or iy0 > iy1:
+            return np.empty(0, np.int64)
+
+        # Her hücre satırı CSR’de ardışık → satır başına tek dilim
+        rows = np.arange(iy0, iy1 + 1) * self.ncx
+        lo = self.starts[rows + ix0]
+        hi = self.starts[rows + ix1 + 1]
+        sel = np.concatenate([np.arange(a, b) for a, b in zip(lo, hi) if b > a]
+                             or [np.empty(0, np.int64)])
+        if sel.size == 0:
+            return np.empty(0, np.int64)
+
+        d = self.xy[sel] - (cx, cy)
+        hit = (d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1]) < radius * radius
+        return self.ids[sel[hit]]
@@ -89,6 +89,91 @@ def stream_extract_surface(volume, color_vol, threshold,
     if progress_callback: progress_callback(base_progress + weight)
     return verts.astype(np.float32), faces.astype(np.uint32), colors
 
+# ----------------------------- Blok min/max indeksi --------------------
+def _forward(a, op):
+    """Her blokla ileri komşularını (2×2×2) birleştir: sınır hücreleri taşar."""
+    a = a.copy()
+    for ax in range(3):
+        lo = [slice(None)] * 3; hi = [slice(None)] * 3
+        lo[ax], hi[ax] = slice(None, -1), slice(1, None)
+        a[tuple(lo)] = op(a[tuple(lo)], a[tuple(hi)])
+    return a
+
+
+class BrickIndex:
+    """
+    Hacmi brick³ bloklara böler, blok başına min/max tutar.  Bir eşik
+    seviyesi yalnızca min ≤ seviye ≤ max olan bloklardan geçebilir; bir
+    kez kurulan indeks her seviyede yeniden kullanılır (eşik taraması,
+    önizleme).  Bloğun son hücresi bir sonraki bloğa uzandığından aralık
+    ileri komşularla genişletilir (temkinli → hiçbir yüzey kaçmaz).
+    """
+
+    def __init__(self, volume, brick=16):
+        H, W, D = self.shape = volume.shape
+        self.brick = b = brick
+        nb = tuple(-(-n // b) for n in self.shape)
+        lo = np.empty(nb, volume.dtype)
+        hi = np.empty(nb, volume.dtype)
+        px, py = nb[0] * b - H, nb[1] * b - W
+        for kb in range(nb[2]):  # z-blok dilimleri: geçici bellek sınırlı
+            sub = volume[:, :, kb * b:(kb + 1) * b]
+            if px or py:
+                sub = np.pad(sub, ((0, px), (0, py), (0, 0)), mode="edge")
+            r = sub.reshape(nb[0], b, nb[1], b, sub.shape[2])
+            lo[:, :, kb] = r.min(axis=(1, 3, 4))
+            hi[:, :, kb] = r.max(axis=(1, 3, 4))
+        self.lo = _forward(lo, np.minimum)
+        self.hi = _forward(hi, np.maximum)
+
+    def active(self, level):
+        """Seviyenin geçebileceği bloklar (bool, blok ızgarası)."""
+        return (self.lo <= level) & (self.hi >= level)
+
+    def region(self, level):
+        """
+        → (slices, mask) ya da None.  slices: etkin blokların sınırlayıcı
+        kutusu (+1 voksel: son hücrenin üst köşesi); mask: kutu boyunda,
+        marching_cubes(mask=) için etkin blokların hücre başlangıçları.
+        """
+        act = self.active(level)
+        if not act.any():
+            return None
+        b = self.brick
+        idx = np.nonzero(act)
+        b0 = [int(i.min()) for i in idx]
+        b1 = [int(i.max()) + 1 for i in idx]
+        v0 = [x * b for x in b0]
+        v1 = [min(x * b + 1, n) for x, n in zip(b1, self.shape)]
+        sub = act[b0[0]:b1[0], b0[1]:b1[1], b0[2]:b1[2]]
+        mask = sub.repeat(b, 0).repeat(b, 1).repeat(b, 2)
+        mask = np.pad(mask, [(0, 1)] * 3, mode="edge")
+        mask = mask[:v1[0] - v0[0], :v1[1] - v0[1], :v1[2] - v0[2]]
+        return tuple(slice(a, c) for a, c in zip(v0, v1)), mask
+
+
+def extract_surface_indexed(volume, level, index, smooth_it=0):
+    """
+    BrickIndex ile kırpılmış + maskeli marching-cubes (ham voksel
+    koordinatında, ölçeksiz).  level volume ile aynı birimde.
+    Dönüş: verts(N,3 float32), faces(M,3 uint32); yüzey yoksa boş.
+    """
+    reg = index.region(level)
+    if reg is None:
+        return np.empty((0, 3), np.float32), np.empty((0, 3), np.uint32)
+    sl, mask = reg
+    sub = volume[sl]
+    if sub.min() > level or sub.max() < level:
+        return np.empty((0, 3), np.float32), np.empty((0, 3), np.uint32)
+    try:
+        verts, faces, _, _ = measure.marching_cubes(sub, level=level, mask=mask)
+    except RuntimeError:  # seviye aralıkta ama kesişen hücre yok
+        return np.empty((0, 3), np.float32), np.empty((0, 3), np.uint32)
+    verts += [s.start for s in sl]
+    if smooth_it:
+        verts = _laplacian(verts, faces, it=smooth_it, lam=0.33)
+    return verts.astype(np.float32), faces.astype(np.uint32)
+
 # ----------------------------- GPU (opsiyonel) -------------------------
 def gpu_extract_surface(volume, color_vol, threshold,
                         scale_factor, z_increment,
@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")  # mesh.py (JIT’li kesme)
+
+import chunked_mesh
+from chunked_mesh import ChunkedMesh
+from history import (UndoHistory, HistoryEntry, EraseStep, DataStep,
+                     ListStep, _data)
+from mesh import Mesh
+
+
+class FakeWidget:
+    """UndoHistory’nin dokunduğu kadar sahne."""
+
+    def __init__(self, meshes):
+        self.meshes = list(meshes)
+        self.selected_mesh = None
+        self.selected_index = -1
+
+
+def grid_mesh(n=20, cls=Mesh):
+    ys, xs = np.mgrid[:n, :n]
+    V = np.c_[xs.ravel(), ys.ravel(), np.zeros(n * n)].astype(np.float32)
+    F = []
+    for i in range(n - 1):
+        for j in range(n - 1):
+            a = i * n + j
+            F += [a, a + 1, a + n, a + 1, a + n + 1, a + n]
+    C = np.random.default_rng(0).random((n * n, 3)).astype(np.float32)
+    return cls(V, np.array(F, np.uint32), colors=C)
+
+
+def snapshot(m):
+    return [None if a is None else np.array(a)
+            for a in (m.vertices, m.indices, m.colors, m.normals)]
+
+
+def assert_same(m, snap):
+    for a, b in zip(snapshot(m), snap):
+        if b is None:
+            assert a is None
+        else:
+            np.testing.assert_array_equal(a, b)
+
+
+def erase(h, m, ids):
+    m.mark_erased(np.asarray(ids))
+    step = EraseStep(m)
+    assert m.compact()
+    h.push(HistoryEntry([step], "erase"))
+    return step
+
+
+# ----------------------------------------------------------------------
+def test_erase_undo_redo_triangles():
+    m = grid_mesh()
+    h = UndoHistory(FakeWidget([m]))
+    before = snapshot(m)
+    erase(h, m, np.arange(0, 200, 3))
+    after = snapshot(m)
+    assert len(after[0]) < len(before[0])
+
+    assert h.undo()
+    assert_same(m, before)
+    assert h.redo()
+    assert_same(m, after)
+
+
+def test_erase_undo_redo_points():
+    rng = np.random.default_rng(1)
+    m = Mesh(rng.random((500, 3)).astype(np.float32), np.empty(0, np.uint32),
+             colors=rng.random((500, 3)).astype(np.float32))
+    h = UndoHistory(FakeWidget([m]))
+    before = snapshot(m)
+    erase(h, m, rng.choice(500, 120, replace=False))
+    after = snapshot(m)
+    assert len(after[0]) == 380
+
+    assert h.undo()
+    assert_same(m, before)
+    assert h.redo()
+    assert_same(m, after)
+
+
+def test_chunked_untouched_part_keeps_unreferenced_vertex(monkeypatch):
+    monkeypatch.setattr(chunked_mesh, "CHUNK_VERTS", 300)
+    monkeypatch.setattr(chunked_mesh, "CHUNK_TARGET", 250)
+    m = grid_mesh(40, ChunkedMesh)
+    assert len(m.draw_parts()) > 2
+    # son parçaya hiçbir üçgenin göstermediği bir verteks ekle
+    p = m._parts[-1]
+    p.vertices = np.vstack([p.vertices, [[99, 99, 99]]]).astype(np.float32)
+    p.colors = np.vstack([p.colors, [[1, 1, 1]]]).astype(np.float32)
+    p.normals = np.vstack([p.normals, [[0, 0, 1]]]).astype(np.float32)
+    m.bump_version()
+
+    h = UndoHistory(FakeWidget([m]))
+    before = snapshot(m)
+    erase(h, m, np.arange(10))   # yalnızca ilk parça
+    after = snapshot(m)
+
+    assert h.undo()
+    assert_same(m, before)
+    assert h.redo()
+    assert_same(m, after)
+
+
+def test_mismatched_undo_leaves_stacks():
+    m = grid_mesh()
+    h = UndoHistory(FakeWidget([m]))
+    erase(h, m, np.arange(30))
+    # kayıtsız değişiklik: verteks sayısı artık uymaz
+    m.vertices, m.colors, m.normals = m.vertices[:-1], m.colors[:-1], m.normals[:-1]
+    state = snapshot(m)
+
+    assert not h.undo()
+    assert len(h.undo_stack) == 1 and not h.redo_stack
+    assert_same(m, state)
+
+
+# ----------------------------------------------------------------------
+def test_spill_and_restore():
+    m = grid_mesh()
+    w = FakeWidget([m])
+    h = UndoHistory(w, ram_budget=1)
+    old = snapshot(m)
+
+    a = _data(m)
+    m.vertices = m.vertices * 2.0
+    m.bump_version()
+    step = DataStep(m, a, _data(m))
+    h.push(HistoryEntry([step], "cut"))
+    # son kayıt birleştirilebilir sayılır; bir sonraki push eskisini taşır
+    h.push(HistoryEntry([ListStep(list(w.meshes), list(w.meshes))], "noop"))
+
+    assert step.spill_path is not None
+    assert step.spilled == ("b0",)        # sahnedeki diziler yazılmaz
+    assert step.a0 is m.vertices
+    assert h.disk_bytes() > 0
+
+    assert h.undo() and h.undo()
+    assert_same(m, old)
+    # artık redo tarafında: sahneden çıkan “sonra” dizisi taşınır
+    assert step.spilled == ("a0",)
+    assert h.redo() and h.redo()
+    np.testing.assert_array_equal(m.vertices, old[0] * 2.0)
+
+
+def test_memmap_arrays_are_not_spilled(tmp_path):
+    V = np.random.default_rng(2).random((1000, 3)).astype(np.float32)
+    mm = np.memmap(tmp_path / "xyz.bin", np.float32, "w+", shape=V.shape)
+    mm[:] = V
+    m = Mesh(V, np.empty(0, np.uint32))
+    m.vertices = mm                      # octree / önbellek isabeti gibi
+    w = FakeWidget([m])
+    h = UndoHistory(w, ram_budget=1)
+
+    before = list(w.meshes)
+    w.meshes.remove(m)
+    h.push(HistoryEntry([ListStep(before, list(w.meshes))], "delete"))
+    h.push(HistoryEntry([ListStep(list(w.meshes), list(w.meshes))], "noop"))
+
+    assert m.vertices is mm              # memmap yerinde kalır
+    assert m.normals is None             # RAM’deki normaller taşındı
+    assert h.ram_bytes() == 0
+
+    assert h.undo() and h.undo()
+    assert m in w.meshes and m.vertices is mm
+    assert m.normals is not None
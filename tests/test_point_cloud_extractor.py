@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from point_cloud_extractor import extract_point_cloud, stream_point_cloud
+
+H, W, D = 40, 36, 50
+
+
+@pytest.fixture(scope="module")
+def volume():
+    x, y, z = np.mgrid[:H, :W, :D]
+    vol = np.exp(-((x - 20) ** 2 + (y - 18) ** 2 + (z - 25) ** 2) / 300)
+    col = np.random.default_rng(1).integers(0, 255, (H, W, D, 3), dtype=np.uint8)
+    return (255 * vol).astype(np.uint8), col
+
+
+def slabs(vol, col, n):
+    for k in range(0, D, n):
+        yield vol[:, :, k:k + n], col[:, :, k:k + n]
+
+
+def canonical(verts, *attrs):
+    order = np.lexsort(verts.T)
+    return [verts[order]] + [a[order] for a in attrs]
+
+
+@pytest.mark.parametrize("slab", [1, 7, 64])
+@pytest.mark.parametrize("kw", [
+    {},
+    {"shell": True, "with_normals": True},
+    {"step": 2},
+    {"mode": "voxel", "voxel_size": 2.5},
+    {"mode": "voxel", "voxel_size": 3.0, "shell": True, "with_normals": True},
+], ids=["plain", "shell", "step", "voxel", "voxel-shell"])
+def test_stream_matches_extract(volume, slab, kw):
+    vol, col = volume
+    common = dict(threshold=80, scale_factor=0.8, z_increment=1.3, **kw)
+    ref = extract_point_cloud(vol, col, **common)
+    got = stream_point_cloud(slabs(vol, col, slab), depth=D, **common)
+    a, b = canonical(*ref), canonical(*got)
+    assert len(a[0]) == len(b[0])
+    for p, q in zip(a, b):
+        np.testing.assert_allclose(p, q, atol=1e-4)
+
+
+def test_stream_poisson_keeps_min_distance(volume):
+    vol, col = volume
+    v = stream_point_cloud(slabs(vol, col, 5), mode="poisson", radius=3.0,
+                           depth=D)[0]
+    d = ((v[:, None] - v[None]) ** 2).sum(-1)
+    np.fill_diagonal(d, np.inf)
+    assert len(v) and np.sqrt(d.min()) >= 3.0 - 1e-4
+
+
+def test_stream_target_and_stop(volume):
+    vol, col = volume
+    v, c, n = stream_point_cloud(slabs(vol, col, 5), target_points=500,
+                                 depth=D, with_normals=True)
+    assert len(v) == 500 and c.shape == n.shape == (500, 3)
+    assert stream_point_cloud(slabs(vol, col, 9),
+                              stop_flag=lambda: True) == (None, None)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from screen_grid import ScreenGrid
+
+
+def brute(xy, valid, cx, cy, r):
+    d2 = ((xy - (cx, cy)) ** 2).sum(1)
+    return np.flatnonzero(valid & (d2 < r * r))
+
+
+@pytest.mark.parametrize("cell", [8, 32, 100])
+def test_query_circle_matches_brute_force(cell):
+    rng = np.random.default_rng(cell)
+    W, H = 640, 480
+    # viewport dışına (pad içine ve ötesine) taşan noktalar da olsun
+    xy = rng.uniform(-400, 1000, (5000, 2)).astype(np.float32)
+    valid = rng.random(5000) > 0.1
+    g = ScreenGrid(xy, valid, W, H, cell=cell)
+    for cx, cy, r in [(320, 240, 30), (0, 0, 50), (-100, 500, 80),
+                      (639, 479, 1.5), (320, 240, 400), (5000, 5000, 10)]:
+        got = np.sort(g.query_circle(cx, cy, r))
+        ref = brute(xy, valid, cx, cy, r)
+        # ızgara yalnızca pad’li viewport’u kapsar
+        x0, y0 = -g.pad, -g.pad
+        inside = ((xy[ref, 0] >= x0) & (xy[ref, 1] >= y0)
+                  & (xy[ref, 0] < x0 + g.ncx * g.cell)
+                  & (xy[ref, 1] < y0 + g.ncy * g.cell))
+        np.testing.assert_array_equal(got, ref[inside])
+
+
+def test_query_circle_empty():
+    g = ScreenGrid(np.empty((0, 2), np.float32), np.empty(0, bool), 100, 100)
+    assert g.query_circle(50, 50, 20).size == 0
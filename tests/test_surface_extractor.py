@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("skimage")
+
+from surface_extractor import BrickIndex
+
+
+def blob(shape, rng):
+    x, y, z = np.meshgrid(*[np.arange(n) for n in shape], indexing="ij")
+    c = rng.uniform(0, shape, 3)
+    r2 = (x - c[0]) ** 2 + (y - c[1]) ** 2 + (z - c[2]) ** 2
+    return (255 * np.exp(-r2 / rng.uniform(20, 300))).astype(np.uint8)
+
+
+def crossing_cells(vol, level):
+    """Seviyenin geçtiği hücreler (8 köşe min ≤ seviye ≤ max, min < max)."""
+    v = vol.astype(int)
+    H, W, D = v.shape
+    corners = [v[i:H - 1 + i, j:W - 1 + j, k:D - 1 + k]
+               for i in (0, 1) for j in (0, 1) for k in (0, 1)]
+    mn, mx = np.min(corners, 0), np.max(corners, 0)
+    return (mn <= level) & (mx >= level) & (mn < mx)
+
+
+@pytest.mark.parametrize("trial", range(10))
+def test_brick_region_covers_every_crossing_cell(trial):
+    rng = np.random.default_rng(trial)
+    vol = blob(tuple(rng.integers(5, 50, 3)), rng)
+    index = BrickIndex(vol, int(rng.choice([4, 8, 16])))
+    for level in (10, 80, 200):
+        need = crossing_cells(vol, level)
+        reg = index.region(level)
+        if reg is None:
+            assert not need.any()
+            continue
+        slices, mask = reg
+        assert mask.shape == tuple(s.stop - s.start for s in slices)
+        full = np.zeros(vol.shape, bool)
+        full[slices] = mask
+        assert (full[:-1, :-1, :-1] | ~need).all()
+        # hücrenin 8 köşesi de kırpılmış kutunun içinde
+        cells = np.argwhere(need)
+        for a, s in enumerate(slices):
+            assert (cells[:, a] >= s.start).all()
+            assert (cells[:, a] + 1 < s.stop).all()
+
+
+def test_brick_region_none_outside_range():
+    vol = np.full((12, 12, 12), 50, np.uint8)
+    index = BrickIndex(vol, 4)
+    assert index.region(200) is None
@@ -0,0 +1,203 @@
+# threshold_sweep.py
+"""
+Eşik taraması: hacim bir kez yüklenir, birden çok eşik için yüzey çıkarılır
+ve seviye başına üçgen sayısı + süre raporlanır.
+
+    python threshold_sweep.py MRHead_Slices -t 60 80 100 120 -j 4
+    python threshold_sweep.py MRHead_Slices -t 80 100 -o out   # OBJ’ler de
+
+Hacim uint8 olarak (float32’nin ¼’ü) paylaşımlı belleğe konur; seviyeler
+ayrı süreçlerde kopyasız okunur.  Blok min/max indeksi (BrickIndex) bir
+kez kurulur ve her seviyede yeniden kullanılır: marching-cubes yalnızca
+seviyenin geçtiği blokların kutusunda, maskeli çalışır.  Eşzamanlı süreç
+sayısı boş belleğe göre kısılır.
+
+Satır başına bir JSON olay:
+    {"event": "loaded", "seconds": ..., "shape": [H, W, D]}
+    {"event": "level", "threshold": 80, "triangles": ..., "vertices": ...,
+     "seconds": ..., "bricks": ..., "bricks_total": ..., "output": ...}
+    {"event": "summary", "levels": 4, "seconds": ...}
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from model_generation import available_memory, write_obj
+from surface_extractor import BrickIndex, extract_surface_indexed
+
+# Seviye başına tepe bayt / kırpılmış voksel: float dönüşümü (marching-
+# cubes içinde) + maske + çıktı payı
+_BYTES_PER_CROP_VOXEL = 14
+
+_attached = {}  # alt süreçte: blok adı → (shm, dizi)
+
+
+def _as_uint8(volume):
+    """load_volume’un float32 (0-1) hacmi 8 bit PNG’den gelir → kayıpsız geri."""
+    if volume.dtype == np.uint8:
+        return volume
+    return np.round(volume * 255.0).astype(np.uint8)
+
+
+def _share(arr):
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def _attach(spec):
+    if spec is None:
+        return None
+    name, shape, dtype = spec
+    if name not in _attached:
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = shm, np.ndarray(shape, dtype, buffer=shm.buf)
+    return _attached[name][1]
+
+
+def _level(volume, color_vol, index, threshold, scale_factor, z_increment,
+           smooth_it, output):
+    """Tek eşik seviyesi → rapor sözlüğü (gerekirse OBJ de yazılır)."""
+    t0 = time.perf_counter()
+    verts, faces = extract_surface_indexed(volume, threshold, index, smooth_it)
+    info = {"threshold": threshold, "triangles": int(len(faces)),
+            "vertices": int(len(verts)),
+            "bricks": int(index.active(threshold).sum()),
+            "bricks_total": int(index.lo.size), "output": None}
+    if output:
+        if color_vol is not None and len(verts):
+            H, W, D = volume.shape
+            vi = np.clip(np.round(verts).astype(np.int32), 0, [H - 1, W - 1, D - 1])
+            cols = color_vol[vi[:, 0], vi[:, 1], vi[:, 2]][:, ::-1] / 255.0
+        else:
+            cols = np.full((len(verts), 3), 0.8, np.float32)
+        verts = verts * np.float32([scale_factor, scale_factor, z_increment])
+        write_obj(output, verts, faces, cols)
+        info["output"] = output
+    info["seconds"] = round(time.perf_counter() - t0, 3)
+    return info
+
+
+def _level_in_child(vol_spec, col_spec, index, *args):
+    return _level(_attach(vol_spec), _attach(col_spec), index, *args)
+
+
+def threshold_sweep(volume, thresholds, scale_factor=1.0, z_increment=1.0,
+                    color_vol=None, out_dir=None, name="sweep", smooth_it=0,
+                    brick=16, workers=None, progress_callback=None,
+                    on_level=None, stop_flag=lambda: False):
+    """
+    volume     : (H,W,D) uint8 veya float32 (0-1)
+    thresholds : 0-255 eşik listesi
+    out_dir    : verilirse seviye başına <name>_t<eşik>.obj yazılır
+    workers    : None → min(seviye, çekirdek, belleğe sığan)
+    on_level   : her seviye bittikçe (tamamlanma sırasıyla) çağrılır
+    ------------------------------------------------------------------
+    Dönüş: eşik sırasıyla rapor sözlükleri listesi (iptalde biten kısım)
+    """
+    thresholds = sorted({int(t) for t in thresholds})
+    vol8 = _as_uint8(volume)
+    index = BrickIndex(vol8, brick)
+    outputs = {t: (os.path.join(out_dir, f"{name}_t{t}.obj") if out_dir else None)
+               for t in thresholds}
+    args = lambda t: (t, scale_factor, z_increment, smooth_it, outputs[t])
+
+    # Bellek: en büyük seviyenin kırpılmış kutusuna göre süreç sayısı
+    crop = max((np.prod([s.stop - s.start for s in r[0]])
+                for r in map(index.region, thresholds) if r is not None),
+               default=0)
+    if workers is None:
+        workers = min(len(thresholds), os.cpu_count() or 1)
+        free = available_memory()
+        if free is not None and crop:
+            workers = min(workers, max(1, int(free * 0.7 // (crop * _BYTES_PER_CROP_VOXEL))))
+
+    results = []
+
+    def done(info):
+        results.append(info)
+        if on_level:
+            on_level(info)
+        if progress_callback:
+            progress_callback(int(len(results) / len(thresholds) * 100))
+
+    if workers <= 1 or len(thresholds) == 1:
+        for t in thresholds:
+            if stop_flag():
+                break
+            done(_level(vol8, color_vol, index, *args(t)))
+        return sorted(results, key=lambda r: r["threshold"])
+
+    shms = []
+    try:
+        shm, vol_spec = _share(vol8)
+        shms.append(shm)
+        col_spec = None
+        if color_vol is not None and out_dir:
+            shm, col_spec = _share(np.ascontiguousarray(color_vol))
+            shms.append(shm)
+        ctx = mp.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futs = [pool.submit(_level_in_child, vol_spec, col_spec, index, *args(t))
+                    for t in thresholds]
+            for fut in as_completed(futs):
+                if stop_flag():
+                    for f in futs:
+                        f.cancel()
+                    break
+                done(fut.result())
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+    return sorted(results, key=lambda r: r["threshold"])
+
+
+def _emit(event, **fields):
+    print(json.dumps(dict(event=event, **fields), ensure_ascii=False),
+          flush=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Hacmi bir kez yükleyip birden çok eşikte yüzey çıkarır.")
+    ap.add_argument("folder", help="dilim klasörü")
+    ap.add_argument("-t", "--thresholds", type=int, nargs="+", required=True)
+    ap.add_argument("-o", "--out-dir", help="seviye OBJ’lerinin klasörü")
+    ap.add_argument("-j", "--jobs", type=int, default=None)
+    ap.add_argument("--resolution", type=int, nargs=2, metavar=("W", "H"))
+    ap.add_argument("--scale-factor", type=float, default=1.0)
+    ap.add_argument("--z-increment", type=float, default=1.0)
+    ap.add_argument("--smooth", type=int, default=0, metavar="IT",
+                    help="Laplacian yumuşatma adımı (0 = kapalı)")
+    args = ap.parse_args(argv)
+
+    from volume_loader import load_volume
+    t0 = time.perf_counter()
+    volume, color_vol = load_volume(args.folder, args.resolution)
+    if volume is None:
+        print("hacim yüklenemedi", file=sys.stderr)
+        return 1
+    _emit("loaded", seconds=round(time.perf_counter() - t0, 3),
+          shape=list(volume.shape))
+    vol8 = _as_uint8(volume)
+    del volume
+    name = os.path.basename(os.path.normpath(args.folder))
+    threshold_sweep(vol8, args.thresholds, args.scale_factor,
+                    args.z_increment, color_vol, args.out_dir, name,
+                    args.smooth, workers=args.jobs,
+                    on_level=lambda info: _emit("level", **info))
+    _emit("summary", levels=len(args.thresholds),
+          seconds=round(time.perf_counter() - t0, 3))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
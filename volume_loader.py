@@ -10,12 +10,16 @@ def _read_png(fn, resolution):
         c = cv2.resize(c, resolution, interpolation=cv2.INTER_AREA)
     return g, c
 
+def list_slices(slice_folder):
+    """Klasördeki PNG dilimleri (z sırasıyla)."""
+    return [os.path.join(slice_folder, f)
+            for f in sorted(os.listdir(slice_folder))
+            if f.lower().endswith('.png')]
+
 def load_volume(slice_folder, resolution,
                 stop_flag=lambda: False,
                 progress_callback=None, weight=40):
-    files = [os.path.join(slice_folder, f)
-             for f in sorted(os.listdir(slice_folder))
-             if f.lower().endswith('.png')]
+    files = list_slices(slice_folder)
     total = len(files)
     gray_slices, color_slices = [None]*total, [None]*total
 
@@ -35,3 +39,63 @@ def load_volume(slice_folder, resolution,
     volume    = np.stack(gray_slices , axis=-1).astype(np.float32) / 255.0
     color_vol = np.stack(color_slices, axis= 2)
     return volume, color_vol
+
+def iter_volume_slabs(slice_folder, resolution, slab=16,
+                      stop_flag=lambda: False):
+    """
+    Hacmi z-blokları halinde akıtır: (gray (H,W,n) uint8, color (H,W,n,3)
+    uint8 BGR).  Bir sonraki blok arka planda okunurken mevcut blok
+    işlenir; bellekte en çok iki blok bulunur, tam hacim hiç kurulmaz.
+    stop_flag() doğru olunca akış kesilir.
+    """
+    files = list_slices(slice_folder)
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as pool:
+        def submit(k0):
+            return [pool.submit(_read_png, fn, resolution)
+                    for fn in files[k0:k0 + slab]]
+
+        pending = submit(0)
+        for k0 in range(0, len(files), slab):
+            if stop_flag():
+                for f in pending:
+                    f.cancel()
+                return
+            cur = [f.result() for f in pending]
+            pending = submit(k0 + slab)
+            yield (np.stack([g for g, _ in cur], axis=-1),
+                   np.stack([c for _, c in cur], axis=2))
+
+def load_preview_volume(slice_folder, resolution=None, max_dim=96,
+                        stop_flag=lambda: False):
+    """
+    Önizleme için kaba piramit seviyesi: en uzun ekseni ≤ max_dim olacak
+    tek çarpanla (izotropik) alan ortalamalı küçültülmüş uint8 gri hacim.
+    resolution (W, H) verilirse tam üretimdeki yeniden boyutlandırma
+    taklit edilir.  z’de f dilim ortalanır; bellekte aynı anda yalnızca
+    f dilim bulunur.
+    Dönüş: (volume (h,w,d) uint8, f) – f: önizleme vokseli başına özgün
+    voksel; iptal / boş klasörde (None, 1).
+    """
+    files = list_slices(slice_folder)
+    if not files:
+        return None, 1
+    if resolution:
+        W, H = resolution
+    else:
+        H, W = cv2.imread(files[0], cv2.IMREAD_GRAYSCALE).shape
+    D = len(files)
+    f = max(1, -(-max(H, W, D) // max_dim))
+    w, h = max(1, W // f), max(1, H // f)
+
+    def read(fn):
+        g = cv2.imread(fn, cv2.IMREAD_GRAYSCALE)
+        return cv2.resize(g, (w, h), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    out = np.empty((h, w, -(-D // f)), np.uint8)
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as pool:
+        for k, k0 in enumerate(range(0, D, f)):
+            if stop_flag():
+                return None, 1
+            group = list(pool.map(read, files[k0:k0 + f]))
+            out[:, :, k] = np.round(sum(group) / len(group)).astype(np.uint8)
+    return out, f